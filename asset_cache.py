@@ -0,0 +1,112 @@
+# asset_cache.py
+
+import hashlib
+import json
+import mmap
+import os
+import pygame
+
+CACHE_VERSION = 1 # 快取檔格式的版本，格式改變時加一，舊的快取檔會被當成沒有快取
+
+class AssetCache:
+    """
+    已解碼資源的磁碟快取：圖片存成 RGBA 像素、音效存成 mixer 格式的 PCM。
+    以來源檔內容的雜湊值為鍵，之後啟動時用 mmap 讀回，
+    再以 pygame.image.frombuffer / pygame.mixer.Sound(buffer=...) 直接建立物件，完全不需要解碼。
+    每個快取檔的第一行是 JSON 標頭 (版本、尺寸或 mixer 格式)，之後是原始資料。
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def _cache_path(self, source_path, kind):
+        """依來源檔內容的雜湊值決定快取檔路徑。"""
+        with open(source_path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        name = os.path.basename(source_path)
+        return os.path.join(self.directory, f"{name}.{digest[:16]}.v{CACHE_VERSION}.{kind}")
+
+    @staticmethod
+    def _close(data, payload):
+        """不再需要快取檔的內容時 (資料不符，或已經複製到 Sound 中) 立即關閉 mmap。"""
+        payload.release()
+        data.close()
+
+    def _read(self, path):
+        """
+        讀取快取檔，回傳 (標頭, mmap, 資料的 memoryview)；不存在或格式不符時回傳 (None, None, None)。
+        呼叫端不使用資料時以 _close 關閉；frombuffer 建立的 surface 會持有 memoryview，
+        mmap 在 surface (例如轉換像素格式後的原始 surface) 被回收時才會關閉。
+        """
+        try:
+            with open(path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError): # 檔案不存在，或是空檔案無法 mmap
+            return None, None, None
+        end = data.find(b"\n")
+        try:
+            header = json.loads(data[:end].decode("utf-8")) if end > 0 else None
+        except ValueError:
+            header = None
+        if header is None or header.get("version") != CACHE_VERSION:
+            data.close()
+            return None, None, None
+        return header, data, memoryview(data)[end + 1:]
+
+    def _write(self, path, header, payload):
+        """先寫到暫存檔再改名，避免其他行程讀到寫到一半的檔案。"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(json.dumps(dict(header, version=CACHE_VERSION)).encode("utf-8") + b"\n")
+                f.write(payload)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"警告: 無法寫入資源快取 {path}: {e}")
+
+    def load_image(self, source_path):
+        """
+        回傳來源圖片解碼後的 surface (尚未 convert_alpha)。
+        有快取時直接從 mmap 建立，沒有時解碼來源檔並寫入快取。
+        """
+        path = self._cache_path(source_path, "rgba")
+        header, data, payload = self._read(path)
+        if header is not None:
+            size = tuple(header["size"])
+            if len(payload) == size[0] * size[1] * 4:
+                self.hits += 1
+                return pygame.image.frombuffer(payload, size, "RGBA")
+            self._close(data, payload)
+        self.misses += 1
+        image = pygame.image.load(source_path)
+        self._write(path, {"size": list(image.get_size())}, pygame.image.tobytes(image, "RGBA"))
+        return image
+
+    def load_sound(self, source_path):
+        """
+        回傳來源音效的 Sound 物件。PCM 格式取決於 mixer 的初始化參數，
+        參數不同時視為沒有快取，重新解碼並覆寫快取。
+        """
+        mixer_format = pygame.mixer.get_init()
+        if mixer_format is None: # 與直接載入相同，交給 ResourceManager 顯示錯誤
+            raise pygame.error("mixer not initialized")
+        mixer_format = list(mixer_format)
+        path = self._cache_path(source_path, "pcm")
+        header, data, payload = self._read(path)
+        if header is not None:
+            matched = header.get("mixer") == mixer_format
+            sound = pygame.mixer.Sound(buffer=payload) if matched else None # Sound 會複製一份資料
+            self._close(data, payload)
+            if matched:
+                self.hits += 1
+                return sound
+        self.misses += 1
+        sound = pygame.mixer.Sound(source_path)
+        self._write(path, {"mixer": mixer_format}, sound.get_raw())
+        return sound
+
+    def stats(self):
+        """回傳快取統計 (命中、未命中)。"""
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,3 @@
+# benchmarks/__init__.py
+
+# 效能基準測試腳本，請在專案根目錄以 python -m benchmarks.<模組名稱> 執行
@@ -0,0 +1,55 @@
+# benchmarks/blit_bench.py
+
+"""
+blit 基準測試：比較一律 convert_alpha() 與 ResourceManager.optimize_surface 選出的像素格式，
+繪製地圖塊圖層 (6x10 格) 與整張開始畫面的耗時。
+執行方式 (在專案根目錄)：python -m benchmarks.blit_bench
+"""
+
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from game_config import GameConfig
+from resources import ResourceManager
+
+def time_blits(screen, items, frames):
+    """把 items 畫 frames 次，回傳每幀平均毫秒數 (取三次中最短)。"""
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(frames):
+            screen.blits(items, doreturn=False)
+        elapsed = (time.perf_counter() - start) / frames * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def map_layer_items(images):
+    """與 GameSimulation.init_map_grid 相同的 6x10 地圖塊排列。"""
+    return [(images[(x + y) % 2], (x * GameConfig.TILE_SIZE, y * GameConfig.TILE_SIZE))
+            for y in range(1, 7) for x in range(10)]
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
+    sources = {name: pygame.image.load(os.path.join("imgs", name)) for name in ("map1.png", "map2.png", "start.png")}
+    alpha = {name: image.convert_alpha() for name, image in sources.items()}
+    optimized = {}
+    for name, image in sources.items():
+        optimized[name], mode = ResourceManager.optimize_surface(image)
+        print(f"{name}: {mode}")
+
+    cases = [
+        ("地圖塊圖層 (60 格)", lambda images: map_layer_items([images["map1.png"], images["map2.png"]]), 2000),
+        ("開始畫面 (800x560)", lambda images: [(images["start.png"], (0, 0))], 500),
+    ]
+    print(f"{'情況':<16} {'convert_alpha(ms)':>18} {'最佳化(ms)':>12} {'加速':>8}")
+    for label, build, frames in cases:
+        before = time_blits(screen, build(alpha), frames)
+        after = time_blits(screen, build(optimized), frames)
+        print(f"{label:<16} {before:>18.3f} {after:>12.3f} {before / after:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/board_bench.py
+
+"""
+大地圖基準測試：在 GameConfig.BOARD_ROWS x BOARD_COLUMNS (預設 50x200) 的地圖上種滿左側幾欄並放入大量殭屍，
+量測每秒 tick 數，以及 DirtyRectRenderer 在視窗固定與持續捲動時每幀的耗時 (含 display.update)，
+確認模擬成本只跟實體數有關、繪製成本只跟視窗內的物件有關，能維持 60 FPS。
+執行方式 (在專案根目錄)：python -m benchmarks.board_bench
+"""
+
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from game_config import GameConfig
+from game_state import GameState
+from simulation import GameSimulation
+from renderer import DirtyRectRenderer
+from camera import Camera
+
+def build_simulation(rows, columns, plant_columns, zombies, seed=0):
+    """建立 rows x columns 的地圖，左邊 plant_columns 欄種滿 (第一欄向日葵)，並在右半邊散布 zombies 隻殭屍。"""
+    GameConfig.BOARD_ROWS = rows
+    GameConfig.BOARD_COLUMNS = columns
+    simulation = GameSimulation(GameState(seed))
+    simulation.init_map_grid()
+    game_state = simulation.game_state
+    game_state.quiet = True # 升級等訊息不輸出
+    game_state.money = 10 ** 9
+    for grid_y in range(1, rows + 1):
+        for grid_x in range(plant_columns):
+            simulation.place_plant(grid_x, grid_y, "sunflower" if grid_x == 0 else "peashooter")
+    rng = random.Random(seed)
+    width = columns * GameConfig.TILE_SIZE
+    for _ in range(zombies):
+        game_state.spawn_zombie(rng.randrange(width // 2, width), rng.randrange(1, rows + 1) * GameConfig.TILE_SIZE)
+    return simulation
+
+def main():
+    parser = argparse.ArgumentParser(description="大地圖基準測試：模擬與繪製的耗時。")
+    parser.add_argument("--rows", type=int, default=50, help="地圖行數")
+    parser.add_argument("--columns", type=int, default=200, help="地圖列數")
+    parser.add_argument("--plant-columns", type=int, default=4, help="左邊種滿植物的欄數")
+    parser.add_argument("--zombies", type=int, default=2000, help="一開始放入的殭屍數")
+    parser.add_argument("--ticks", type=int, default=600, help="量測模擬的 tick 數")
+    parser.add_argument("--frames", type=int, default=300, help="每種情況量測的幀數")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
+    start = time.perf_counter()
+    simulation = build_simulation(args.rows, args.columns, args.plant_columns, args.zombies)
+    game_state = simulation.game_state
+    game_state.screen = screen
+    print(f"地圖 {args.rows}x{args.columns} ({args.rows * args.columns} 格)，建立耗時 {time.perf_counter() - start:.2f} 秒")
+
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        simulation.update()
+    tick_seconds = (time.perf_counter() - start) / args.ticks
+    print(f"模擬: {1 / tick_seconds:.0f} ticks/s ({tick_seconds * 1000:.2f} ms/tick)，"
+          f"{len(game_state.plants)} 植物, {len(game_state.zombies)} 殭屍, {len(game_state.bullets)} 子彈")
+
+    renderer = DirtyRectRenderer()
+    camera = Camera()
+    world_width, world_height = Camera.world_size()
+    # 視窗固定在殭屍與植物交戰的左側；捲動時每幀移動，整個畫面都要重畫
+    cases = [("視窗固定", 0, 0), ("持續捲動", GameConfig.CAMERA_SCROLL_SPEED, GameConfig.CAMERA_SCROLL_SPEED)]
+    print(f"{'情況':<8} {'平均(ms)':>10} {'最慢(ms)':>10} {'FPS':>8}")
+    for label, dx, dy in cases:
+        camera.rect.topleft = (0, 0)
+        renderer.invalidate_background()
+        times = []
+        for frame in range(args.frames):
+            if dx and (camera.rect.right >= world_width or camera.rect.bottom >= world_height):
+                camera.rect.topleft = (0, 0) # 捲到盡頭後從頭開始
+            camera.move(dx, dy)
+            simulation.update()
+            start = time.perf_counter()
+            renderer.draw(game_state, [], 1.0, camera)
+            times.append(time.perf_counter() - start)
+        mean = sum(times) / len(times)
+        print(f"{label:<8} {mean * 1000:>10.2f} {max(times) * 1000:>10.2f} {1 / mean:>8.0f}")
+    budget = 1 / GameConfig.RENDER_FPS
+    print(f"每幀預算 (模擬一個 tick + 繪製) {budget * 1000:.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bullet_bench.py
+
+"""
+子彈預測基準測試：在一般物件模式下比較逐 tick 檢查碰撞與 GameConfig.USE_PREDICTIVE_BULLETS 預測命中 tick 兩種子彈更新，
+量測子彈階段每個 tick 的耗時與碰撞查詢次數，並確認兩種模式跑完的分數、擊殺與場上狀態完全相同。
+執行方式 (在專案根目錄)：python -m benchmarks.bullet_bench
+"""
+
+import argparse
+import random
+from game_config import GameConfig
+from game_state import GameState
+from simulation import GameSimulation
+from snapshot import take_snapshot
+
+class StageTimer:
+    """最簡單的 profiler：累加各階段的秒數 (GameSimulation.profiler 只需要 add 方法)。"""
+    def __init__(self):
+        self.seconds = {}
+
+    def add(self, stage, seconds):
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+def build_simulation(predictive, rows, columns, zombies, seed=0):
+    """rows x columns 的地圖，左邊兩欄種豌豆射手，右半邊散布 zombies 隻殭屍 (子彈飛行距離長)。"""
+    GameConfig.USE_PREDICTIVE_BULLETS = predictive
+    GameConfig.BOARD_ROWS = rows
+    GameConfig.BOARD_COLUMNS = columns
+    simulation = GameSimulation(GameState(seed))
+    simulation.init_map_grid()
+    game_state = simulation.game_state
+    game_state.quiet = True # 升級等訊息不輸出
+    game_state.money = 10 ** 9
+    for grid_y in range(1, rows + 1):
+        for grid_x in range(2):
+            simulation.place_plant(grid_x, grid_y, "peashooter")
+    rng = random.Random(seed)
+    width = columns * GameConfig.TILE_SIZE
+    for _ in range(zombies):
+        game_state.spawn_zombie(rng.randrange(width // 2, width), rng.randrange(1, rows + 1) * GameConfig.TILE_SIZE)
+    return simulation
+
+def run(simulation, ticks):
+    """推進 ticks 個 tick，回傳 (子彈階段每 tick 秒數, 每 tick 碰撞查詢次數)。"""
+    index = simulation.game_state.spatial_index
+    first_zombie_hit = index.first_zombie_hit
+    queries = 0
+    def counted(box):
+        nonlocal queries
+        queries += 1
+        return first_zombie_hit(box)
+    index.first_zombie_hit = counted
+    simulation.profiler = StageTimer()
+    for _ in range(ticks):
+        simulation.update()
+    return simulation.profiler.seconds["bullets"] / ticks, queries / ticks
+
+def main():
+    parser = argparse.ArgumentParser(description="子彈預測基準測試：逐 tick 檢查與預測命中 tick。")
+    parser.add_argument("--rows", type=int, default=12, help="地圖行數")
+    parser.add_argument("--columns", type=int, default=60, help="地圖列數 (越寬子彈飛越久)")
+    parser.add_argument("--zombies", type=int, default=400, help="一開始放入的殭屍數")
+    parser.add_argument("--ticks", type=int, default=1500, help="模擬的 tick 數")
+    args = parser.parse_args()
+
+    saved = (GameConfig.USE_PREDICTIVE_BULLETS, GameConfig.BOARD_ROWS, GameConfig.BOARD_COLUMNS)
+    try:
+        print(f"{'模式':<10} {'子彈階段(ms/tick)':>18} {'碰撞查詢/tick':>14} {'場上子彈':>10}")
+        results = {}
+        for label, predictive in (("逐 tick", False), ("預測", True)):
+            simulation = build_simulation(predictive, args.rows, args.columns, args.zombies)
+            seconds, queries = run(simulation, args.ticks)
+            game_state = simulation.game_state
+            results[label] = (seconds, take_snapshot(game_state))
+            print(f"{label:<10} {seconds * 1000:>18.3f} {queries:>14.1f} {len(game_state.bullets):>10}")
+    finally:
+        GameConfig.USE_PREDICTIVE_BULLETS, GameConfig.BOARD_ROWS, GameConfig.BOARD_COLUMNS = saved
+    (step_seconds, step_state), (predict_seconds, predict_state) = results.values()
+    print(f"加速 {step_seconds / predict_seconds:.2f}x，分數 {predict_state['score']}，"
+          f"結果與逐 tick 檢查{'完全相同' if step_state == predict_state else '不同'}")
+
+if __name__ == '__main__':
+    main()
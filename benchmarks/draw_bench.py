@@ -0,0 +1,100 @@
+# benchmarks/draw_bench.py
+
+"""
+繪製基準測試：在地圖上放 60 株植物與數千隻殭屍/子彈，比較三種畫法每幀的耗時 (不含 display.update)：
+逐一呼叫 GameObject.draw (舊的寫法)、pygame.sprite.LayeredUpdates 分圖層群組、
+以及 renderer.layer_blit_items 每個圖層一次 Surface.blits。
+除了畫到螢幕，也畫到 1x1 的 surface (幾乎所有 blit 都被裁掉)，只量測每個物件的 Python 呼叫開銷，
+也就是批次繪製省下的部分；畫到螢幕時像素運算通常佔大部分時間。
+執行方式 (在專案根目錄)：python -m benchmarks.draw_bench
+"""
+
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from game_config import GameConfig
+from game_state import GameState
+from simulation import GameSimulation
+from renderer import layer_blit_items
+
+def build_state(sprites, seed=0):
+    """建立有完整地圖、60 株植物，以及殭屍與子彈各 sprites // 2 個 (隨機散布) 的遊戲狀態。"""
+    GameConfig.USE_ARRAY_STORE = False # 逐物件與群組畫法都需要一般物件
+    simulation = GameSimulation(GameState(seed))
+    simulation.init_map_grid()
+    game_state = simulation.game_state
+    game_state.money = 10 ** 9
+    for grid_y in range(1, 7):
+        for grid_x in range(10):
+            simulation.place_plant(grid_x, grid_y, "sunflower" if grid_x < 2 else "peashooter")
+    rng = random.Random(seed)
+    for _ in range(sprites // 2):
+        y = rng.randrange(1, 7) * GameConfig.TILE_SIZE
+        game_state.spawn_zombie(rng.randrange(GameConfig.SCREEN_WIDTH), y)
+        game_state.spawn_bullet(rng.randrange(GameConfig.SCREEN_WIDTH), y + 15)
+    return game_state
+
+def draw_per_object(screen, game_state):
+    screen.fill((255, 255, 255))
+    for row in game_state.game_map_tiles:
+        for tile in row:
+            tile.draw(screen)
+    for entities in (game_state.plants, game_state.bullets, game_state.zombies):
+        for entity in entities:
+            entity.draw(screen)
+
+def build_group(game_state):
+    """把所有物件的 sprite 檢視依圖層加入 LayeredUpdates (0 地圖塊、1 植物、2 子彈、3 殭屍)。"""
+    group = pygame.sprite.LayeredUpdates()
+    for layer, entities in enumerate(([tile for row in game_state.game_map_tiles for tile in row],
+                                      game_state.plants, game_state.bullets, game_state.zombies)):
+        group.add(*[entity.to_sprite() for entity in entities], layer=layer)
+    return group
+
+def draw_layered_group(screen, group):
+    screen.fill((255, 255, 255))
+    group.draw(screen)
+
+def draw_batched(screen, game_state):
+    screen.fill((255, 255, 255))
+    for items in layer_blit_items(game_state):
+        screen.blits(items, doreturn=False)
+
+def time_frames(draw, frames):
+    """回傳每幀平均毫秒數 (取三次中最短)。"""
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(frames):
+            draw()
+        elapsed = (time.perf_counter() - start) / frames * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="繪製基準測試：逐物件 draw、LayeredUpdates 與分圖層 blits。")
+    parser.add_argument("--sprites", type=int, nargs="+", default=[1000, 5000, 10000], help="殭屍加子彈的總數")
+    parser.add_argument("--frames", type=int, default=50, help="每種畫法量測幾幀")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
+    targets = (("螢幕", screen), ("1x1 (只量呼叫開銷)", pygame.Surface((1, 1), 0, screen)))
+    print(f"{'目標':<18} {'實體數':>8} {'逐物件(ms)':>12} {'LayeredUpdates(ms)':>20} {'分圖層 blits(ms)':>18} {'加速':>7}")
+    for sprites in args.sprites:
+        game_state = build_state(sprites)
+        group = build_group(game_state)
+        for label, target in targets:
+            per_object = time_frames(lambda: draw_per_object(target, game_state), args.frames)
+            layered = time_frames(lambda: draw_layered_group(target, group), args.frames)
+            batched = time_frames(lambda: draw_batched(target, game_state), args.frames)
+            print(f"{label:<18} {sprites:>8} {per_object:>12.2f} {layered:>20.2f} {batched:>18.2f} "
+                  f"{per_object / batched:>6.2f}x")
+
+if __name__ == '__main__':
+    main()
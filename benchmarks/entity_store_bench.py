@@ -0,0 +1,53 @@
+# benchmarks/entity_store_bench.py
+
+"""
+陣列儲存區基準測試：比較一般物件模式與 NumPy 陣列模式 (GameConfig.USE_ARRAY_STORE) 每個 tick 的耗時。
+執行方式 (在專案根目錄)：python -m benchmarks.entity_store_bench
+"""
+
+import random
+import time
+from game_config import GameConfig
+from simulation import GameSimulation
+
+def build_simulation(use_array_store, bullet_count, zombie_count, seed=0):
+    """建立一個有 bullet_count 顆子彈在場上飛、zombie_count 隻殭屍在右側排隊的模擬。"""
+    GameConfig.USE_ARRAY_STORE = use_array_store
+    rng = random.Random(seed)
+    simulation = GameSimulation()
+    simulation.init_map_grid()
+    game_state = simulation.game_state
+    game_state.quiet = True # 升級訊息會大量輸出，測試時不輸出
+    for _ in range(zombie_count):
+        row = rng.randint(1, 6)
+        game_state.spawn_zombie(rng.randint(GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_WIDTH * 3),
+                                row * GameConfig.TILE_SIZE)
+    for _ in range(bullet_count):
+        row = rng.randint(1, 6)
+        game_state.spawn_bullet(rng.randint(0, GameConfig.SCREEN_WIDTH), row * GameConfig.TILE_SIZE + 15)
+    # 殭屍生成計時器設得很大，避免測試過程中生成新的殭屍
+    game_state.zombie_spawn_threshold = 10 ** 9
+    return simulation
+
+def time_ticks(simulation, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        simulation.update()
+    elapsed = time.perf_counter() - start
+    return elapsed / ticks
+
+def main():
+    use_array_store = GameConfig.USE_ARRAY_STORE
+    print(f"{'子彈數':>8} {'殭屍數':>8} {'物件模式(ms/tick)':>18} {'陣列模式(ms/tick)':>18} {'加速':>8}")
+    try:
+        for bullet_count, zombie_count in ((1000, 100), (10000, 1000), (50000, 5000)):
+            ticks = 20
+            object_time = time_ticks(build_simulation(False, bullet_count, zombie_count), ticks)
+            array_time = time_ticks(build_simulation(True, bullet_count, zombie_count), ticks)
+            print(f"{bullet_count:>8} {zombie_count:>8} {object_time * 1000:>18.2f} {array_time * 1000:>18.2f} "
+                  f"{object_time / array_time:>7.1f}x")
+    finally:
+        GameConfig.USE_ARRAY_STORE = use_array_store
+
+if __name__ == '__main__':
+    main()
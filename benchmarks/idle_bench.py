@@ -0,0 +1,71 @@
+# benchmarks/idle_bench.py
+
+"""
+等待畫面閒置 CPU 基準測試：比較原本的 pygame.event.get 輪詢迴圈 (規則說明、遊戲結束畫面沒有 clock.tick，
+開始畫面每秒 60 次) 與 SceneManager 以 pygame.event.wait 阻塞，在沒有任何輸入時各佔用多少 CPU。
+每種方式等待 --seconds 秒後由 pygame.time.set_timer 送出一次滑鼠點擊結束。
+執行方式 (在專案根目錄)：python -m benchmarks.idle_bench
+"""
+
+import argparse
+import os
+import time
+
+# 不開視窗也不出聲
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game_config import GameConfig
+from scenes import Scene, RulesScene, SceneManager
+
+class IdleScene(RulesScene):
+    """規則說明畫面，但點擊時直接結束 SceneManager.run (原本會切換回開始畫面)。"""
+    def handle_event(self, event):
+        return Scene.EXIT if event.type == pygame.MOUSEBUTTONDOWN else None
+
+def schedule_click(seconds):
+    """seconds 秒後送出一次滑鼠點擊 。"""
+    click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(0, 0), button=1)
+    pygame.time.set_timer(click, int(seconds * 1000), loops=1)
+
+def busy_loop(clock=None):
+    """原本的等待迴圈：不斷 pygame.event.get，有 clock 時每秒最多 60 次。"""
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                return
+        if clock is not None:
+            clock.tick(60)
+
+def measure(wait, seconds):
+    """執行 wait() 直到點擊結束，回傳 (CPU 使用率 %, 實際秒數)。"""
+    pygame.event.clear()
+    schedule_click(seconds)
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    wait()
+    elapsed = time.perf_counter() - start
+    return (time.process_time() - cpu_start) / elapsed * 100, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="等待畫面閒置 CPU 基準測試：輪詢迴圈與 pygame.event.wait。")
+    parser.add_argument("--seconds", type=float, default=3.0, help="每種方式閒置等待的秒數")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
+    scenes = SceneManager(screen)
+    scenes.add("rules", IdleScene("fonts/fontsmsjh.ttf"))
+    measure(lambda: scenes.run("rules"), 0.1) # 先合成一次畫面，不算在量測內
+    clock = pygame.time.Clock()
+    print(f"{'等待方式':<24} {'CPU 使用率(%)':>14} {'等待秒數':>10}")
+    for label, wait in (("event.get 輪詢", busy_loop),
+                        ("event.get + tick(60)", lambda: busy_loop(clock)),
+                        ("SceneManager (event.wait)", lambda: scenes.run("rules"))):
+        cpu, elapsed = measure(wait, args.seconds)
+        print(f"{label:<24} {cpu:>14.1f} {elapsed:>10.2f}")
+    pygame.quit()
+
+if __name__ == '__main__':
+    main()
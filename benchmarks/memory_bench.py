@@ -0,0 +1,102 @@
+# benchmarks/memory_bench.py
+
+"""
+記憶體基準測試：以 tracemalloc 量測建立大量殭屍與子彈 (預設各 100k) 時，每個實體平均佔用的位元組數 (含存放它的列表)。
+比較三種表示法：舊的 pygame.sprite.Sprite 子類別 (每個物件有 __dict__、groups 字典、Rect 與圖片參考)、
+目前以 __slots__ 實作的 Zombie / PeaBullet，以及 EntityStore 的 NumPy 欄位 (GameConfig.USE_ARRAY_STORE)。
+執行方式 (在專案根目錄)：python -m benchmarks.memory_bench
+"""
+
+import argparse
+import gc
+import os
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from game_config import GameConfig
+from resources import ResourceManager
+from game_objects import Zombie, PeaBullet
+from entity_store import EntityStore
+
+class SpriteZombie(pygame.sprite.Sprite):
+    """舊寫法的殭屍 (只保留欄位配置，用來比較記憶體)。"""
+    def __init__(self, x, y):
+        super().__init__()
+        self.image = ResourceManager.load_image('zombie.png')
+        self.rect = self.image.get_rect(topleft=(x, y))
+        self.live = True
+        self.prev_x = x
+        self.hp = GameConfig.ZOMBIE_HP_START
+        self.damage = GameConfig.ZOMBIE_DAMAGE
+        self.speed = GameConfig.ZOMBIE_SPEED
+        self.stop = False
+
+class SpriteBullet(pygame.sprite.Sprite):
+    """舊寫法的子彈 (只保留欄位配置，用來比較記憶體)。"""
+    def __init__(self, x, y):
+        super().__init__()
+        self.image = ResourceManager.load_image('peabullet.png')
+        self.rect = self.image.get_rect(topleft=(x, y))
+        self.live = True
+        self.prev_x = x
+        self.damage = GameConfig.BULLET_DAMAGE
+        self.speed = GameConfig.BULLET_SPEED
+
+def positions(count):
+    """不同的座標 (大於 256 的整數不會共用快取的小整數物件，比較接近實際遊戲)。"""
+    width = GameConfig.BOARD_COLUMNS * GameConfig.TILE_SIZE
+    return [(1000 + i % width, (1 + i % GameConfig.BOARD_ROWS) * GameConfig.TILE_SIZE) for i in range(count)]
+
+def measure(build):
+    """回傳 build() 建立的資料佔用的位元組數 (tracemalloc 量測的增加量)。"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    data = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del data
+    return used
+
+def build_objects(zombie_class, bullet_class, coords):
+    return ([zombie_class(x, y) for x, y in coords], [bullet_class(x, y + 15) for x, y in coords])
+
+def build_store(coords):
+    store = EntityStore()
+    for x, y in coords:
+        store.add_zombie(x, y)
+        store.add_bullet(x, y + 15)
+    return store
+
+def main():
+    parser = argparse.ArgumentParser(description="記憶體基準測試：每個殭屍/子彈佔用的位元組數。")
+    parser.add_argument("--count", type=int, default=100000, help="殭屍與子彈各建立幾個")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
+    # 先載入圖片與建立一次實體，圖片快取與尺寸快取不算在量測內
+    build_objects(SpriteZombie, SpriteBullet, positions(1))
+    build_objects(Zombie, PeaBullet, positions(1))
+    build_store(positions(1))
+    coords = positions(args.count)
+    entities = args.count * 2
+
+    cases = [
+        ("pygame.sprite.Sprite (舊)", lambda: build_objects(SpriteZombie, SpriteBullet, coords)),
+        ("__slots__ 實體", lambda: build_objects(Zombie, PeaBullet, coords)),
+        ("EntityStore 欄位", lambda: build_store(coords)),
+    ]
+    print(f"殭屍與子彈各 {args.count} 個")
+    print(f"{'表示法':<26} {'總計(MB)':>10} {'每個實體(bytes)':>16}")
+    results = []
+    for label, build in cases:
+        used = measure(build)
+        results.append(used)
+        print(f"{label:<26} {used / 2 ** 20:>10.1f} {used / entities:>16.0f}")
+    print(f"__slots__ 實體比舊寫法節省 {1 - results[1] / results[0]:.0%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/pipeline_bench.py
+
+"""
+管線化基準測試：在 SDL dummy 視訊驅動下，比較一般的遊戲迴圈 (每幀依序推進 tick、繪製) 與
+GameConfig.PIPELINED_SIMULATION (工作執行緒推進 tick 的同時主執行緒繪製上一幀的快照) 每秒能完成的幀數。
+每幀固定推進 --ticks-per-frame 個 tick，不限制幀率，所以兩種方式跑完的遊戲狀態應該完全相同。
+只有遊戲邏輯與繪製真的能同時執行時 (多核心，且繪製大多在釋放 GIL 的 pygame 呼叫中) 才會變快。
+執行方式 (在專案根目錄)：python -m benchmarks.pipeline_bench
+"""
+
+import argparse
+import os
+import random
+import time
+
+# 必須在 pygame 初始化之前設定，不開真正的視窗也不出聲
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from game_config import GameConfig
+from game_manager import GameManager
+from pipeline import SimulationPipeline
+from snapshot import take_snapshot
+
+def build_game(args):
+    """rows x columns 的地圖，左邊兩欄種豌豆射手、其餘散布向日葵，右半邊放 zombies 隻殭屍。"""
+    GameConfig.BOARD_ROWS = args.rows
+    GameConfig.BOARD_COLUMNS = args.columns
+    game_manager = GameManager()
+    game_state = game_manager.game_state
+    game_state.reset_game_state(seed=args.seed)
+    game_state.quiet = True # 升級等訊息不輸出
+    game_manager._init_map_grid()
+    game_state.money = 10 ** 9
+    rng = random.Random(args.seed)
+    for grid_y in range(1, args.rows + 1):
+        for grid_x in range(args.columns // 2):
+            if grid_x < 2:
+                game_manager.simulation.place_plant(grid_x, grid_y, "peashooter")
+            elif rng.random() < 0.3:
+                game_manager.simulation.place_plant(grid_x, grid_y, "sunflower")
+    width = args.columns * GameConfig.TILE_SIZE
+    for _ in range(args.zombies):
+        game_state.spawn_zombie(rng.randrange(width // 2, width), rng.randrange(1, args.rows + 1) * GameConfig.TILE_SIZE)
+    game_manager.renderer.request_full_redraw()
+    return game_manager
+
+def run_ticks(game_manager, ticks):
+    for _ in range(ticks):
+        game_manager._update_game_state()
+
+def run_serial(game_manager, frames, ticks_per_frame):
+    for _ in range(frames):
+        run_ticks(game_manager, ticks_per_frame)
+        game_manager._draw_game_elements()
+
+def run_pipelined(game_manager, frames, ticks_per_frame):
+    pipeline = SimulationPipeline(game_manager.game_state)
+    try:
+        for _ in range(frames):
+            pipeline.submit(run_ticks, game_manager, ticks_per_frame)
+            game_manager._draw_game_elements(1.0, pipeline.front)
+            pipeline.wait()
+    finally:
+        pipeline.close()
+
+def comparable_state(game_state):
+    """可以用 == 比較的遊戲狀態快照 (陣列儲存區的欄位轉成列表)。"""
+    snapshot = take_snapshot(game_state)
+    if snapshot["entity_store"] is not None:
+        snapshot["entity_store"] = {kind: {name: array.tolist() for name, array in columns.items()}
+                                    for kind, columns in snapshot["entity_store"].items()}
+    return snapshot
+
+def measure(args, pipelined):
+    """回傳 (每秒幀數, 遊戲結束時的快照)。"""
+    game_manager = build_game(args)
+    run = run_pipelined if pipelined else run_serial
+    start = time.perf_counter()
+    run(game_manager, args.frames, args.ticks_per_frame)
+    seconds = time.perf_counter() - start
+    return args.frames / seconds, comparable_state(game_manager.game_state)
+
+def main():
+    parser = argparse.ArgumentParser(description="管線化基準測試：遊戲邏輯與繪製在不同執行緒。")
+    parser.add_argument("--rows", type=int, default=12, help="地圖行數")
+    parser.add_argument("--columns", type=int, default=40, help="地圖列數")
+    parser.add_argument("--zombies", type=int, default=2000, help="一開始放入的殭屍數")
+    parser.add_argument("--frames", type=int, default=300, help="量測的幀數")
+    parser.add_argument("--ticks-per-frame", type=int, default=1, help="每幀推進的 tick 數")
+    parser.add_argument("--seed", type=int, default=0, help="隨機種子")
+    parser.add_argument("--array-store", action="store_true", help="啟用 GameConfig.USE_ARRAY_STORE")
+    parser.add_argument("--full-redraw", action="store_true", help="關閉 GameConfig.USE_DIRTY_RECT_RENDERER")
+    args = parser.parse_args()
+
+    GameConfig.USE_ARRAY_STORE = args.array_store
+    GameConfig.USE_DIRTY_RECT_RENDERER = not args.full_redraw
+    GameConfig.AUTOSAVE_INTERVAL_TICKS = 0 # 不寫自動存檔
+    GameConfig.RECORD_REPLAYS = False
+
+    print(f"CPU 核心數: {os.cpu_count()}")
+    print(f"{'模式':<10} {'幀/秒':>10}")
+    results = {}
+    for label, pipelined in (("依序", False), ("管線化", True)):
+        fps, snapshot = measure(args, pipelined)
+        results[label] = (fps, snapshot)
+        print(f"{label:<10} {fps:>10.1f}")
+    (serial_fps, serial_state), (pipelined_fps, pipelined_state) = results.values()
+    print(f"加速 {pipelined_fps / serial_fps:.2f}x，"
+          f"遊戲狀態與依序執行{'完全相同' if serial_state == pipelined_state else '不同'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+# benchmarks/scenario_bench.py
+
+"""
+情境基準測試：在 SDL dummy 視訊驅動下，對幾種固定情境量測
+GameManager._update_game_state 的每秒 tick 數與 _draw_game_elements 的每秒幀數，
+結果寫成 JSON，方便比較不同 commit 的效能並抓出退步。
+執行方式 (在專案根目錄)：
+    python -m benchmarks.scenario_bench
+    python -m benchmarks.scenario_bench --compare 舊結果.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import time
+
+# 必須在 pygame 初始化之前設定，不開真正的視窗也不出聲
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game_config import GameConfig
+from game_manager import GameManager
+
+NO_WAVES = 10 ** 9 # 用來關閉計時生成殭屍的生成間隔
+
+def fill_board(game_manager, plant_kind):
+    """在整張地圖 (GameConfig.BOARD_ROWS x BOARD_COLUMNS) 的每一格都種植 plant_kind。"""
+    game_state = game_manager.game_state
+    game_state.money = 10 ** 9
+    for grid_y in range(1, GameConfig.BOARD_ROWS + 1):
+        for grid_x in range(GameConfig.BOARD_COLUMNS):
+            game_manager.simulation.place_plant(grid_x, grid_y, plant_kind)
+
+def board_right_edge():
+    """地圖右邊界的 x 座標。"""
+    return GameConfig.BOARD_COLUMNS * GameConfig.TILE_SIZE
+
+def add_lane_zombies(game_manager, per_lane, start_x, spacing):
+    """每一行從 start_x 往右每隔 spacing 像素放一隻殭屍。"""
+    for row in range(1, GameConfig.BOARD_ROWS + 1):
+        for i in range(per_lane):
+            game_manager.game_state.spawn_zombie(start_x + i * spacing, row * GameConfig.TILE_SIZE)
+
+def setup_empty(game_manager):
+    pass
+
+def setup_full_peashooters(game_manager):
+    fill_board(game_manager, "peashooter")
+    game_manager._init_zombies()
+
+def setup_lane_zombies(per_lane):
+    def setup(game_manager):
+        fill_board(game_manager, "peashooter")
+        add_lane_zombies(game_manager, per_lane, board_right_edge() - 100, 4)
+    return setup
+
+def setup_bullet_storm(game_manager):
+    fill_board(game_manager, "peashooter")
+    add_lane_zombies(game_manager, 20, board_right_edge() - 100, 5)
+    for row in range(1, GameConfig.BOARD_ROWS + 1):
+        for i in range(2000):
+            game_manager.game_state.spawn_bullet(i * board_right_edge() // 2000, row * GameConfig.TILE_SIZE + 15)
+
+def setup_level_transitions(game_manager):
+    fill_board(game_manager, "peashooter")
+    add_lane_zombies(game_manager, 500, board_right_edge() - 100, 8)
+
+# 每個情境：名稱、說明、GameConfig 覆寫 (建立 GameManager 之前套用)、設置函式
+SCENARIOS = [
+    ("empty", "空白地圖，沒有植物也沒有殭屍",
+     {"ZOMBIE_SPAWN_INTERVAL_BASE": NO_WAVES}, setup_empty),
+    ("full_peashooters", "整張地圖種滿豌豆射手，正常生成殭屍",
+     {}, setup_full_peashooters),
+    ("lane_zombies_1k", "滿版豌豆射手，每行 1000 隻殭屍",
+     {"ZOMBIE_SPAWN_INTERVAL_BASE": NO_WAVES}, setup_lane_zombies(1000)),
+    ("lane_zombies_10k", "滿版豌豆射手，每行 10000 隻殭屍",
+     {"ZOMBIE_SPAWN_INTERVAL_BASE": NO_WAVES}, setup_lane_zombies(10000)),
+    ("bullet_storm", "滿版豌豆射手每個 tick 都射擊，每行 2000 顆子彈打在打不死的殭屍上",
+     {"ZOMBIE_SPAWN_INTERVAL_BASE": NO_WAVES, "ZOMBIE_HP_START": 10 ** 9, "PEASHOOTER_SHOT_INTERVAL": 1},
+     setup_bullet_storm),
+    ("level_transitions", "殭屍一槍斃命，每次擊殺都升一關 (PeaBullet._check_collision 內的升級流程)",
+     {"ZOMBIE_SPAWN_INTERVAL_BASE": NO_WAVES, "ZOMBIE_HP_START": GameConfig.BULLET_DAMAGE,
+      "INITIAL_REMNANT_SCORE": GameConfig.SCORE_PER_ZOMBIE, "NEXT_LEVEL_SCORE_MULTIPLIER": 0, "MAX_LEVEL": 10 ** 9},
+     setup_level_transitions),
+]
+
+@contextlib.contextmanager
+def config_overrides(overrides):
+    """暫時覆寫 GameConfig 的設定，離開時還原。"""
+    saved = {name: getattr(GameConfig, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(GameConfig, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(GameConfig, name, value)
+
+def timed_loop(func, count, max_seconds, game_state):
+    """最多呼叫 func count 次或 max_seconds 秒 (遊戲結束也會停止)，回傳 (次數, 秒數)。"""
+    done = 0
+    start = time.perf_counter()
+    deadline = start + max_seconds
+    while done < count and not game_state.game_over:
+        func()
+        done += 1
+        if time.perf_counter() >= deadline:
+            break
+    return done, time.perf_counter() - start
+
+def run_scenario(name, description, overrides, setup, args):
+    """建立新的 GameManager、設置情境，量測更新與繪製的速度。"""
+    with config_overrides(overrides):
+        game_manager = GameManager()
+        game_state = game_manager.game_state
+        game_state.reset_game_state(seed=args.seed) # 固定種子，每次跑的情境都相同
+        game_state.quiet = True # 升級訊息等輸出不計入量測
+        game_manager._init_map_grid()
+        setup(game_manager)
+
+        ticks, update_seconds = timed_loop(game_manager._update_game_state, args.ticks, args.max_seconds, game_state)
+        game_manager.renderer.request_full_redraw()
+        frames, draw_seconds = timed_loop(game_manager._draw_game_elements, args.frames, args.max_seconds, game_state)
+
+        return {
+            "name": name,
+            "description": description,
+            "ticks": ticks,
+            "update_seconds": update_seconds,
+            "update_ticks_per_sec": ticks / update_seconds if update_seconds > 0 else None,
+            "frames": frames,
+            "draw_seconds": draw_seconds,
+            "draw_frames_per_sec": frames / draw_seconds if draw_seconds > 0 else None,
+            "entities": {"plants": len(game_state.plants), "bullets": len(game_state.bullets),
+                         "zombies": len(game_state.zombies),
+                         "store_bullets": game_state.entity_store.bullets.count if game_state.entity_store else 0,
+                         "store_zombies": game_state.entity_store.zombies.count if game_state.entity_store else 0},
+            "level": game_state.current_level,
+            "game_over": game_state.game_over,
+        }
+
+def git_commit():
+    """目前的 git commit (取不到時回傳 None)。"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline, threshold):
+    """與舊的結果比較，回傳退步超過 threshold (比例) 的項目。"""
+    old = {scenario["name"]: scenario for scenario in baseline["scenarios"]}
+    regressions = []
+    print(f"\n與 {baseline.get('commit')} 比較:")
+    for scenario in results["scenarios"]:
+        before = old.get(scenario["name"])
+        if before is None:
+            continue
+        for key in ("update_ticks_per_sec", "draw_frames_per_sec"):
+            if not before.get(key) or not scenario.get(key):
+                continue
+            ratio = scenario[key] / before[key]
+            flag = ""
+            if ratio < 1 - threshold:
+                flag = "  <- 退步"
+                regressions.append((scenario["name"], key, ratio))
+            print(f"  {scenario['name']:<20} {key:<22} {ratio:>6.2f}x{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="情境基準測試：更新與繪製的吞吐量。")
+    parser.add_argument("--ticks", type=int, default=300, help="每個情境最多量測的 tick 數")
+    parser.add_argument("--frames", type=int, default=120, help="每個情境最多量測的幀數")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="每個情境的更新/繪製各自最多量測的秒數")
+    parser.add_argument("--seed", type=int, default=0, help="隨機種子")
+    parser.add_argument("--only", nargs="*", default=None, help="只跑指定名稱的情境")
+    parser.add_argument("--array-store", action="store_true", help="啟用 GameConfig.USE_ARRAY_STORE")
+    parser.add_argument("--full-redraw", action="store_true", help="關閉 GameConfig.USE_DIRTY_RECT_RENDERER")
+    parser.add_argument("--output", default=None,
+                        help="結果 JSON 檔 (預設 benchmarks/results/scenarios_<commit>.json)")
+    parser.add_argument("--compare", default=None, help="要比較的舊結果 JSON 檔")
+    parser.add_argument("--threshold", type=float, default=0.2, help="比較時視為退步的下降比例")
+    args = parser.parse_args()
+
+    GameConfig.USE_ARRAY_STORE = args.array_store
+    GameConfig.USE_DIRTY_RECT_RENDERER = not args.full_redraw
+
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+        "config": {"USE_ARRAY_STORE": GameConfig.USE_ARRAY_STORE,
+                   "USE_DIRTY_RECT_RENDERER": GameConfig.USE_DIRTY_RECT_RENDERER},
+        "params": {"ticks": args.ticks, "frames": args.frames, "max_seconds": args.max_seconds, "seed": args.seed},
+        "scenarios": [],
+    }
+
+    print(f"{'情境':<20} {'ticks':>7} {'ticks/s':>10} {'幀數':>6} {'幀/s':>10}")
+    for name, description, overrides, setup in SCENARIOS:
+        if args.only and name not in args.only:
+            continue
+        scenario = run_scenario(name, description, overrides, setup, args)
+        results["scenarios"].append(scenario)
+        print(f"{name:<20} {scenario['ticks']:>7} {scenario['update_ticks_per_sec'] or 0:>10.1f} "
+              f"{scenario['frames']:>6} {scenario['draw_frames_per_sec'] or 0:>10.1f}")
+
+    output = args.output or os.path.join("benchmarks", "results", f"scenarios_{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"結果已寫入 {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+# benchmarks/server_bench.py
+
+"""
+遊戲伺服器負載測試 (本機的負載產生用戶端)：對 server.py 開啟大量連線，每條連線一局遊戲，
+用戶端依收到的金錢由左到右送出種植指令 (前兩欄向日葵，其餘豌豆射手)。
+量測每局實際達到的 ticks/s (目標 GameConfig.TICK_RATE)、伺服器推進所有 session 一個 tick 的耗時、
+捨棄的 tick 數，以及每則差異訊息的平均大小。
+預設自動啟動一個伺服器子行程；也可以用 --connect 連到已經在執行的伺服器。
+注意用戶端與伺服器在同一台機器上時會互相搶 CPU (用戶端只解析 JSON，負擔較小)。
+執行方式 (在專案根目錄)：python -m benchmarks.server_bench
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import time
+from game_config import GameConfig
+
+class LoadClient:
+    """一條連線 (一局遊戲) 的用戶端：記錄收到的 tick 與位元組數，金錢足夠時種下一株。"""
+    def __init__(self, seed):
+        self.seed = seed
+        self.first_tick = None
+        self.last_tick = None
+        self.deltas = 0
+        self.bytes = 0
+        self.money = 0
+        self.next_cell = 0 # 下一個要種的格子 (由左到右、由上到下的編號)
+
+    async def run(self, host, port, stop):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write((json.dumps({"op": "new", "seed": self.seed}) + "\n").encode("utf-8"))
+        rows = columns = 0
+        try:
+            while not stop.is_set():
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if message["op"] == "joined":
+                    rows, columns = message["rows"], message["columns"]
+                    continue
+                if message["op"] != "delta":
+                    continue
+                self.deltas += 1
+                self.bytes += len(line)
+                if self.first_tick is None:
+                    self.first_tick = message["t"]
+                self.last_tick = message["t"]
+                self.money = message.get("money", self.money)
+                if self.next_cell < rows * columns:
+                    grid_x, grid_y = divmod(self.next_cell, rows)
+                    kind = "sunflower" if grid_x < 2 else "peashooter"
+                    if self.money >= GameConfig.PLANT_PRICES[kind]:
+                        place = {"op": "place", "x": grid_x, "y": grid_y + 1, "kind": kind}
+                        writer.write((json.dumps(place) + "\n").encode("utf-8"))
+                        self.money -= GameConfig.PLANT_PRICES[kind]
+                        self.next_cell += 1
+        finally:
+            writer.close()
+
+async def request_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"op": "stats"}\n')
+    stats = json.loads(await reader.readline())
+    writer.close()
+    return stats
+
+async def measure(host, port, sessions, seconds):
+    """開啟 sessions 條連線跑 seconds 秒，回傳 (用戶端列表, 實際秒數, 開始與結束時的伺服器統計)。"""
+    stop = asyncio.Event()
+    clients = [LoadClient(seed) for seed in range(sessions)]
+    tasks = [asyncio.create_task(client.run(host, port, stop)) for client in clients]
+    await asyncio.sleep(1.0) # 等所有連線建立、session 開始推進
+    before = await request_stats(host, port)
+    start = time.perf_counter()
+    for client in clients:
+        client.first_tick = None
+        client.deltas = client.bytes = 0
+    await asyncio.sleep(seconds)
+    after = await request_stats(host, port)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return clients, elapsed, before, after
+
+async def start_server():
+    """在空閒的連接埠啟動 server.py 子行程，等到可以連線為止。"""
+    with socket.socket() as probe:
+        probe.bind((GameConfig.SERVER_HOST, 0))
+        port = probe.getsockname()[1]
+    process = await asyncio.create_subprocess_exec(sys.executable, "-m", "server", "--port", str(port),
+                                                   stdout=asyncio.subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection(GameConfig.SERVER_HOST, port)
+            writer.close()
+            return process, port
+        except OSError:
+            await asyncio.sleep(0.1)
+    process.kill()
+    raise RuntimeError("伺服器沒有啟動")
+
+async def main_async(args):
+    process = None
+    if args.connect:
+        host, port = args.connect.rsplit(":", 1)
+        port = int(port)
+    else:
+        process, port = await start_server()
+        host = GameConfig.SERVER_HOST
+    try:
+        print(f"{'session 數':>10} {'每局 ticks/s':>12} {'總 ticks/s':>10} {'伺服器 tick(ms)':>16} "
+              f"{'捨棄 tick':>10} {'差異(bytes)':>12}")
+        for sessions in args.sessions:
+            clients, elapsed, before, after = await measure(host, port, sessions, args.seconds)
+            rates = [(client.last_tick - client.first_tick) / elapsed for client in clients if client.first_tick is not None]
+            per_session = sum(rates) / len(rates) if rates else 0.0
+            ticks = after["ticks"] - before["ticks"]
+            tick_ms = (after["tick_ms"] * after["ticks"] - before["tick_ms"] * before["ticks"]) / max(ticks, 1)
+            deltas = sum(client.deltas for client in clients)
+            delta_bytes = sum(client.bytes for client in clients) / max(deltas, 1)
+            print(f"{sessions:>10} {per_session:>12.1f} {per_session * len(rates):>10.0f} {tick_ms:>16.2f} "
+                  f"{after['dropped_ticks'] - before['dropped_ticks']:>10} {delta_bytes:>12.0f}")
+            await asyncio.sleep(0.5) # 等伺服器移除這一輪的 session
+    finally:
+        if process is not None:
+            process.terminate()
+            await process.wait()
+    print(f"目標: 每局 {GameConfig.TICK_RATE} ticks/s；伺服器 tick 超過 {1000 / GameConfig.TICK_RATE:.1f} ms 時會開始捨棄 tick")
+
+def main():
+    parser = argparse.ArgumentParser(description="遊戲伺服器負載測試：大量連線同時遊戲。")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[50, 100, 200, 400], help="同時連線 (遊戲) 數")
+    parser.add_argument("--seconds", type=float, default=5.0, help="每種連線數量測幾秒")
+    parser.add_argument("--connect", default=None, help="連到已經在執行的伺服器 (host:port)，不自動啟動")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/snapshot_bench.py
+
+"""
+快照基準測試：先以無頭模式跑一段有植物、殭屍與子彈的遊戲，
+再量測 take_snapshot、restore_snapshot、clone_game_state 與存檔/讀檔每秒可以執行幾次，
+並確認分身往下跑的結果與原本完全相同。
+執行方式 (在專案根目錄)：python -m benchmarks.snapshot_bench
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from game_config import GameConfig
+from game_state import GameState
+from simulation import GameSimulation
+from snapshot import take_snapshot, restore_snapshot, clone_game_state, save_snapshot, load_snapshot
+from sweep import greedy_policy
+
+def advance(simulation, ticks):
+    """以 greedy 策略種植並推進 ticks 個 tick (遊戲結束就停)。"""
+    for _ in range(ticks):
+        greedy_policy(simulation, simulation.game_state.tick)
+        simulation.update()
+        if simulation.game_state.game_over:
+            break
+
+def summary(game_state):
+    return (game_state.tick, game_state.score, game_state.money, game_state.current_level, game_state.rng.getstate())
+
+def rate(function, seconds):
+    """在 seconds 秒內重複呼叫 function，回傳每秒次數。"""
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        function()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="快照基準測試：擷取、還原、複製與存檔的速度。")
+    parser.add_argument("--ticks", type=int, default=2500, help="量測前先跑幾個 tick")
+    parser.add_argument("--seconds", type=float, default=2.0, help="每一項量測幾秒")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
+    simulation = GameSimulation(GameState(seed=3))
+    simulation.game_state.quiet = True # 升級等訊息不輸出 (分身也會複製這個設定)
+    simulation.init_map_grid()
+    simulation.init_zombies()
+    advance(simulation, args.ticks)
+    game_state = simulation.game_state
+    print(f"tick {game_state.tick}: {len(game_state.plants)} 植物, {len(game_state.zombies)} 殭屍, "
+          f"{len(game_state.bullets)} 子彈 (USE_ARRAY_STORE={GameConfig.USE_ARRAY_STORE})")
+
+    snapshot = take_snapshot(game_state)
+    target = GameState()
+    path = os.path.join(tempfile.mkdtemp(prefix="snapshot_bench_"), "snapshot.json")
+    results = [
+        ("take_snapshot", rate(lambda: take_snapshot(game_state), args.seconds)),
+        ("restore_snapshot", rate(lambda: restore_snapshot(target, snapshot), args.seconds)),
+        ("clone_game_state", rate(lambda: clone_game_state(game_state), args.seconds)),
+        ("save_snapshot", rate(lambda: save_snapshot(snapshot, path), args.seconds)),
+        ("load_snapshot", rate(lambda: load_snapshot(path), args.seconds)),
+    ]
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
+    print(f"{'操作':<18} {'次/秒':>10} {'每次(ms)':>10}")
+    for label, per_second in results:
+        print(f"{label:<18} {per_second:>10.0f} {1000 / per_second:>10.3f}")
+
+    # 分身與原本各自再跑一段，結果必須完全相同
+    fork = GameSimulation(clone_game_state(game_state))
+    advance(simulation, args.ticks)
+    advance(fork, args.ticks)
+    same = summary(fork.game_state) == summary(game_state)
+    print(f"分身繼續執行的結果{'一致' if same else '不一致'}")
+
+if __name__ == '__main__':
+    main()
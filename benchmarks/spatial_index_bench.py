@@ -0,0 +1,107 @@
+# benchmarks/spatial_index_bench.py
+
+"""
+空間索引基準測試：比較逐一掃描整個列表 (舊寫法) 與 SpatialIndex 查詢的耗時，並確認兩者結果一致。
+執行方式 (在專案根目錄)：python -m benchmarks.spatial_index_bench
+"""
+
+import random
+import time
+from game_config import GameConfig
+from spatial_index import overlaps
+from simulation import GameSimulation
+from game_objects import PeaShooter, PeaBullet, Zombie
+
+def build_state(count, spread, seed=0):
+    """
+    建立一個擁有滿版植物、count 隻殭屍和 count 顆子彈的遊戲狀態。
+    spread 為 False 時所有殭屍擠在畫面內；為 True 時殭屍平均排在畫面右側外的長隊伍中 (密度固定)。
+    """
+    rng = random.Random(seed)
+    simulation = GameSimulation()
+    simulation.init_map_grid()
+    game_state = simulation.game_state
+    game_state.money = 10 ** 9
+    for grid_y in range(1, 7):
+        for grid_x in range(10):
+            simulation.place_plant(grid_x, grid_y, "peashooter" if grid_x % 2 else "sunflower")
+    for _ in range(count):
+        row = rng.randint(1, 6)
+        if spread:
+            x = rng.randint(-GameConfig.TILE_SIZE, GameConfig.SCREEN_WIDTH + count * 2)
+        else:
+            x = rng.randint(-GameConfig.TILE_SIZE, GameConfig.SCREEN_WIDTH)
+        game_state.zombies.append(Zombie(x, row * GameConfig.TILE_SIZE))
+    for _ in range(count):
+        row = rng.randint(1, 6)
+        x = rng.randint(0, GameConfig.SCREEN_WIDTH)
+        game_state.bullets.append(PeaBullet(x, row * GameConfig.TILE_SIZE + 15))
+    return game_state
+
+def linear_queries(game_state):
+    """舊寫法：每個豌豆射手、子彈、殭屍都掃描整個列表。"""
+    shooters = [plant for plant in game_state.plants if isinstance(plant, PeaShooter)]
+    fire = []
+    for shooter in shooters:
+        should_fire = False
+        for zombie in game_state.zombies:
+            if zombie.live and zombie.y == shooter.y and \
+               zombie.x < GameConfig.SCREEN_WIDTH and zombie.x > shooter.x:
+                should_fire = True
+                break
+        fire.append(should_fire)
+    bullet_hits = []
+    for bullet in game_state.bullets:
+        hit = None
+        for zombie in game_state.zombies:
+            if zombie.live and overlaps(bullet, zombie):
+                hit = zombie
+                break
+        bullet_hits.append(hit)
+    plant_hits = []
+    for zombie in game_state.zombies:
+        hit = None
+        for plant in game_state.plants:
+            if plant.live and overlaps(zombie, plant):
+                hit = plant
+                break
+        plant_hits.append(hit)
+    return fire, bullet_hits, plant_hits
+
+def indexed_queries(game_state):
+    """新寫法：重建一次空間索引後查詢。"""
+    index = game_state.spatial_index
+    index.rebuild(game_state)
+    shooters = [plant for plant in game_state.plants if isinstance(plant, PeaShooter)]
+    fire = [index.has_zombie_ahead(shooter.y, shooter.x, GameConfig.SCREEN_WIDTH) for shooter in shooters]
+    bullet_hits = [index.first_zombie_hit(bullet) for bullet in game_state.bullets]
+    plant_hits = [index.first_plant_hit(zombie) for zombie in game_state.zombies]
+    return fire, bullet_hits, plant_hits
+
+def best_time(func, game_state, repeat):
+    """重複執行 repeat 次，回傳最短耗時 (秒) 與最後一次的結果。"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(game_state)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    print(f"{'分布':>4} {'實體數':>8} {'逐一掃描(ms)':>14} {'空間索引(ms)':>14} {'加速':>8}")
+    for spread in (False, True):
+        for count in (1000, 10000):
+            game_state = build_state(count, spread)
+            repeat = 3 if count <= 1000 else 1
+            linear_time, linear_result = best_time(linear_queries, game_state, repeat)
+            indexed_time, indexed_result = best_time(indexed_queries, game_state, repeat)
+            if linear_result != indexed_result:
+                raise SystemExit(f"錯誤: {count} 個實體時兩種查詢結果不一致")
+            label = "分散" if spread else "擁擠"
+            print(f"{label:>4} {count:>8} {linear_time * 1000:>14.1f} {indexed_time * 1000:>14.1f} "
+                  f"{linear_time / indexed_time:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/startup_bench.py
+
+"""
+冷啟動基準測試：在全新的行程中同步載入 GameConfig.ASSET_MANIFEST 的所有圖片與音效，
+比較不使用磁碟快取、第一次建立快取、以及之後從快取讀取的耗時。
+執行方式 (在專案根目錄)：python -m benchmarks.startup_bench
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+
+# 子行程：初始化視窗與 mixer 後，量測載入所有資源的時間 (不含 pygame 本身的初始化)
+CHILD_SCRIPT = """
+import json, os, sys, time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+from game_config import GameConfig
+GameConfig.USE_ASSET_CACHE = sys.argv[1] == "1"
+GameConfig.ASSET_CACHE_DIR = sys.argv[2]
+pygame.init()
+pygame.display.set_mode((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
+from resources import ResourceManager
+start = time.perf_counter()
+for name in GameConfig.ASSET_MANIFEST["images"]:
+    ResourceManager.load_image(name)
+for name in GameConfig.ASSET_MANIFEST["sounds"]:
+    ResourceManager.load_sound(name)
+elapsed = time.perf_counter() - start
+cache = ResourceManager._disk_cache
+print(json.dumps({"seconds": elapsed, "cache": cache.stats() if cache is not None else None}))
+"""
+
+def run_child(use_cache, cache_dir):
+    """在新的行程中載入一次所有資源，回傳子行程輸出的結果。"""
+    output = subprocess.run([sys.executable, "-c", CHILD_SCRIPT, "1" if use_cache else "0", cache_dir],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def best_of(repeat, use_cache, cache_dir):
+    results = [run_child(use_cache, cache_dir) for _ in range(repeat)]
+    return min(results, key=lambda result: result["seconds"])
+
+def main():
+    parser = argparse.ArgumentParser(description="冷啟動基準測試：資源載入時間 (有無磁碟快取)。")
+    parser.add_argument("--repeat", type=int, default=5, help="每種情況執行幾次 (取最短)")
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix="asset_cache_bench_")
+    try:
+        no_cache = best_of(args.repeat, False, cache_dir)
+        first = run_child(True, cache_dir) # 第一次：解碼並寫入快取
+        warm = best_of(args.repeat, True, cache_dir)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"{'情況':<12} {'載入耗時(ms)':>14} {'快取命中/未命中':>16}")
+    for label, result in (("不使用快取", no_cache), ("建立快取", first), ("從快取讀取", warm)):
+        cache = result["cache"]
+        counts = f"{cache['hits']}/{cache['misses']}" if cache else "-"
+        print(f"{label:<12} {result['seconds'] * 1000:>14.1f} {counts:>16}")
+    print(f"加速: {no_cache['seconds'] / warm['seconds']:.1f}x")
+
+if __name__ == '__main__':
+    main()
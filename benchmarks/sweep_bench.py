@@ -0,0 +1,31 @@
+# benchmarks/sweep_bench.py
+
+"""
+批次模擬擴展性測試：同一批遊戲分別用 1、2、4 ... 個工作行程執行，比較每秒完成的局數。
+執行方式 (在專案根目錄)：python -m benchmarks.sweep_bench
+"""
+
+import argparse
+import os
+from sweep import run_sweep
+
+def main():
+    parser = argparse.ArgumentParser(description="批次模擬擴展性測試。")
+    parser.add_argument("--games", type=int, default=32, help="每次執行的局數")
+    parser.add_argument("--ticks", type=int, default=2000, help="每局最多 tick 數")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, cores} | {n for n in (2, 4, 8, 16, 32, 64) if n < cores})
+    grid = {"ZOMBIE_SPAWN_INTERVAL_BASE": [100]}
+    print(f"CPU 核心數: {cores}")
+    print(f"{'行程數':>6} {'局/秒':>10} {'相對 1 個行程':>14}")
+    baseline = None
+    for workers in worker_counts:
+        _, results, elapsed = run_sweep(grid, args.games, "greedy", args.ticks, 0, workers)
+        rate = len(results) / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>6} {rate:>10.2f} {rate / baseline:>13.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# bullet_planner.py
+
+from bisect import bisect_right, bisect_left
+from game_config import GameConfig
+
+class BulletPlanner:
+    """
+    子彈命中預測 (GameConfig.USE_PREDICTIVE_BULLETS)：子彈與殭屍都是等速直線移動，
+    所以射出時就能算出子彈第一次與某隻殭屍重疊 (或飛出地圖) 的 tick，記在 bullet.hit_tick，
+    其餘的 tick 子彈只前進、不查詢碰撞，到了那個 tick 才照原本的 update 檢查碰撞。
+    殭屍生成、死亡或停下/恢復移動時，該殭屍所在行的預測失效 (lane_changed)，
+    下一個 tick 只重新預測與這些行重疊的子彈。預測只會提早不會延後，所以命中的 tick 與逐 tick 檢查完全相同。
+    """
+    def __init__(self):
+        self.changed = set() # 預測失效的殭屍所在範圍 (上緣 y, 下緣 y)
+
+    def lane_changed(self, zombie):
+        """殭屍生成、死亡或移動狀態改變時呼叫 (由 GameState、PeaBullet、Zombie 呼叫)。"""
+        self.changed.add((zombie.y, zombie.y + zombie.height))
+
+    def take_changes(self):
+        """取出並清空自上次以來失效的範圍。"""
+        changed, self.changed = self.changed, set()
+        return changed
+
+    @staticmethod
+    def affected(bullet, changed):
+        """子彈是否與任何失效的範圍在垂直方向重疊 (需要重新預測)。"""
+        top = bullet.y
+        bottom = bullet.y + bullet.height
+        for lane_top, lane_bottom in changed:
+            if lane_top < bottom and top < lane_bottom:
+                return True
+        return False
+
+    @staticmethod
+    def plan(bullet, game_state):
+        """
+        在第 game_state.tick 個 tick 的子彈階段 (子彈還沒移動) 預測並設定 bullet.hit_tick：
+        子彈第一次與活殭屍重疊的 tick，或飛出地圖右邊界的 tick，取較早者。
+        殭屍假設維持目前的移動狀態 (stop 為 True 時不動)，位置以這個 tick 開始時的空間索引為準。
+        """
+        speed = bullet.speed
+        width = bullet.width
+        # 第 tick + k 個 tick 檢查碰撞時子彈位於 bullet.x + speed * (k + 1)
+        best = None
+        if speed > 0:
+            best = max(0, (GameConfig.BOARD_COLUMNS * GameConfig.TILE_SIZE - bullet.x) // speed)
+        front = bullet.x + speed # 這個 tick 檢查碰撞時子彈的 x
+        index = game_state.spatial_index
+        zombies = index.zombie_order
+        lane_keys = index.lane_keys
+        first_lane = bisect_right(lane_keys, bullet.y - index.max_zombie_height)
+        last_lane = bisect_left(lane_keys, bullet.y + bullet.height)
+        for lane_y in lane_keys[first_lane:last_lane]:
+            xs, orders = index.zombie_lanes[lane_y]
+            # x 不大於 front - 最大寬度的殭屍已經在子彈後面，不會再重疊
+            for i in range(bisect_right(xs, front - index.max_zombie_width), len(xs)):
+                zombie = zombies[orders[i]]
+                if not zombie.live or not (zombie.y < bullet.y + bullet.height and bullet.y < zombie.y + zombie.height):
+                    continue
+                # 兩者的水平距離 d(k) = gap - closing * k，width > d(k) > -zombie.width 時重疊
+                gap = zombie.x - front
+                closing = speed + (0 if zombie.stop else zombie.speed)
+                if gap < width:
+                    k = 0
+                elif closing > 0:
+                    k = (gap - width) // closing + 1
+                else:
+                    continue
+                if gap - closing * k <= -zombie.width: # 一個 tick 內直接穿過，不會重疊
+                    continue
+                if best is None or k < best:
+                    best = k
+        bullet.hit_tick = -1 if best is None else game_state.tick + best # -1 表示目前不會到期
@@ -0,0 +1,44 @@
+# camera.py
+
+import pygame
+from game_config import GameConfig
+
+class Camera:
+    """
+    捲動視窗：rect 是畫面目前看到的世界範圍 (像素座標，左上角對應螢幕的 (0, 0))。
+    地圖比視窗大時以 move() 捲動，繪製時只畫與 rect 重疊的地圖塊與物件，並把世界座標換成螢幕座標。
+    """
+    def __init__(self, width=None, height=None):
+        self.rect = pygame.Rect(0, 0, width or GameConfig.SCREEN_WIDTH, height or GameConfig.SCREEN_HEIGHT)
+
+    @staticmethod
+    def world_size():
+        """整個世界的大小：地圖加上第 0 行 (HUD 區域)。"""
+        return (GameConfig.BOARD_COLUMNS * GameConfig.TILE_SIZE, (GameConfig.BOARD_ROWS + 1) * GameConfig.TILE_SIZE)
+
+    def move(self, dx, dy):
+        """捲動 (dx, dy) 像素，不會捲出世界範圍。回傳位置是否有改變。"""
+        world_width, world_height = self.world_size()
+        x = max(0, min(self.rect.x + dx, world_width - self.rect.width))
+        y = max(0, min(self.rect.y + dy, world_height - self.rect.height))
+        if (x, y) == self.rect.topleft:
+            return False
+        self.rect.topleft = (x, y)
+        return True
+
+    def to_world(self, screen_pos):
+        """螢幕座標 (例如滑鼠位置) 轉成世界座標。"""
+        return (screen_pos[0] + self.rect.x, screen_pos[1] + self.rect.y)
+
+    def visible_tiles(self, game_state):
+        """回傳與視窗重疊的地圖塊 (由上而下、由左而右)，不需要走訪整張地圖。"""
+        tile_size = GameConfig.TILE_SIZE
+        tiles = game_state.game_map_tiles
+        if not tiles:
+            return []
+        # game_map_tiles 的第 0 列是地圖的第 1 行
+        first_row = max(self.rect.top // tile_size - 1, 0)
+        last_row = min((self.rect.bottom - 1) // tile_size - 1, len(tiles) - 1)
+        first_col = max(self.rect.left // tile_size, 0)
+        last_col = min((self.rect.right - 1) // tile_size, len(tiles[0]) - 1)
+        return [tile for row in tiles[first_row:last_row + 1] for tile in row[first_col:last_col + 1]]
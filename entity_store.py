@@ -0,0 +1,354 @@
+# entity_store.py
+
+import pygame
+from game_config import GameConfig
+from resources import ResourceManager
+
+try:
+    import numpy as np
+except ImportError: # NumPy 是選用套件，沒有安裝時只能使用一般的物件模式
+    np = None
+
+
+def create_entity_store():
+    """依 GameConfig.USE_ARRAY_STORE 建立陣列儲存區；未啟用或沒有 NumPy 時回傳 None。"""
+    if not GameConfig.USE_ARRAY_STORE:
+        return None
+    if np is None:
+        print("警告: 找不到 NumPy，無法使用陣列儲存區，改用一般的物件模式。")
+        return None
+    return EntityStore()
+
+
+class _Columns:
+    """一組等長的 NumPy 陣列 (每個欄位一個) 與目前使用中的筆數，容量不足時自動加倍。"""
+    def __init__(self, dtypes, capacity):
+        self.count = 0
+        self.arrays = {name: np.zeros(capacity, dtype=dtype) for name, dtype in dtypes.items()}
+
+    def __getitem__(self, name):
+        """回傳欄位中使用中的部分 (view，寫入會直接改到陣列)。"""
+        return self.arrays[name][:self.count]
+
+    def append(self, **values):
+        capacity = len(next(iter(self.arrays.values())))
+        if self.count == capacity:
+            for name, array in self.arrays.items():
+                grown = np.zeros(capacity * 2, dtype=array.dtype)
+                grown[:capacity] = array
+                self.arrays[name] = grown
+        for name, value in values.items():
+            self.arrays[name][self.count] = value
+        self.count += 1
+
+    def compact(self, keep):
+        """只保留 keep 為 True 的資料，並維持原本的順序。"""
+        kept = int(keep.sum())
+        for array in self.arrays.values():
+            array[:kept] = array[:self.count][keep]
+        self.count = kept
+
+    def clear(self):
+        self.count = 0
+
+    def snapshot(self):
+        """回傳每個欄位使用中部分的複本。"""
+        return {name: array[:self.count].copy() for name, array in self.arrays.items()}
+
+    def restore(self, data):
+        """以 snapshot() 的資料 (陣列或列表) 取代目前的內容。"""
+        count = len(next(iter(data.values())))
+        capacity = len(next(iter(self.arrays.values())))
+        if count > capacity:
+            capacity = max(count, capacity * 2)
+            self.arrays = {name: np.zeros(capacity, dtype=array.dtype) for name, array in self.arrays.items()}
+        for name, array in self.arrays.items():
+            array[:count] = data[name]
+        self.count = count
+
+
+class EntityStore:
+    """
+    以 NumPy 陣列 (struct of arrays) 儲存殭屍與子彈，取代逐一呼叫物件的 update。
+    每個 tick 由 step() 以向量化運算一次處理移動、出界與子彈命中；
+    植物仍是一般物件，所以只有碰到植物的殭屍才逐一用 Python 處理。
+
+    命中規則與物件模式相同：子彈依生成順序處理，命中重疊殭屍中最早生成的那一隻，
+    殭屍死亡後才抵達的子彈會穿過去找下一個目標。唯一的差別是同一個 tick 內
+    多顆子彈接連穿透時，哪一顆子彈被擋下的順序可能不同 (擊殺數不受影響)。
+    """
+    # (行, x) 複合鍵：y * LANE_KEY_SCALE + x，讓殭屍可以用一維陣列排序與二分搜尋
+    LANE_KEY_SCALE = 1 << 32
+    # 地圖格複合鍵：格 y * TILE_KEY_SCALE + 格 x
+    TILE_KEY_SCALE = 1 << 20
+
+    def __init__(self, capacity=1024):
+        # prev_x 是上一個 tick 的 x 座標，只用於繪製時內插；
+        # serial 是生成時配發、不會重複的編號 (陣列壓縮後位置會改變，伺服器以它辨認同一個實體)
+        self.zombies = _Columns({"x": np.int64, "prev_x": np.int64, "y": np.int64, "hp": np.int64,
+                                 "speed": np.int64, "live": np.bool_, "stop": np.bool_, "serial": np.int64}, capacity)
+        self.bullets = _Columns({"x": np.int64, "prev_x": np.int64, "y": np.int64, "damage": np.int64,
+                                 "speed": np.int64, "live": np.bool_, "serial": np.int64}, capacity)
+        self._next_serial = 0
+        # 圖片尺寸在第一次生成時才讀取 (此時視窗已建立，圖片能正確轉換像素格式)
+        self.zombie_size = None
+        self.bullet_size = None
+        self._lane_keys = np.empty(0, dtype=np.int64) # 這個 tick 開始時活殭屍的 (行, x) 鍵，已排序
+        self._zombie_rect = pygame.Rect(0, 0, 0, 0)   # 查詢植物碰撞時重複使用的矩形
+
+    def clear(self):
+        """清空所有殭屍與子彈。"""
+        self.zombies.clear()
+        self.bullets.clear()
+        self._lane_keys = np.empty(0, dtype=np.int64)
+
+    def snapshot(self):
+        """回傳殭屍與子彈所有欄位的複本 (供 snapshot.py 使用)。"""
+        return {"zombies": self.zombies.snapshot(), "bullets": self.bullets.snapshot()}
+
+    def copy_from(self, other):
+        """把另一個儲存區的殭屍與子彈複製到這裡 (重複使用已配置的陣列，供 pipeline.py 的繪製快照使用)。"""
+        self.zombie_size = other.zombie_size
+        self.bullet_size = other.bullet_size
+        for columns, source in ((self.zombies, other.zombies), (self.bullets, other.bullets)):
+            columns.restore({name: source[name] for name in source.arrays})
+
+    def restore(self, data):
+        """以 snapshot() 的資料取代目前的殭屍與子彈。"""
+        if self.zombie_size is None:
+            self.zombie_size = ResourceManager.load_image('zombie.png').get_size()
+        if self.bullet_size is None:
+            self.bullet_size = ResourceManager.load_image('peabullet.png').get_size()
+        self.zombies.restore(data["zombies"])
+        self.bullets.restore(data["bullets"])
+        self._lane_keys = np.empty(0, dtype=np.int64)
+        self._next_serial = max([self._next_serial] + [int(columns["serial"].max()) + 1
+                                                       for columns in (self.zombies, self.bullets) if columns.count])
+
+    def add_zombie(self, x, y):
+        if self.zombie_size is None:
+            self.zombie_size = ResourceManager.load_image('zombie.png').get_size()
+        self.zombies.append(x=x, prev_x=x, y=y, hp=GameConfig.ZOMBIE_HP_START, speed=GameConfig.ZOMBIE_SPEED,
+                            live=True, stop=False, serial=self._next_serial)
+        self._next_serial += 1
+
+    def add_bullet(self, x, y):
+        if self.bullet_size is None:
+            self.bullet_size = ResourceManager.load_image('peabullet.png').get_size()
+        self.bullets.append(x=x, prev_x=x, y=y, damage=GameConfig.BULLET_DAMAGE, speed=GameConfig.BULLET_SPEED, live=True,
+                            serial=self._next_serial)
+        self._next_serial += 1
+
+    def begin_tick(self):
+        """在植物更新前呼叫：把活殭屍依 (行, x) 排序，供豌豆射手查詢目標。"""
+        live = self.zombies["live"]
+        self._lane_keys = np.sort(self.zombies["y"][live] * self.LANE_KEY_SCALE + self.zombies["x"][live])
+
+    def has_zombie_ahead(self, y, min_x, max_x):
+        """同一行 (y 座標相同) 是否有活著的殭屍，且 min_x < 殭屍 x < max_x。"""
+        base = y * self.LANE_KEY_SCALE
+        lo = np.searchsorted(self._lane_keys, base + min_x, side="right")
+        hi = np.searchsorted(self._lane_keys, base + max_x, side="left")
+        return bool(lo < hi)
+
+    def step(self, game_state):
+        """
+        推進一個 tick：子彈移動與命中，接著殭屍移動與啃食植物，最後移除死亡的實體。
+        回傳這次移除的子彈與殭屍數量。
+        """
+        self._update_bullets(game_state)
+        self._update_zombies(game_state)
+        reaped = {}
+        for kind, columns in (("bullets", self.bullets), ("zombies", self.zombies)):
+            live = columns["live"]
+            reaped[kind] = columns.count - int(live.sum())
+            if reaped[kind]:
+                columns.compact(live.copy())
+        return reaped
+
+    def _update_bullets(self, game_state):
+        bullets = self.bullets
+        active = np.flatnonzero(bullets["live"]) # 這個 tick 開始時還活著的子彈 (依生成順序)
+        if active.size == 0:
+            return
+        x = bullets["x"]
+        bullets["prev_x"][:] = x
+        x[active] += bullets["speed"][active]
+        # 飛出地圖右側的子彈死亡，但與物件模式相同，這個 tick 仍然會檢查碰撞
+        bullets["live"][active[x[active] > GameConfig.BOARD_COLUMNS * GameConfig.TILE_SIZE]] = False
+        if self.zombies.count:
+            self._resolve_hits(active, game_state)
+
+    def _resolve_hits(self, pending, game_state):
+        """依生成順序結算子彈命中；殭屍死亡後才抵達的子彈在下一輪重新尋找目標。"""
+        bullets = self.bullets
+        zombies = self.zombies
+        while pending.size:
+            targets = self._find_targets(pending)
+            hit = targets >= 0
+            if not hit.any():
+                break
+            # 依目標殭屍分組，同一組內維持子彈的生成順序
+            order = np.argsort(targets[hit], kind="stable")
+            targets = targets[hit][order]
+            shooters = pending[hit][order]
+            damage = bullets["damage"][shooters]
+
+            # 每顆子彈抵達前，同一隻殭屍已經承受的傷害
+            cumulative = np.cumsum(damage)
+            group_starts = np.flatnonzero(np.r_[True, targets[1:] != targets[:-1]])
+            group_sizes = np.diff(np.r_[group_starts, targets.size])
+            before = cumulative - damage - np.repeat(cumulative[group_starts] - damage[group_starts], group_sizes)
+            absorbed = before < zombies["hp"][targets] # 殭屍在子彈抵達時還活著
+
+            bullets["live"][shooters[absorbed]] = False
+            np.subtract.at(zombies["hp"], targets[absorbed], damage[absorbed])
+
+            killed = np.unique(targets[absorbed])
+            killed = killed[zombies["hp"][killed] <= 0]
+            if killed.size == 0:
+                break
+            zombies["live"][killed] = False
+            for _ in range(killed.size):
+                game_state.register_zombie_kill() # 加分並檢查是否升級
+            pending = np.sort(shooters[~absorbed])
+
+    def _find_targets(self, pending):
+        """回傳每顆子彈重疊的活殭屍中索引最小的那一隻，沒有重疊則為 -1。"""
+        zombies = self.zombies
+        zombie_w, zombie_h = self.zombie_size
+        bullet_w, bullet_h = self.bullet_size
+        result = np.full(pending.size, -1, dtype=np.int64)
+        live = np.flatnonzero(zombies["live"])
+        if live.size == 0:
+            return result
+
+        lane_y = zombies["y"][live]
+        keys = lane_y * self.LANE_KEY_SCALE + zombies["x"][live]
+        by_key = np.argsort(keys, kind="stable")
+        keys = keys[by_key]
+        sorted_index = live[by_key] # 依 (行, x) 排序後，每個位置對應的殭屍索引
+
+        bullet_x = self.bullets["x"][pending]
+        bullet_y = self.bullets["y"][pending]
+        selections = []
+        for y in np.unique(lane_y).tolist():
+            # 垂直方向重疊的子彈，再以二分搜尋找出水平方向重疊的殭屍區間 [lo, hi)
+            sel = np.flatnonzero((y < bullet_y + bullet_h) & (y + zombie_h > bullet_y))
+            if sel.size == 0:
+                continue
+            base = y * self.LANE_KEY_SCALE
+            lo = np.searchsorted(keys, base + bullet_x[sel] - zombie_w, side="right")
+            hi = np.searchsorted(keys, base + bullet_x[sel] + bullet_w, side="left")
+            found = lo < hi
+            if found.any():
+                selections.append((sel[found], lo[found], hi[found]))
+        if not selections:
+            return result
+
+        # 以 sparse table 一次查出每個區間內最小的殭屍索引
+        sel = np.concatenate([item[0] for item in selections])
+        lo = np.concatenate([item[1] for item in selections])
+        hi = np.concatenate([item[2] for item in selections])
+        levels = [sorted_index]
+        max_length = int((hi - lo).max())
+        while (1 << len(levels)) <= max_length:
+            previous = levels[-1]
+            half = 1 << (len(levels) - 1)
+            levels.append(np.minimum(previous[:-half], previous[half:]))
+        level = np.log2(hi - lo).astype(np.int64)
+        best = np.empty(sel.size, dtype=np.int64)
+        for k in np.unique(level).tolist():
+            mask = level == k
+            table = levels[k]
+            best[mask] = np.minimum(table[lo[mask]], table[hi[mask] - (1 << k)])
+        # 同一顆子彈可能與多行重疊，取索引最小者
+        nearest = np.full(pending.size, zombies.count, dtype=np.int64)
+        np.minimum.at(nearest, sel, best)
+        result[nearest < zombies.count] = nearest[nearest < zombies.count]
+        return result
+
+    def _update_zombies(self, game_state):
+        zombies = self.zombies
+        if zombies.count == 0:
+            return
+        moving = zombies["live"] & ~zombies["stop"]
+        x = zombies["x"]
+        zombies["prev_x"][:] = x
+        x[moving] -= zombies["speed"][moving] # 殭屍向左移動
+        # 如果殭屍走出螢幕左邊界，遊戲結束
+        if (x[moving] < -GameConfig.TILE_SIZE).any():
+            game_state.game_over = True
+        self._check_plant_collisions(game_state)
+
+    def _check_plant_collisions(self, game_state):
+        """先以向量化運算篩出附近有植物的殭屍，再依生成順序逐一啃食植物。"""
+        zombies = self.zombies
+        index = game_state.spatial_index
+        stop = zombies["stop"]
+        live = np.flatnonzero(zombies["live"])
+        if not index.plant_tiles:
+            stop[live] = False
+            return
+
+        tile_size = GameConfig.TILE_SIZE
+        zombie_w, zombie_h = self.zombie_size
+        x = zombies["x"][live]
+        y = zombies["y"][live]
+        # 與 SpatialIndex.first_plant_hit 相同的候選地圖格範圍
+        first_col = (x - index.max_plant_width + 1) // tile_size
+        last_col = (x + zombie_w - 1) // tile_size
+        first_row = (y - index.max_plant_height + 1) // tile_size
+        last_row = (y + zombie_h - 1) // tile_size
+        plant_keys = np.array([row * self.TILE_KEY_SCALE + col for col, row in index.plant_tiles], dtype=np.int64)
+        near_plant = np.zeros(live.size, dtype=bool)
+        for d_row in range(int((last_row - first_row).max()) + 1):
+            for d_col in range(int((last_col - first_col).max()) + 1):
+                row = first_row + d_row
+                col = first_col + d_col
+                near_plant |= (row <= last_row) & (col <= last_col) & \
+                    np.isin(row * self.TILE_KEY_SCALE + col, plant_keys)
+
+        # 附近沒有植物的殭屍一定沒有碰撞，恢復移動狀態
+        stop[live[~near_plant]] = False
+        rect = self._zombie_rect
+        rect.size = self.zombie_size
+        all_x = zombies["x"]
+        all_y = zombies["y"]
+        for i in live[near_plant].tolist():
+            rect.topleft = (int(all_x[i]), int(all_y[i]))
+            plant = index.first_plant_hit(rect)
+            if plant is not None: # 殭屍一次只攻擊一個植物
+                stop[i] = True # 殭屍停止移動，開始攻擊植物
+                plant.hp -= GameConfig.ZOMBIE_DAMAGE # 植物掉血
+                if plant.hp <= 0: # 如果植物血量歸零
+                    plant.live = False
+                    stop[i] = False # 植物死了，殭屍可以繼續移動
+                    game_state.free_plant_tile(plant)
+            else:
+                stop[i] = False
+
+    def _blit_items(self, columns, image_name, alpha, camera):
+        live = columns["live"]
+        image = ResourceManager.load_image(image_name)
+        x = columns["x"][live]
+        y = columns["y"][live]
+        if alpha < 1.0: # 在上一個 tick 與目前位置之間內插
+            prev_x = columns["prev_x"][live]
+            x = prev_x + np.rint((x - prev_x) * alpha).astype(np.int64)
+        if camera is not None: # 只保留與視窗重疊的部分，並換成螢幕座標
+            view = camera.rect
+            width, height = image.get_size()
+            visible = (x < view.right) & (x + width > view.left) & (y < view.bottom) & (y + height > view.top)
+            x = x[visible] - view.left
+            y = y[visible] - view.top
+        positions = zip(x.tolist(), y.tolist())
+        return [(image, position) for position in positions]
+
+    def bullet_blit_items(self, alpha=1.0, camera=None):
+        """從陣列讀出位置，回傳所有活子彈的 (圖片, 位置)，可直接交給 Surface.blits。"""
+        return self._blit_items(self.bullets, 'peabullet.png', alpha, camera)
+
+    def zombie_blit_items(self, alpha=1.0, camera=None):
+        """從陣列讀出位置，回傳所有活殭屍的 (圖片, 位置)，可直接交給 Surface.blits。"""
+        return self._blit_items(self.zombies, 'zombie.png', alpha, camera)
@@ -4,6 +4,10 @@ class GameConfig:
     SCREEN_WIDTH = 800
     SCREEN_HEIGHT = 560
     TILE_SIZE = 80 # 地圖上每個格子的大小
+    # 地圖大小 (格數)。第 0 行留給 HUD，地圖從第 1 行開始；比視窗大時可以用方向鍵捲動畫面
+    BOARD_ROWS = 6
+    BOARD_COLUMNS = 10
+    CAMERA_SCROLL_SPEED = 20 # 按住方向鍵時每幀捲動的像素數
 
     # 植物相關設定
     PLANT_PRICES = {"sunflower": 30, "peashooter": 50}
@@ -29,4 +33,55 @@ class GameConfig:
     SCORE_PER_ZOMBIE = 20
     NEXT_LEVEL_SCORE_MULTIPLIER = 100 # 每關所需分數的乘數 (例如: 100 * 關卡數)
     MAX_LEVEL = 5 # 新增：遊戲的最高關卡數
+
+    # 效能相關設定
+    USE_ARRAY_STORE = False # 殭屍與子彈改用 NumPy 陣列儲存並以向量化運算更新 (需要安裝 numpy)
+    USE_PREDICTIVE_BULLETS = True # 子彈射出時預測命中的 tick，只在那個 tick 檢查碰撞 (只用於一般的物件模式)
+    USE_DIRTY_RECT_RENDERER = True # 只重畫並更新畫面上有變化的區域 (False 則每幀重畫整個畫面)
+    DIRTY_RECT_LIMIT = 200 # 一幀的髒矩形超過這個數量時，改為更新整個螢幕
+    TEXT_CACHE_SIZE = 128 # 已渲染文字 surface 的快取筆數上限
+    # ResourceManager 各快取的記憶體預算 (位元組，依像素/PCM 大小估算)，超過時淘汰最久沒用到的資料
+    IMAGE_CACHE_BYTES = 64 * 1024 * 1024
+    FONT_CACHE_BYTES = 32 * 1024 * 1024
+    SOUND_CACHE_BYTES = 64 * 1024 * 1024
+    TEXT_CACHE_BYTES = 8 * 1024 * 1024
+    # 每個字體大小 (一個 pygame.font.Font) 估算佔用的記憶體；字型檔由 SDL_ttf 依需要讀取，不會每種大小各載入一份
+    FONT_SIZE_BYTES = 256 * 1024
+    # 釘選的資源：遊戲中持續使用，永遠不會被淘汰
+    PINNED_IMAGES = ("map1.png", "map2.png", "sunflower.png", "peashooter.png", "zombie.png", "peabullet.png")
+    PINNED_SOUNDS = ("zombie_horde.mp3",)
+    BULLET_POOL_SIZE = 1024 # 子彈物件池最多保留的閒置物件數 (0 表示停用)
+    BULLET_POOL_PREFILL = 64 # 第一次生成子彈時預先建立的數量
+    ZOMBIE_POOL_SIZE = 256 # 殭屍物件池最多保留的閒置物件數 (0 表示停用)
+    ZOMBIE_POOL_PREFILL = 32 # 第一次生成殭屍時預先建立的數量
+    TICK_RATE = 60 # 遊戲邏輯每秒固定更新的次數 (與畫面幀率無關)
+    RENDER_FPS = 60 # 畫面每秒最多繪製的幀數
+    GAME_SPEEDS = (1, 2, 4, 0) # 按 F 鍵依序切換的遊戲速度倍率，0 表示不限速
+    MAX_CATCH_UP_TICKS = 5 # 1x 時一幀最多補跑的 tick 數 (快轉時依倍率放大)，超過的進度直接捨棄
+    MAX_UNBOUNDED_TICKS_PER_FRAME = 2000 # 不限速時一幀最多跑的 tick 數
+    INTERPOLATE_RENDERING = True # 繪製時在兩個 tick 之間內插子彈與殭屍的位置
+    PIPELINED_SIMULATION = False # 遊戲邏輯在工作執行緒推進，同時主執行緒繪製上一幀結束時的狀態快照 (pipeline.py)
+    RECORD_REPLAYS = False # 每局結束時把種子與種植紀錄存成回放檔 (可用 replay.py 重播)；預設關閉，不在玩家的資料夾留下檔案
+    REPLAY_DIR = "replays" # 回放檔存放的資料夾
+    PROFILER_ENABLED = False # 記錄每幀各階段的耗時 (按 P 顯示/隱藏疊加資訊)，遊戲結束時輸出到 PROFILE_DIR；預設關閉，不增加每幀的負擔
+    PROFILER_HISTORY = 600 # 環狀緩衝區保留的幀數
+    PROFILER_HITCH_FACTOR = 2.0 # 整幀耗時超過中位數的幾倍 (且超過一幀的時間預算) 視為卡頓
+    PROFILE_DIR = "profiles" # 分析結果 (CSV/JSON) 存放的資料夾
+    AUTOSAVE_INTERVAL_TICKS = 0 # 每隔幾個 tick 把遊戲狀態快照存到 AUTOSAVE_PATH (0 表示不存，預設；例如 600)，程式意外結束後下次開始遊戲時接著玩
+    AUTOSAVE_PATH = "autosave.json" # 自動存檔的位置 (這一局正常結束或玩家關閉視窗時刪除)
+    SERVER_HOST = "127.0.0.1" # server.py 多局遊戲伺服器監聽的位址
+    SERVER_PORT = 8765 # server.py 監聽的連接埠
+    SERVER_DELTA_INTERVAL = 6 # 伺服器每隔幾個 tick 送出一次狀態差異
+    SERVER_MAX_BUFFER_BYTES = 1 << 20 # 用戶端尚未接收的資料超過這個大小時略過差異訊息 (之後改送完整狀態)
+    OPTIMIZE_IMAGE_FORMAT = True # 依圖片的 alpha 通道選擇 convert() / colorkey / convert_alpha()，False 則一律 convert_alpha()
+    USE_ASSET_CACHE = True # 把解碼後的圖片像素與音效 PCM 存到 ASSET_CACHE_DIR，之後啟動時直接讀取不再解碼
+    ASSET_CACHE_DIR = ".asset_cache" # 資源快取資料夾 (可以整個刪除，下次啟動會重建)
+    PRELOAD_ASSETS = True # 開始畫面顯示時在背景執行緒解碼 ASSET_MANIFEST 中的圖片與音效
+    SCENE_IDLE_TIMEOUT_MS = 100 # 開始畫面還在預載時，沒有事件多久醒來更新一次進度 (載入完成後一直等到有事件)
+    # 預載清單 (依序解碼，開始畫面需要的圖片放最前面)
+    ASSET_MANIFEST = {
+        "images": ("start.png", "map1.png", "map2.png", "sunflower.png", "peashooter.png",
+                   "zombie.png", "peabullet.png", "CLEAR.png", "GAMEOVER.png"),
+        "sounds": ("zombie_horde.mp3", "win_sound.mp3", "lose_sound.mp3"),
+    }
     
\ No newline at end of file
@@ -1,109 +1,90 @@
 # game_manager.py
 
+import os
+import time
 import pygame
-import random
 from game_config import GameConfig
 from game_state import GameState
 from resources import ResourceManager # 導入資源管理器
-# 從 game_objects 套件導入所有需要的遊戲物件類別
-from game_objects import MapTile, Sunflower, PeaShooter, PeaBullet, Zombie 
+from simulation import GameSimulation # 遊戲邏輯 (與無頭模擬共用)
+from renderer import DirtyRectRenderer, layer_blit_items # 只重畫有變化區域的繪製器、分圖層批次繪製
+from replay import InputRecorder # 記錄種植操作，供無頭重播
+from profiler import FrameProfiler, ProfileBuffer # 每幀各階段耗時分析
+from camera import Camera # 大地圖的捲動視窗
+from snapshot import take_snapshot, restore_snapshot, save_snapshot, load_snapshot # 自動存檔與恢復
+from scenes import SceneManager, StartScene, RulesScene, GameOverScene # 開始、規則說明與遊戲結束畫面
+from pipeline import SimulationPipeline # 遊戲邏輯與繪製分別在兩個執行緒進行
 
 class GameManager:
     def __init__(self):
         pygame.init() # 初始化 Pygame
         self.game_state = GameState() # 創建遊戲狀態物件
+        self.simulation = GameSimulation(self.game_state) # 遊戲邏輯，與 GameManager 共用同一個 GameState
         # 設定 Pygame 視窗
         self.game_state.screen = pygame.display.set_mode((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
         pygame.display.set_caption("植物大戰殭屍") # 設定視窗標題
         self.clock = pygame.time.Clock() # 創建時鐘物件，用於控制幀率
+        self.renderer = DirtyRectRenderer() # 地圖底圖只合成一次，每幀只更新有變化的區域
+        self.camera = Camera() # 地圖比視窗大時用方向鍵捲動，只繪製視窗內的地圖塊與物件
+        # 每幀各階段耗時分析 (GameConfig.PROFILER_ENABLED)，與遊戲邏輯、繪製器共用
+        self.profiler = FrameProfiler() if GameConfig.PROFILER_ENABLED else None
+        self.simulation.profiler = self.profiler
+        self.renderer.profiler = self.profiler
 
         # 字體路徑，使用 ResourceManager 載入字體
         self.font_path = "fonts/fontsmsjh.ttf" 
         
-        # 載入音效 (可以在這裡一次性載入，也可以在需要時載入)
-        self.zombie_horde_sound = ResourceManager.load_sound("zombie_horde.mp3")
-        self.win_sound = ResourceManager.load_sound("win_sound.mp3")
-        self.lose_sound = ResourceManager.load_sound("lose_sound.mp3")
+        # 開始畫面顯示期間，在背景執行緒解碼清單中的圖片與音效，避免遊戲中第一次用到時卡頓
+        if GameConfig.PRELOAD_ASSETS:
+            ResourceManager.start_preload()
+
+        # 開始、規則說明與遊戲結束畫面：內容只合成一次，等待點擊時以 pygame.event.wait 阻塞，不佔用 CPU
+        self.scenes = SceneManager(self.game_state.screen)
+        self.scenes.add("start", StartScene(self.font_path))
+        self.scenes.add("rules", RulesScene(self.font_path))
+        self.game_over_scene = self.scenes.add("game_over", GameOverScene(self.font_path))
+
+        # 音效在遊戲開始時才取用 (此時多半已在背景解碼完成)，見 _load_sounds
+        self.zombie_horde_sound = None
+        self.win_sound = None
+        self.lose_sound = None
 
         # 定義一個旗標來控制殭屍來襲音效的播放頻率
         self.zombie_sound_played = False
+        # 遊戲邏輯要求播放殭屍來襲音效 (可能在工作執行緒推進)，由主執行緒在 _play_pending_sounds 播放
+        self.horde_sound_pending = False
         # 用於判斷是否是第一次進入遊戲，第一次才會播開場音樂
         self.first_game_start = True 
+        # 目前的遊戲速度 (GameConfig.GAME_SPEEDS 的索引)
+        self.speed_index = 0
+
+    def _load_sounds(self):
+        """載入音效 (已預載的直接從快取取出，還在解碼的會等它完成)。"""
+        self.zombie_horde_sound = ResourceManager.load_sound("zombie_horde.mp3")
+        self.win_sound = ResourceManager.load_sound("win_sound.mp3")
+        self.lose_sound = ResourceManager.load_sound("lose_sound.mp3")
 
     def _draw_text(self, content, size, color):
-        """輔助方法：繪製文字。"""
-        font = ResourceManager.load_font(self.font_path, size) # 透過 ResourceManager 載入字體
-        text_surface = font.render(content, True, color)
-        return text_surface
+        """輔助方法：繪製文字 (由 ResourceManager 快取，內容不變時不會重新渲染)。"""
+        return ResourceManager.render_text(self.font_path, content, size, color)
 
     def _init_map_grid(self):
         """初始化地圖的邏輯網格點和實際地圖塊物件。"""
-        # 創建地圖的邏輯網格點 (例如：(0,1), (1,1)...)
-        # 遊戲區域從 y=1 行開始，共 6 行 (1-6)
-        for y_idx in range(1, 7): 
-            row_points = []
-            # 每行 10 列 (0-9)
-            for x_idx in range(10): 
-                row_points.append((x_idx, y_idx))
-            self.game_state.plant_grid_points.append(row_points)
-
-        # 根據邏輯網格點，創建實際的 MapTile 物件
-        for r_idx, row_points in enumerate(self.game_state.plant_grid_points):
-            temp_map_row = []
-            for c_idx, point in enumerate(row_points):
-                # 交替使用兩種地圖圖片 (map1.png 和 map2.png)
-                img_index = (point[0] + point[1]) % 2 
-                # 創建 MapTile 物件，並設定其在螢幕上的位置
-                map_tile = MapTile(point[0] * GameConfig.TILE_SIZE, point[1] * GameConfig.TILE_SIZE, img_index)
-                temp_map_row.append(map_tile)
-            self.game_state.game_map_tiles.append(temp_map_row)
+        self.simulation.init_map_grid()
+        self.camera.move(0, 0) # 地圖大小可能改變，確保視窗仍在地圖範圍內
+        self.renderer.invalidate_background() # 地圖重建後，底圖需要重新合成
 
     def _init_zombies(self):
         """初始化一批殭屍。"""
-        # 決定這次要生成多少隻殭屍
-        # 您可以根據關卡數來調整，例如：
-        # num_zombies_to_spawn = min(5, self.game_state.current_level + 1)
-        
-        # 為了演示您提供的邏輯，我們讓它一次生成多隻殭屍，但可以調整
-        # 如果您希望一次生成1隻，就設為1
-        # 如果希望每行都生成，就維持 for loop 的範圍
-        
-        # 這裡我們結合兩種策略：每次生成隨機數量的殭屍，並使用您提供的水平間距邏輯
-        num_zombies_this_wave = random.randint(1, 3) # 每次生成 1 到 3 隻
-
-        # 為了確保不會在同一列生成，可以記錄已選的列
-        spawned_rows = set() 
-
-        for _ in range(num_zombies_this_wave):
-            # 隨機選擇一行 (y 座標)，確保不會重複選到同一行
-            while True:
-                row_index = random.randint(1, 6) # 地圖行索引 1 到 6
-                if row_index not in spawned_rows:
-                    spawned_rows.add(row_index)
-                    break
-                # 如果所有行都已被選中，但 still_to_spawn > 0，則跳出循環避免無限循環
-                if len(spawned_rows) == 6: 
-                    break
-
-            if len(spawned_rows) == 6 and _ < num_zombies_this_wave: # 防止在所有行都填滿後還試圖生成更多殭屍
-                break
-
-            # 根據您提供的邏輯計算水平間距
-            # random.randint(1, 5) * 200 讓殭屍在螢幕外 200, 400, 600, 800, 1000 像素處生成
-            # 這樣間距會比較大，不會擠在一起
-            dis_offset = random.randint(1, 5) * 100 
-            
-            # 使用 GameConfig 中的常數
-            initial_x = GameConfig.SCREEN_WIDTH + dis_offset 
-            zombie = Zombie(initial_x, row_index * GameConfig.TILE_SIZE)
-            self.game_state.zombies.append(zombie)
-
+        self.simulation.init_zombies()
 
     def _handle_input(self):
         """處理所有 Pygame 事件 (鍵盤、滑鼠等)。"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.game_state.game_over = True # 設定遊戲結束標誌
+                self._dump_profile()
+                self._remove_autosave() # 玩家主動關閉視窗，不是意外結束，下次不接著玩
                 pygame.quit() # 退出 Pygame
                 exit()        # 終止程式
                 
@@ -111,217 +92,214 @@ class GameManager:
                 if event.key == pygame.K_q: # 如果按下了 'Q' 鍵
                     self.game_state.game_over = True # 設定遊戲結束標誌
                     print("按下 'Q' 鍵，遊戲結束。") # 可以在控制台輸出提示
+                elif event.key == pygame.K_f: # 'F' 鍵切換遊戲速度 (1x -> 2x -> 4x -> 不限速)
+                    self.speed_index = (self.speed_index + 1) % len(GameConfig.GAME_SPEEDS)
+                elif event.key == pygame.K_p and self.profiler is not None: # 'P' 鍵顯示/隱藏效能資訊
+                    self.profiler.toggle_overlay()
                     
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_x, mouse_y = event.pos # 獲取滑鼠點擊座標
+                mouse_x, mouse_y = self.camera.to_world(event.pos) # 滑鼠點擊座標 (加上視窗捲動的距離)
                 
                 # 將滑鼠座標轉換為地圖網格的邏輯座標
                 grid_x = mouse_x // GameConfig.TILE_SIZE
                 grid_y = mouse_y // GameConfig.TILE_SIZE
                 
-                # 檢查點擊是否在有效的種植區域 (地圖網格內)
-                if 1 <= grid_y <= 6 and 0 <= grid_x < 10:
-                    # 獲取對應的地圖塊物件 (注意索引，因為地圖行是從 1 開始)
-                    map_tile = self.game_state.game_map_tiles[grid_y - 1][grid_x]
-                    
-                    if map_tile.can_grow: # 如果該地圖塊可以種植
-                        if event.button == 1: # 左鍵放置向日葵
-                            if self.game_state.money >= GameConfig.PLANT_PRICES["sunflower"]:
-                                sunflower = Sunflower(map_tile.rect.x, map_tile.rect.y)
-                                self.game_state.plants.append(sunflower)
-                                map_tile.can_grow = False # 設為不可種植
-                                self.game_state.money -= GameConfig.PLANT_PRICES["sunflower"]
-                        elif event.button == 3: # 右鍵放置豌豆射手
-                            if self.game_state.money >= GameConfig.PLANT_PRICES["peashooter"]:
-                                peashooter = PeaShooter(map_tile.rect.x, map_tile.rect.y)
-                                self.game_state.plants.append(peashooter)
-                                map_tile.can_grow = False # 設為不可種植
-                                self.game_state.money -= GameConfig.PLANT_PRICES["peashooter"]
+                # 左鍵放置向日葵，右鍵放置豌豆射手 (種植規則統一由 GameSimulation.place_plant 判斷)
+                if event.button == 1:
+                    self.simulation.place_plant(grid_x, grid_y, "sunflower")
+                elif event.button == 3:
+                    self.simulation.place_plant(grid_x, grid_y, "peashooter")
+
+    def _scroll_camera(self):
+        """按住方向鍵時捲動視窗 (每幀 GameConfig.CAMERA_SCROLL_SPEED 像素)。"""
+        keys = pygame.key.get_pressed()
+        speed = GameConfig.CAMERA_SCROLL_SPEED
+        dx = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * speed
+        dy = (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * speed
+        if dx or dy:
+            self.camera.move(dx, dy)
 
     def _update_game_state(self):
         """更新所有遊戲物件的狀態和遊戲邏輯。"""
-        # 更新植物 (使用 list() 拷貝列表，以避免在迭代時修改列表導致的錯誤)
-        for plant in list(self.game_state.plants): 
-            if plant.live:
-                plant.update(self.game_state) # 呼叫植物自己的 update 方法
-            else:
-                self.game_state.plants.remove(plant) # 如果植物死亡，從列表中移除
-
-        # 更新子彈
-        for bullet in list(self.game_state.bullets):
-            if bullet.live:
-                bullet.update(self.game_state) # 呼叫子彈自己的 update 方法
-            else:
-                self.game_state.bullets.remove(bullet) # 如果子彈死亡，從列表中移除
-
-        # 更新殭屍
-        for zombie in list(self.game_state.zombies):
-            if zombie.live:
-                zombie.update(self.game_state) # 呼叫殭屍自己的 update 方法
-            else:
-                self.game_state.zombies.remove(zombie) # 如果殭屍死亡，從列表中移除
-        
-        # 殭屍生成計時器
-        self.game_state.zombie_spawn_timer += 1
-        # 如果達到生成閾值，就生成一批新的殭屍
-        if self.game_state.zombie_spawn_timer >= self.game_state.zombie_spawn_threshold:
-            self._init_zombies() 
-            self.game_state.zombie_spawn_timer = 0 # 重置計時器
-            if not self.game_state.first_zombie_wave_sound_played:
-                if self.zombie_horde_sound:
-                    self.zombie_horde_sound.play()
-                self.game_state.first_zombie_wave_sound_played = True
-                
-    def _draw_game_elements(self):
-        """繪製遊戲畫面上的所有元素。"""
-        self.game_state.screen.fill((255, 255, 255)) # 填充白色背景
-
-        # 繪製地圖塊
-        for row in self.game_state.game_map_tiles:
-            for tile in row:
-                tile.draw(self.game_state.screen) # 呼叫 MapTile 的 draw 方法
-
-        # 繪製植物
-        for plant in self.game_state.plants:
-            plant.draw(self.game_state.screen) # 呼叫 Plant 的 draw 方法
-
-        # 繪製子彈
-        for bullet in self.game_state.bullets:
-            bullet.draw(self.game_state.screen) # 呼叫 PeaBullet 的 draw 方法
+        level = self.game_state.current_level
+        start = time.perf_counter()
+        wave_spawned = self.simulation.update() # 遊戲邏輯統一由 GameSimulation 處理
+        # 管線化時這裡在工作執行緒執行，記錄到 simulation.profiler (ProfileBuffer)，由主執行緒套用
+        profiler = self.simulation.profiler
+        if profiler is not None:
+            profiler.add("update", time.perf_counter() - start)
+            profiler.add_tick()
+            # 生成殭屍與升級是常見的卡頓來源，記錄下來方便對照
+            if wave_spawned:
+                profiler.mark("wave")
+            if self.game_state.current_level != level:
+                profiler.mark("level_up")
+        # 第一批由計時器生成的殭屍出現時播放殭屍來襲音效 (在 _play_pending_sounds 播放)
+        if wave_spawned and not self.game_state.first_zombie_wave_sound_played:
+            self.horde_sound_pending = True
+            self.game_state.first_zombie_wave_sound_played = True
+
+    def _play_pending_sounds(self):
+        """在主執行緒播放遊戲邏輯要求的音效。"""
+        if self.horde_sound_pending:
+            self.horde_sound_pending = False
+            if self.zombie_horde_sound:
+                self.zombie_horde_sound.play()
+
+    def _run_ticks(self, frame_time, accumulator):
+        """
+        固定時間步長：依經過的時間 (乘上遊戲速度) 推進整數個 tick。
+        回傳剩下未滿一個 tick 的累積時間 (繪製時據此內插，不限速時回傳一整個 tick，畫在最新的位置)。
+        """
+        tick_seconds = 1.0 / GameConfig.TICK_RATE
+        speed = GameConfig.GAME_SPEEDS[self.speed_index]
+        if speed == 0:
+            # 不限速：在一幀的時間內盡量多跑幾個 tick
+            deadline = time.perf_counter() + 1.0 / GameConfig.RENDER_FPS
+            for _ in range(GameConfig.MAX_UNBOUNDED_TICKS_PER_FRAME):
+                self._update_game_state()
+                if self.game_state.game_over or time.perf_counter() >= deadline:
+                    break
+            # 這一幀的 tick 都已經跑完，沒有等待中的進度；回傳 0 會讓 alpha 為 0，實體被畫在上一個 tick 的位置
+            return tick_seconds
 
-        # 繪製殭屍
-        for zombie in self.game_state.zombies:
-            zombie.draw(self.game_state.screen) # 呼叫 Zombie 的 draw 方法
+        accumulator += frame_time * speed
+        max_ticks = GameConfig.MAX_CATCH_UP_TICKS * speed
+        ticks = 0
+        while accumulator >= tick_seconds and ticks < max_ticks and not self.game_state.game_over:
+            self._update_game_state()
+            accumulator -= tick_seconds
+            ticks += 1
+        # 機器跟不上時捨棄落後的進度，避免越補越慢 (遊戲會變慢，但畫面仍持續更新)
+        return min(accumulator, tick_seconds)
+
+    def _save_replay(self):
+        """遊戲結束時把這一局的回放存檔 (在 game_over_screen 重置狀態之前呼叫)。"""
+        recorder = self.simulation.recorder
+        if recorder is None:
+            return
+        self.simulation.recorder = None
+        try:
+            path = recorder.save(self.game_state)
+            print(f"回放已儲存: {path}")
+        except OSError as e:
+            print(f"錯誤: 無法儲存回放: {e}")
+
+    def _check_autosave(self, last_tick):
+        """
+        這一幀推進的 tick (從 last_tick 開始) 跨過 AUTOSAVE_INTERVAL_TICKS 的倍數時自動存檔。
+        只在 run_game 中呼叫，直接呼叫 _update_game_state (例如基準測試) 不會寫自動存檔。
+        """
+        interval = GameConfig.AUTOSAVE_INTERVAL_TICKS
+        tick = self.game_state.tick
+        if interval and tick // interval != last_tick // interval and not self.game_state.game_over:
+            self._autosave()
+
+    def _autosave(self):
+        """把目前的遊戲狀態快照存到 GameConfig.AUTOSAVE_PATH。"""
+        try:
+            save_snapshot(take_snapshot(self.game_state), GameConfig.AUTOSAVE_PATH)
+        except OSError as e:
+            print(f"錯誤: 無法自動存檔: {e}")
+
+    def _resume_autosave(self):
+        """
+        上一局沒有正常結束 (留有自動存檔) 時，把狀態恢復成存檔的內容。
+        回傳是否成功恢復；存檔損壞時刪除它，照常開新的一局。
+        """
+        if not GameConfig.AUTOSAVE_INTERVAL_TICKS or not os.path.exists(GameConfig.AUTOSAVE_PATH):
+            return False
+        try:
+            restore_snapshot(self.game_state, load_snapshot(GameConfig.AUTOSAVE_PATH))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"警告: 無法讀取自動存檔 {GameConfig.AUTOSAVE_PATH}: {e}")
+            self._remove_autosave()
+            return False
+        self.renderer.invalidate_background()
+        print(f"已從自動存檔恢復 (第 {self.game_state.tick} 個 tick，關卡 {self.game_state.current_level})")
+        return True
+
+    def _remove_autosave(self):
+        """這一局正常結束或玩家關閉視窗時刪除自動存檔。"""
+        try:
+            os.remove(GameConfig.AUTOSAVE_PATH)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"錯誤: 無法刪除自動存檔: {e}")
+
+    def _dump_profile(self):
+        """把效能分析結果寫到 GameConfig.PROFILE_DIR (沒有任何一幀的資料時略過)。"""
+        if self.profiler is None or not self.profiler.frames:
+            return
+        try:
+            csv_path, json_path = self.profiler.dump()
+            print(f"效能分析已儲存: {csv_path}, {json_path}")
+        except OSError as e:
+            print(f"錯誤: 無法儲存效能分析: {e}")
+        self.profiler.reset()
+
+    def _hud_items(self, state):
+        """UI (使用者介面) 文字的 (surface, 位置) 列表。"""
+        items = [
+            (self._draw_text(f'當前錢數$: {state.money}', 26, (255, 0, 0)), (500, 40)),
+            (self._draw_text(
+                f'當前關數{state.current_level}，得分{state.score}, 距離下關還差{state.remnant_score}分', 26,
+                (255, 0, 0)), (5, 40)),
+            (self._draw_text('1.按左鍵放置向日葵 2.按右鍵放置豌豆射手', 26, (255, 0, 0)), (5, 5)),
+        ]
+        speed = GameConfig.GAME_SPEEDS[self.speed_index]
+        if speed != 1: # 快轉中才顯示目前速度
+            label = '快轉: 不限速' if speed == 0 else f'快轉: {speed}x'
+            items.append((self._draw_text(label, 26, (255, 0, 0)), (650, 5)))
+        if self.profiler is not None:
+            items.extend(self.profiler.overlay_items(self._draw_text))
+        return items
+
+    def _draw_game_elements(self, alpha=1.0, state=None):
+        """
+        繪製遊戲畫面上的所有元素。
+        alpha: 子彈與殭屍在上一個 tick 與目前位置之間內插的比例 (1 表示畫在目前位置)。
+        state: 要繪製的狀態，預設為 game_state；管線化時是 SimulationPipeline 的快照 (RenderFrame)。
+        """
+        if state is None:
+            state = self.game_state
+        if GameConfig.USE_DIRTY_RECT_RENDERER:
+            self.renderer.draw(state, self._hud_items(state), alpha, self.camera)
+            return
+
+        state.screen.fill((255, 255, 255)) # 填充白色背景
+
+        # 依序繪製地圖塊、植物、子彈、殭屍，每個圖層一次 blits
+        for items in layer_blit_items(state, alpha, self.camera):
+            state.screen.blits(items, doreturn=False)
 
         # 繪製 UI (使用者介面)
-        self.game_state.screen.blit(self._draw_text(f'當前錢數$: {self.game_state.money}', 26, (255, 0, 0)), (500, 40))
-        self.game_state.screen.blit(self._draw_text(
-            f'當前關數{self.game_state.current_level}，得分{self.game_state.score}, 距離下關還差{self.game_state.remnant_score}分', 26,
-            (255, 0, 0)), (5, 40))
-        self.game_state.screen.blit(self._draw_text('1.按左鍵放置向日葵 2.按右鍵放置豌豆射手', 26, (255, 0, 0)), (5, 5))
+        state.screen.blits(self._hud_items(state), doreturn=False)
 
+        start = time.perf_counter()
         pygame.display.update() # 更新整個螢幕顯示
+        if self.profiler is not None:
+            self.profiler.add("display", time.perf_counter() - start)
 
     def show_start_screen(self):
+        """顯示遊戲開始畫面 (可切換到規則說明)，等待玩家點擊開始。"""
         if self.first_game_start:
             ResourceManager.play_music("background_music.mp3", loops=-1) # 開場音樂循環播放
             self.first_game_start = False
-        
-        """顯示遊戲開始畫面。"""
-        start_image = ResourceManager.load_image("start.png")
-        start_image = pygame.transform.scale(start_image, (GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
-        self.game_state.screen.blit(start_image, (0, 0))
-
-        # 繪製「點擊任意處開始遊戲」的提示文字
-        tip_text = self._draw_text("點擊任意處開始遊戲", 25, (0, 0, 0))
-        # 計算文字位置，使其居中偏上一些
-        tip_rect = tip_text.get_rect(center=(GameConfig.SCREEN_WIDTH // 2 + 75, GameConfig.SCREEN_HEIGHT // 2 - 15))
-        self.game_state.screen.blit(tip_text, tip_rect)
-
-        # --- 新增的「規則說明」文字 ---
-        role_text = self._draw_text("規則說明", 25, (255, 255, 255)) # 白色文字
-        # 計算文字位置，使其在「開始遊戲」文字下方
-        role_rect = role_text.get_rect(center=(GameConfig.SCREEN_WIDTH // 2 - 67, GameConfig.SCREEN_HEIGHT // 2 + 127))
-        self.game_state.screen.blit(role_text, role_rect)
-        # --- 新增的「規則說明」文字結束 ---
-
-        pygame.display.update()
-
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    ResourceManager.stop_music() # 退出時停止音樂
-                    pygame.quit()
-                    exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_x, mouse_y = event.pos # 獲取滑鼠點擊座標
-                    
-                    # 判斷是否點擊了「規則說明」區域
-                    if role_rect.collidepoint(mouse_x, mouse_y):
-                        self._show_rules_screen() # 呼叫顯示規則的方法
-                        # 顯示完規則後，需要重新繪製開始畫面，因為規則畫面會覆蓋掉它
-                        self.game_state.screen.blit(start_image, (0, 0))
-                        self.game_state.screen.blit(tip_text, tip_rect)
-                        self.game_state.screen.blit(role_text, role_rect)
-                        pygame.display.update()
-                    else:
-                        # 如果沒有點擊「規則說明」區域，則開始遊戲
-                        waiting = False # 結束等待迴圈，讓遊戲主迴圈開始
-
-    def _show_rules_screen(self):
-        """顯示遊戲規則說明畫面。"""
-        rules_background = pygame.Surface((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
-        rules_background.fill((0, 0, 50)) # 深藍色背景
-
-        # 規則內容 (您可以根據需要添加更多行)
-        rules_lines = [
-            "遊戲規則:",
-            "1. 左鍵點擊空地種植向日葵($30)，向日葵會產錢。",
-            "2. 右鍵點擊空地種植豌豆射手($50)，豌豆射手會攻擊殭屍。",
-            "3. 殭屍會從右邊出現，向左移動。",
-            "4. 如果殭屍突破防線，遊戲結束。",
-            "5. 消滅殭屍可得分，達到一定分數進入下一關。",
-            "6. 按 'Q' 鍵隨時結束遊戲。",
-            "",
-            "點擊任意處返回主畫面..."
-        ]
-
-        # 繪製規則文字
-        y_offset = 150
-        for line in rules_lines:
-            rule_text = self._draw_text(line, 22, (255, 255, 255)) # 白色文字
-            rule_rect = rule_text.get_rect(center=(GameConfig.SCREEN_WIDTH // 2, y_offset))
-            rules_background.blit(rule_text, rule_rect)
-            y_offset += 30 # 每行間距
-
-        self.game_state.screen.blit(rules_background, (0, 0))
-        pygame.display.update()
-
-        # 等待玩家點擊返回
-        waiting_for_return = True
-        while waiting_for_return:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    waiting_for_return = False # 玩家點擊後返回
+        self.scenes.run("start")
 
     def game_over_screen(self):
         ResourceManager.stop_music() # 停止當前播放的背景音樂
-        win_image = ResourceManager.load_image("CLEAR.png")
-        lose_image = ResourceManager.load_image("GAMEOVER.png")
-
-        if self.game_state.current_level >= GameConfig.MAX_LEVEL:
-            self.game_state.screen.blit(win_image, (0, 0))
-            # 這裡需要更精確的勝利判斷，例如：所有殭屍被消滅，且達到最高關卡
-            # 假設達到 MAX_LEVEL 且沒有殭屍殘留就算勝利
-            if self.win_sound:
-                self.win_sound.play()
-            self.game_state.screen.blit(self._draw_text('回主頁', 25, (0, 0, 0)), (360, 410))
-            self.game_state.screen.blit(self._draw_text(f'你的分數: {self.game_state.score}', 30, (255, 255, 255)), (300, 320))
-
-        else:
-            self.game_state.screen.blit(lose_image, (0, 0))
-            if self.lose_sound:
-                self.lose_sound.play()
-            self.game_state.screen.blit(self._draw_text('重新', 50, (255, 255, 255)), (525, 360))
-            self.game_state.screen.blit(self._draw_text(f'你的分數: {self.game_state.score}', 30, (255, 255, 255)), (500, 270))
-
-        pygame.display.update()
-        pygame.time.wait(1000)
-
-        waiting_for_restart = True
-        while waiting_for_restart:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    ResourceManager.stop_music() # 退出時停止音樂
-                    pygame.quit()
-                    exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    waiting_for_restart = False
-        
+        # 這裡需要更精確的勝利判斷，例如：所有殭屍被消滅，且達到最高關卡
+        # 假設達到 MAX_LEVEL 且沒有殭屍殘留就算勝利
+        won = self.game_state.current_level >= GameConfig.MAX_LEVEL
+        sound = self.win_sound if won else self.lose_sound
+        if sound:
+            sound.play()
+        self.game_over_scene.show(won, self.game_state.score)
+        self.scenes.run("game_over") # 等待玩家點擊
+
         # 重置遊戲狀態，並準備下一次開始時播放開場音樂
         self.game_state.reset_game_state()
         self.first_game_start = True # 重置為 True，下次 show_start_screen 會再播放音樂
@@ -332,21 +310,79 @@ class GameManager:
         # 或者，如果遊戲中要用同一首音樂，這裡就不用特別處理
         # 如果遊戲中要播放另一首遊戲音樂，可以在這裡 ResourceManager.play_music("game_music.mp3", loops=-1)
 
+        self._load_sounds()
+        # 只在新的一局開始時恢復 (restore_snapshot 需要時會自己建立地圖)
+        resumed = self.game_state.tick == 0 and self._resume_autosave()
         if not self.game_state.game_map_tiles:
              self._init_map_grid()
-        if not self.game_state.zombies:
+        if not resumed and not self.game_state.zombies:
              self._init_zombies()
-
+        # 開始畫面蓋掉了整個螢幕，第一幀需要完整重畫
+        self.renderer.request_full_redraw()
+        # 記錄這一局的種子與種植操作
+        # 從自動存檔恢復的局不是從第 0 個 tick 開始，無法重播
+        if GameConfig.RECORD_REPLAYS and not resumed:
+            self.simulation.recorder = InputRecorder(self.game_state.seed)
+
+        # 遊戲邏輯以固定的 GameConfig.TICK_RATE 更新，與畫面幀率脫鉤
+        accumulator = 0.0
+        last_time = time.perf_counter()
+        profiler = self.profiler
+        # 管線化時每一幀在工作執行緒推進 tick，同時繪製上一幀結束時的快照 (畫面晚一幀)
+        pipeline = None
+        if GameConfig.PIPELINED_SIMULATION:
+            pipeline = SimulationPipeline(self.game_state)
+            if profiler is not None: # 工作執行緒的耗時先記在 ProfileBuffer，wait 之後才加到 profiler
+                self.simulation.profiler = ProfileBuffer()
         while not self.game_state.game_over:
+            if profiler is not None:
+                profiler.begin_frame()
+            start = time.perf_counter()
             self._handle_input()
-            self._update_game_state()
-            self._draw_game_elements()
+            self._scroll_camera()
+            now = time.perf_counter()
+            if profiler is not None:
+                profiler.add("input", now - start)
+            last_tick = self.game_state.tick
+            if pipeline is None:
+                accumulator = self._run_ticks(now - last_time, accumulator)
+                last_time = now
+                self._play_pending_sounds()
+                alpha = accumulator * GameConfig.TICK_RATE if GameConfig.INTERPOLATE_RENDERING else 1.0
+                start = time.perf_counter()
+                self._draw_game_elements(alpha)
+                if profiler is not None:
+                    profiler.add("draw", time.perf_counter() - start)
+            else:
+                # front 快照是上一批 tick 結束時的狀態，accumulator 也還是那時剩下的時間
+                alpha = accumulator * GameConfig.TICK_RATE if GameConfig.INTERPOLATE_RENDERING else 1.0
+                pipeline.submit(self._run_ticks, now - last_time, accumulator)
+                last_time = now
+                start = time.perf_counter()
+                self._draw_game_elements(alpha, pipeline.front)
+                if profiler is not None: # 不包含等待工作執行緒的時間
+                    profiler.add("draw", time.perf_counter() - start)
+                accumulator = pipeline.wait() # 之後才能再修改 game_state (處理輸入)
+                if profiler is not None:
+                    self.simulation.profiler.replay(profiler)
+                self._play_pending_sounds()
+                if self.game_state.game_over: # 遊戲結束時的狀態還沒畫出來
+                    self._draw_game_elements(1.0, pipeline.front)
+            self._check_autosave(last_tick)
+            if profiler is not None:
+                profiler.end_frame()
 
             if self.game_state.game_over:
+                self._save_replay()
+                self._remove_autosave()
+                self._dump_profile()
                 self.game_over_screen()
                 break
                 
-            self.clock.tick(60)
+            self.clock.tick(GameConfig.RENDER_FPS)
 
+        if pipeline is not None:
+            pipeline.close()
+            self.simulation.profiler = profiler
         if self.game_state.game_over:
             print("遊戲徹底結束。")
@@ -4,20 +4,70 @@ import pygame
 from resources import ResourceManager # 導入資源管理器
 from game_config import GameConfig # 導入遊戲配置，用於佔位圖片大小
 
-class GameObject(pygame.sprite.Sprite):
+_image_sizes = {} # 圖片名稱 -> (寬, 高)，同一種物件只需要載入一次圖片來取得尺寸
+_slot_names = {}  # 類別 -> 包含父類別在內的所有 __slots__ 名稱 (clone 使用)
+
+def image_size(image_name):
+    """回傳圖片的 (寬, 高)；載入失敗時 ResourceManager 會給佔位圖，尺寸同樣可用。"""
+    size = _image_sizes.get(image_name)
+    if size is None:
+        size = _image_sizes[image_name] = ResourceManager.load_image(image_name).get_size()
+    return size
+
+class GameObject:
+    """
+    模擬用的輕量實體：以 __slots__ 只保存位置、尺寸、圖片名稱與狀態幾個欄位，沒有 __dict__，
+    也不繼承 pygame.sprite.Sprite。圖片 (image)、矩形 (rect) 與 sprite 都是繪製時才建立的唯讀檢視，
+    修改它們不會影響實體；模擬程式一律直接讀寫 x、y。
+    """
+    __slots__ = ("x", "y", "width", "height", "image_name", "live", "prev_x")
+
     def __init__(self, x, y, image_name):
-        super().__init__()
-        # 使用 ResourceManager 載入圖片，如果失敗會有預設佔位圖
-        self.image = ResourceManager.load_image(image_name)
-        
-        # 獲取圖片的矩形區域，並設置其左上角位置
-        self.rect = self.image.get_rect(topleft=(x, y))
+        self.x = x # 左上角座標
+        self.y = y
+        self.width, self.height = image_size(image_name)
+        self.image_name = image_name
         self.live = True # 表示物件是否存活 (例如，血量歸零時設為 False)
+        self.prev_x = x  # 上一個 tick 的 x 座標，繪製時用來內插 (會移動的物件在 update 開頭更新)
+
+    @property
+    def image(self):
+        """物件的圖片 (從 ResourceManager 的快取取得)。"""
+        return ResourceManager.load_image(self.image_name)
+
+    @property
+    def rect(self):
+        """目前位置的 pygame.Rect (每次建立新的矩形)。"""
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def to_sprite(self, alpha=1.0):
+        """建立一個 pygame.sprite.Sprite 檢視 (供 sprite 群組繪製使用)，位置依 alpha 內插。"""
+        sprite = pygame.sprite.Sprite()
+        sprite.image = self.image
+        sprite.rect = sprite.image.get_rect(topleft=self.render_pos(alpha))
+        return sprite
+
+    def clone(self):
+        """複製一份獨立的物件 (只複製欄位，圖片仍由 ResourceManager 共用)。"""
+        cls = type(self)
+        names = _slot_names.get(cls)
+        if names is None:
+            names = _slot_names[cls] = tuple(name for klass in cls.__mro__ for name in getattr(klass, "__slots__", ()))
+        other = object.__new__(cls)
+        for name in names:
+            setattr(other, name, getattr(self, name))
+        return other
+
+    def render_pos(self, alpha=1.0):
+        """繪製位置：依 alpha (0~1) 在上一個 tick 與目前位置之間內插。"""
+        if alpha >= 1.0 or self.prev_x == self.x:
+            return (self.x, self.y)
+        return (self.prev_x + round((self.x - self.prev_x) * alpha), self.y)
 
-    def draw(self, surface):
+    def draw(self, surface, alpha=1.0):
         """在指定的 Pygame surface 上繪製物件。"""
         if self.live: # 只有活著的物件才繪製
-            surface.blit(self.image, self.rect)
+            surface.blit(self.image, self.render_pos(alpha))
 
     def update(self, game_state):
         """
@@ -5,6 +5,8 @@ from game_objects.base import GameObject # 導入基礎遊戲物件
 from resources import ResourceManager # 導入資源管理器
 
 class MapTile(GameObject):
+    __slots__ = ("can_grow",)
+
     # 兩種不同顏色的地圖圖片名稱列表
     map_image_names = ['map1.png', 'map2.png']
 
@@ -1,14 +1,26 @@
 # game_state.py
 
+import random
 from game_config import GameConfig
+from spatial_index import SpatialIndex
+from entity_store import create_entity_store
+from object_pool import ObjectPool
+from timer_wheel import TimerWheel
+from bullet_planner import BulletPlanner
+from game_objects import PeaBullet, Zombie
 
 class GameState:
-    def __init__(self):
+    def __init__(self, seed=None):
+        # 這一局的隨機種子與亂數產生器：殭屍生成只使用 self.rng，相同種子與操作就能重現整局
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.tick = 0 # 已經執行的遊戲更新次數 (由 GameSimulation.update 累加)
         self.game_over = False
         self.current_level = 1
         self.score = 0
         self.remnant_score = GameConfig.INITIAL_REMNANT_SCORE # 距離下一關還差的分數
         self.money = GameConfig.INITIAL_MONEY
+        self.quiet = False # True 時不在主控台輸出升級等訊息 (例如伺服器上同時進行的多局遊戲)
         
         # 儲存遊戲中所有活動物件的列表
         self.plant_grid_points = [] # 地圖網格的邏輯坐標點列表 (用於初始化地圖)
@@ -16,17 +28,34 @@ class GameState:
         self.plants = []            # 所有的植物物件
         self.bullets = []           # 所有的子彈物件
         self.zombies = []           # 所有的殭屍物件
+        # 殭屍 (依行) 與植物 (依地圖格) 的空間索引，每個 tick 開始時由 GameSimulation 重建
+        self.spatial_index = SpatialIndex()
+        # 選用的 NumPy 陣列實體儲存區 (GameConfig.USE_ARRAY_STORE)，啟用時殭屍與子彈改存放在這裡
+        self.entity_store = create_entity_store()
+        # 子彈與殭屍的物件池，死亡後歸還，之後生成時就地重設再利用
+        self.bullet_pool = ObjectPool(PeaBullet, GameConfig.BULLET_POOL_SIZE, GameConfig.BULLET_POOL_PREFILL)
+        self.zombie_pool = ObjectPool(Zombie, GameConfig.ZOMBIE_POOL_SIZE, GameConfig.ZOMBIE_POOL_PREFILL)
+        # 選用的子彈命中預測 (GameConfig.USE_PREDICTIVE_BULLETS，只用於一般的物件模式)
+        self.bullet_planner = BulletPlanner() if GameConfig.USE_PREDICTIVE_BULLETS and self.entity_store is None else None
+        # 自上次結算以來生成的實體數量，以及上一個 tick 結算的生成/移除數量 (由 GameSimulation.update 結算)
+        self.spawned_counts = {"plants": 0, "bullets": 0, "zombies": 0}
+        self.tick_stats = {"spawned": dict(self.spawned_counts), "reaped": dict(self.spawned_counts)}
 
-        # 殭屍生成計時器
-        self.zombie_spawn_timer = 0
+        # 週期性動作 (例如向日葵生成陽光) 的計時輪，實體登記下一次到期的 tick，由 GameSimulation.update 處理
+        self.timers = TimerWheel()
+        # 上一批殭屍由計時器生成的 tick (-1 表示還沒有)，距離達到生成閾值時生成下一批
+        self.last_zombie_wave_tick = -1
         # 殭屍生成閾值會根據關卡改變
         self.zombie_spawn_threshold = GameConfig.ZOMBIE_SPAWN_INTERVAL_BASE 
 
         self.screen = None # Pygame 視窗物件，在 GameManager 中設定
         self.first_zombie_wave_sound_played = False 
 
-    def reset_game_state(self):
-        """將所有遊戲狀態重置為初始值，用於重新開始遊戲。"""
+    def reset_game_state(self, seed=None):
+        """將所有遊戲狀態重置為初始值，用於重新開始遊戲 (沒有指定種子時換一個新的種子)。"""
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng.seed(self.seed)
+        self.tick = 0
         self.game_over = False
         self.current_level = 1
         self.score = 0
@@ -34,13 +63,91 @@ class GameState:
         self.money = GameConfig.INITIAL_MONEY
         
         self.plants.clear()
+        # 場上的子彈與殭屍歸還物件池
+        for bullet in self.bullets:
+            self.bullet_pool.release(bullet)
         self.bullets.clear()
+        for zombie in self.zombies:
+            self.zombie_pool.release(zombie)
         self.zombies.clear()
+        self.spatial_index = SpatialIndex()
+        if self.entity_store is not None:
+            self.entity_store.clear()
+        if self.bullet_planner is not None:
+            self.bullet_planner = BulletPlanner()
         
         # 地圖相關列表也需要清空，然後在 GameManager 中重新初始化
         self.plant_grid_points.clear()
         self.game_map_tiles.clear()
         
-        self.zombie_spawn_timer = 0
+        self.timers = TimerWheel()
+        self.last_zombie_wave_tick = -1
         self.zombie_spawn_threshold = GameConfig.ZOMBIE_SPAWN_INTERVAL_BASE
-        self.first_zombie_wave_sound_played = False 
+        self.first_zombie_wave_sound_played = False
+
+    def spawn_zombie(self, x, y):
+        """在 (x, y) 生成一隻殭屍 (啟用陣列儲存區時存入陣列)。"""
+        if self.entity_store is not None:
+            self.entity_store.add_zombie(x, y)
+        else:
+            zombie = self.zombie_pool.acquire(x, y)
+            self.zombies.append(zombie)
+            if self.bullet_planner is not None:
+                self.bullet_planner.lane_changed(zombie) # 這一行的子彈需要重新預測
+        self.spawned_counts["zombies"] += 1
+
+    def spawn_bullet(self, x, y):
+        """在 (x, y) 生成一顆豌豆子彈 (啟用陣列儲存區時存入陣列)。"""
+        if self.entity_store is not None:
+            self.entity_store.add_bullet(x, y)
+        else:
+            self.bullets.append(self.bullet_pool.acquire(x, y))
+        self.spawned_counts["bullets"] += 1
+
+    def pool_stats(self):
+        """回傳子彈與殭屍物件池的統計。"""
+        return {"bullets": self.bullet_pool.stats(), "zombies": self.zombie_pool.stats()}
+
+    def has_zombie_ahead(self, y, min_x, max_x):
+        """同一行 (y 座標相同) 是否有活著的殭屍，且 min_x < 殭屍 x < max_x。"""
+        if self.entity_store is not None and self.entity_store.has_zombie_ahead(y, min_x, max_x):
+            return True
+        return self.spatial_index.has_zombie_ahead(y, min_x, max_x)
+
+    def register_zombie_kill(self):
+        """記錄消滅一隻殭屍：加分，並檢查是否升級或達到最高關卡。"""
+        self.score += GameConfig.SCORE_PER_ZOMBIE
+        self.remnant_score -= GameConfig.SCORE_PER_ZOMBIE
+
+        # 檢查是否達到進入下一關的分數
+        if self.remnant_score <= 0:
+            # --- 新增的關卡上限檢查 ---
+            if self.current_level >= GameConfig.MAX_LEVEL:
+                # 達到最高關卡，遊戲勝利結束
+                if not self.quiet:
+                    print(f"恭喜！您已達到最高關卡 {GameConfig.MAX_LEVEL}！遊戲結束。")
+                self.game_over = True # 設定遊戲結束
+                # 這裡可以考慮設置一個勝利標誌，讓 game_over_screen 顯示不同的訊息
+                # 例如：self.victory = True
+            else:
+                # 尚未達到最高關卡，正常升級
+                self.current_level += 1
+                if not self.quiet:
+                    print(f"升級！進入第 {self.current_level} 關。")
+                # 計算下一關所需分數
+                self.remnant_score = self.current_level * GameConfig.NEXT_LEVEL_SCORE_MULTIPLIER
+                # 隨著關卡推進，殭屍生成間隔會縮短（速度加快）
+                # 確保閾值不會變成負數或太小
+                self.zombie_spawn_threshold = max(50, GameConfig.ZOMBIE_SPAWN_INTERVAL_BASE -
+                                                  (self.current_level - 1) * GameConfig.ZOMBIE_SPAWN_INTERVAL_DECREMENT)
+
+    def free_plant_tile(self, plant):
+        """植物死亡後，將其所在的地圖塊設回可種植。"""
+        # 需要根據植物的位置計算出它位於哪個地圖格
+        grid_x = plant.x // GameConfig.TILE_SIZE
+        grid_y = plant.y // GameConfig.TILE_SIZE
+
+        # 確保索引在範圍內 (因為地圖從 y=1 開始，所以 map_tiles 的行索引是 y-1)
+        if 0 <= grid_y - 1 < len(self.game_map_tiles) and \
+           0 <= grid_x < len(self.game_map_tiles[0]):
+            self.game_map_tiles[grid_y - 1][grid_x].can_grow = True
@@ -0,0 +1,56 @@
+# object_pool.py
+
+class ObjectPool:
+    """
+    物件池：acquire 優先取出閒置的物件並就地重設 (呼叫物件的 reset)，沒有才新建；
+    release 把不再使用的物件收回，供之後重複使用，避免大量建立與回收物件。
+    """
+    def __init__(self, factory, max_size, prefill=0):
+        self.factory = factory   # 以 (x, y) 建立新物件的類別或函式
+        self.max_size = max_size # 最多保留幾個閒置物件 (0 表示不保留，等同停用物件池)
+        self.prefill = min(prefill, max_size) # 第一次 acquire 時預先建立的數量
+        self._free = []
+        self._prefilled = False
+        self.in_use = 0     # 目前使用中的數量
+        self.high_water = 0 # 同時使用中的最大數量
+        self.created = 0    # 新建的次數
+        self.reused = 0     # 重複使用的次數
+
+    def _fill(self):
+        # 第一次使用時才預先建立，此時視窗已建立，圖片能正確轉換像素格式
+        self._prefilled = True
+        while len(self._free) < self.prefill:
+            self._free.append(self.factory(0, 0))
+            self.created += 1
+
+    def acquire(self, x, y):
+        """取得一個位於 (x, y) 的物件。"""
+        if not self._prefilled:
+            self._fill()
+        if self._free:
+            obj = self._free.pop()
+            obj.reset(x, y)
+            self.reused += 1
+        else:
+            obj = self.factory(x, y)
+            self.created += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        """歸還一個不再使用的物件。"""
+        self.in_use -= 1
+        if len(self._free) < self.max_size:
+            self._free.append(obj)
+
+    def stats(self):
+        """回傳物件池統計 (使用中、閒置、最高使用量、新建與重複使用次數)。"""
+        return {
+            "in_use": self.in_use,
+            "free": len(self._free),
+            "high_water": self.high_water,
+            "created": self.created,
+            "reused": self.reused,
+        }
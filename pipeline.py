@@ -0,0 +1,120 @@
+# pipeline.py
+
+from concurrent.futures import ThreadPoolExecutor
+from game_objects.base import GameObject, image_size
+from entity_store import EntityStore
+
+class EntityView:
+    """繪製用的實體複本：只有繪製需要的欄位，繪製介面 (image、rect、render_pos) 與 GameObject 相同。"""
+    __slots__ = ("x", "y", "prev_x", "width", "height", "image_name")
+    live = True # 快照只包含活著的實體
+    image = GameObject.image
+    rect = GameObject.rect
+    render_pos = GameObject.render_pos
+
+    def copy(self, entity):
+        self.x = entity.x
+        self.y = entity.y
+        self.prev_x = entity.prev_x
+        self.width = entity.width
+        self.height = entity.height
+        self.image_name = entity.image_name
+        return self
+
+class RenderFrame:
+    """
+    一幀要繪製的狀態快照，屬性名稱與 GameState 相同 (繪製器與 HUD 只讀這些屬性)，
+    所以可以直接取代 game_state 交給 renderer.py。地圖塊在遊戲中不會改變，直接共用。
+    """
+    def __init__(self, game_state):
+        self.screen = game_state.screen
+        self.game_map_tiles = game_state.game_map_tiles
+        self.plants = []
+        self.bullets = []
+        self.zombies = []
+        self.entity_store = None
+        self.money = 0
+        self.current_level = 0
+        self.score = 0
+        self.remnant_score = 0
+        self.tick = 0
+
+    @staticmethod
+    def _copy_entities(entities, views):
+        """把活著的實體複製到 views (沿用上一次留下的 EntityView，只在數量不足時建立新的)。"""
+        count = 0
+        for entity in entities:
+            if entity.live:
+                if count == len(views):
+                    views.append(EntityView())
+                views[count].copy(entity)
+                count += 1
+        del views[count:]
+
+    def capture(self, game_state, plant_views):
+        """
+        複製 game_state 目前要繪製的內容 (必須在沒有其他執行緒修改 game_state 時呼叫)。
+        plant_views: 植物 -> EntityView，植物不會移動，同一株植物每次都用同一個檢視，
+        DirtyRectRenderer 才能依物件辨認畫面上已經畫過的植物。
+        """
+        self.screen = game_state.screen
+        self.game_map_tiles = game_state.game_map_tiles
+        plants = [plant for plant in game_state.plants if plant.live]
+        for plant in [plant for plant in plant_views if not plant.live]:
+            del plant_views[plant]
+        self.plants = [plant_views.get(plant) or plant_views.setdefault(plant, EntityView().copy(plant))
+                       for plant in plants]
+        RenderFrame._copy_entities(game_state.bullets, self.bullets)
+        RenderFrame._copy_entities(game_state.zombies, self.zombies)
+        store = game_state.entity_store
+        if store is None:
+            self.entity_store = None
+        else:
+            if self.entity_store is None:
+                self.entity_store = EntityStore()
+            self.entity_store.copy_from(store)
+        self.money = game_state.money
+        self.current_level = game_state.current_level
+        self.score = game_state.score
+        self.remnant_score = game_state.remnant_score
+        self.tick = game_state.tick
+
+class SimulationPipeline:
+    """
+    管線化的遊戲迴圈 (GameConfig.PIPELINED_SIMULATION)：主執行緒繪製 front 快照的同時，
+    工作執行緒推進下一批 tick，完成後把狀態複製到另一個快照 (back)；wait() 等它完成並交換兩個快照。
+    兩個執行緒不會同時存取 game_state：submit 之後到 wait 之前只有工作執行緒會讀寫它，
+    主執行緒這段時間只讀 front 快照，所以處理輸入 (種植) 必須在 wait 之後、下一次 submit 之前。
+    pygame 的 blit 與畫面更新會釋放 GIL，繪製的這段時間遊戲邏輯可以在另一個核心上執行。
+    """
+    def __init__(self, game_state):
+        self.game_state = game_state
+        # 子彈與殭屍會在工作執行緒生成，先在主執行緒載入它們的圖片尺寸 (之後不會再載入圖片)
+        for image_name in ('peabullet.png', 'zombie.png'):
+            image_size(image_name)
+        self._plant_views = {}
+        self.front = RenderFrame(game_state) # 正在繪製的快照
+        self._back = RenderFrame(game_state) # 工作執行緒寫入的快照
+        self.front.capture(game_state, self._plant_views)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="simulation")
+        self._future = None
+
+    def _run(self, function, args):
+        result = function(*args)
+        self._back.capture(self.game_state, self._plant_views)
+        return result
+
+    def submit(self, function, *args):
+        """在工作執行緒執行 function(*args) (推進遊戲邏輯)，完成後把狀態複製到 back 快照。"""
+        self._future = self._executor.submit(self._run, function, args)
+
+    def wait(self):
+        """等工作執行緒完成 (例外會在這裡重新拋出)，交換兩個快照，回傳 function 的回傳值。"""
+        future, self._future = self._future, None
+        result = future.result()
+        self.front, self._back = self._back, self.front
+        return result
+
+    def close(self):
+        """結束工作執行緒 (等目前的工作完成)。"""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,166 @@
+# profiler.py
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from game_config import GameConfig
+
+class FrameProfiler:
+    """
+    每幀各階段耗時的分析器：run_game 的輸入/更新/繪製、各類實體的更新迴圈，以及 pygame.display.update。
+    最近 GameConfig.PROFILER_HISTORY 幀存放在環狀緩衝區，可計算 p50/p95/p99 並偵測卡頓 (hitch)，
+    遊戲結束時輸出成 CSV (每幀) 與 JSON (統計與卡頓紀錄)。
+    """
+    # 依序為 CSV 欄位與疊加資訊的顯示順序 (毫秒)
+    STAGES = ("input", "update", "draw", "display", "plants", "bullets", "zombies", "store", "timers", "spawn")
+
+    def __init__(self, history=None):
+        self.frames = deque(maxlen=history or GameConfig.PROFILER_HISTORY) # 環狀緩衝區
+        self.hitches = deque(maxlen=100) # 最近的卡頓紀錄
+        self.frame_count = 0
+        self.show_overlay = False
+        self._current = None
+        self._frame_start = 0.0
+        self._overlay_items = []
+
+    def reset(self):
+        """清空所有紀錄 (每局結束輸出後呼叫)。"""
+        self.frames.clear()
+        self.hitches.clear()
+        self.frame_count = 0
+        self._overlay_items = []
+
+    def begin_frame(self):
+        """每幀開始時呼叫。"""
+        self._current = {"stages": dict.fromkeys(FrameProfiler.STAGES, 0.0), "ticks": 0, "events": []}
+        self._frame_start = time.perf_counter()
+
+    def add(self, stage, seconds):
+        """把 seconds 秒累加到這一幀的 stage 階段 (同一幀跑多個 tick 時會累加)。"""
+        if self._current is not None:
+            self._current["stages"][stage] += seconds * 1000.0
+
+    def add_tick(self):
+        """這一幀多跑了一個遊戲更新。"""
+        if self._current is not None:
+            self._current["ticks"] += 1
+
+    def mark(self, event):
+        """記錄這一幀發生的事件 (例如 "wave"、"level_up")，卡頓時一起輸出方便找原因。"""
+        if self._current is not None:
+            self._current["events"].append(event)
+
+    def end_frame(self):
+        """每幀結束時呼叫 (在 clock.tick 等待之前)，記錄整幀耗時並檢查是否卡頓。"""
+        frame = self._current
+        if frame is None:
+            return
+        self._current = None
+        frame["frame"] = self.frame_count
+        frame["total"] = (time.perf_counter() - self._frame_start) * 1000.0
+        self.frame_count += 1
+
+        # 比中位數慢 PROFILER_HITCH_FACTOR 倍、且超過一幀的時間預算，就算卡頓
+        if len(self.frames) >= 30:
+            budget = 1000.0 / GameConfig.RENDER_FPS
+            if frame["total"] > max(self.percentile(50) * GameConfig.PROFILER_HITCH_FACTOR, budget):
+                self.hitches.append(frame)
+        self.frames.append(frame)
+
+    def percentile(self, p, stage=None):
+        """最近幾幀的第 p 百分位耗時 (毫秒)；stage 為 None 時用整幀耗時。"""
+        if not self.frames:
+            return 0.0
+        if stage is None:
+            values = sorted(frame["total"] for frame in self.frames)
+        else:
+            values = sorted(frame["stages"][stage] for frame in self.frames)
+        index = min(len(values) - 1, int(len(values) * p / 100))
+        return values[index]
+
+    def summary(self):
+        """整幀與各階段的 p50/p95/p99，以及卡頓次數。"""
+        result = {
+            "frames": self.frame_count,
+            "history": len(self.frames),
+            "total": {f"p{p}": self.percentile(p) for p in (50, 95, 99)},
+            "stages": {stage: {f"p{p}": self.percentile(p, stage) for p in (50, 95, 99)}
+                       for stage in FrameProfiler.STAGES},
+            "hitch_count": len(self.hitches),
+            "hitches": list(self.hitches),
+        }
+        return result
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        self._overlay_items = []
+
+    def overlay_items(self, render_text):
+        """
+        疊加資訊的 (surface, 位置) 列表，可直接加進 HUD。
+        render_text(內容, 大小, 顏色) 回傳文字 surface；數字每 15 幀才更新，避免文字快取不停換新。
+        """
+        if not self.show_overlay:
+            return []
+        if not self._overlay_items or self.frame_count % 15 == 0:
+            lines = [f"幀 p50 {self.percentile(50):.1f} / p95 {self.percentile(95):.1f} / "
+                     f"p99 {self.percentile(99):.1f} ms，卡頓 {len(self.hitches)} 次"]
+            last = self.frames[-1] if self.frames else None
+            if last is not None:
+                lines.append("  ".join(f"{stage} {last['stages'][stage]:.1f}" for stage in FrameProfiler.STAGES[:4]))
+                lines.append("  ".join(f"{stage} {last['stages'][stage]:.1f}" for stage in FrameProfiler.STAGES[4:]))
+            y = GameConfig.SCREEN_HEIGHT - 20 * len(lines) - 5
+            self._overlay_items = [(render_text(line, 16, (0, 0, 0)), (5, y + i * 20)) for i, line in enumerate(lines)]
+        return self._overlay_items
+
+    def dump(self, directory=None):
+        """把環狀緩衝區中的每幀資料寫成 CSV、統計與卡頓寫成 JSON，回傳兩個檔案路徑。"""
+        directory = directory or GameConfig.PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime('%Y%m%d_%H%M%S')
+        csv_path = os.path.join(directory, f"frames_{stamp}.csv")
+        json_path = os.path.join(directory, f"summary_{stamp}.json")
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "total"] + list(FrameProfiler.STAGES) + ["ticks", "events"])
+            for frame in self.frames:
+                writer.writerow([frame["frame"], f"{frame['total']:.3f}"]
+                                + [f"{frame['stages'][stage]:.3f}" for stage in FrameProfiler.STAGES]
+                                + [frame["ticks"], " ".join(frame["events"])])
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        return csv_path, json_path
+
+
+class ProfileBuffer:
+    """
+    在工作執行緒 (pipeline.py) 代替 FrameProfiler 記錄 add、add_tick 與 mark，
+    之後由主執行緒以 replay 套用到 FrameProfiler 目前的這一幀，FrameProfiler 只會在主執行緒被修改。
+    """
+    def __init__(self):
+        self.stages = {}
+        self.ticks = 0
+        self.events = []
+
+    def add(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def add_tick(self):
+        self.ticks += 1
+
+    def mark(self, event):
+        self.events.append(event)
+
+    def replay(self, profiler):
+        """把記錄的內容加到 profiler 目前的這一幀並清空。"""
+        for stage, seconds in self.stages.items():
+            profiler.add(stage, seconds)
+        for _ in range(self.ticks):
+            profiler.add_tick()
+        for event in self.events:
+            profiler.mark(event)
+        self.stages = {}
+        self.ticks = 0
+        self.events = []
@@ -0,0 +1,170 @@
+# renderer.py
+
+import time
+import pygame
+from game_config import GameConfig
+from resources import ResourceManager
+
+# 每個圖層的 (圖片, 位置) 列表只包含活著的物件，交給 Surface.blits 一次畫完整個圖層，
+# 不再逐一呼叫 GameObject.draw (每次呼叫各自檢查 live 並各自 blit)。
+# 傳入 camera (camera.py) 時只包含與視窗重疊的物件，位置換成螢幕座標；None 表示世界座標就是螢幕座標。
+
+class _ImageTable(dict):
+    """圖片名稱 -> 圖片。實體只記得圖片名稱，同一圖層只有少數幾種圖片，每種只向 ResourceManager 取一次。"""
+    def __missing__(self, image_name):
+        image = self[image_name] = ResourceManager.load_image(image_name)
+        return image
+
+def _entity_blit_items(entities, alpha, camera):
+    images = _ImageTable()
+    if camera is None:
+        return [(images[entity.image_name], entity.render_pos(alpha)) for entity in entities if entity.live]
+    view = camera.rect
+    left, top, right, bottom = view.left, view.top, view.right, view.bottom
+    items = []
+    for entity in entities:
+        if entity.live:
+            x = entity.render_pos(alpha)[0]
+            y = entity.y
+            if x < right and x + entity.width > left and y < bottom and y + entity.height > top:
+                items.append((images[entity.image_name], (x - left, y - top)))
+    return items
+
+def tile_blit_items(game_state, camera=None):
+    """地圖塊圖層 (有 camera 時直接算出視窗內的地圖塊，不走訪整張地圖)。"""
+    images = _ImageTable()
+    if camera is None:
+        return [(images[tile.image_name], (tile.x, tile.y)) for row in game_state.game_map_tiles for tile in row if tile.live]
+    dx, dy = -camera.rect.x, -camera.rect.y
+    return [(images[tile.image_name], (tile.x + dx, tile.y + dy)) for tile in camera.visible_tiles(game_state) if tile.live]
+
+def plant_blit_items(game_state, camera=None):
+    """植物圖層。"""
+    return _entity_blit_items(game_state.plants, 1.0, camera)
+
+def bullet_blit_items(game_state, alpha=1.0, camera=None):
+    """子彈圖層 (含陣列儲存區)，位置依 alpha 內插。"""
+    items = _entity_blit_items(game_state.bullets, alpha, camera)
+    if game_state.entity_store is not None:
+        items.extend(game_state.entity_store.bullet_blit_items(alpha, camera))
+    return items
+
+def zombie_blit_items(game_state, alpha=1.0, camera=None):
+    """殭屍圖層 (含陣列儲存區)，位置依 alpha 內插。"""
+    items = _entity_blit_items(game_state.zombies, alpha, camera)
+    if game_state.entity_store is not None:
+        items.extend(game_state.entity_store.zombie_blit_items(alpha, camera))
+    return items
+
+def layer_blit_items(game_state, alpha=1.0, camera=None):
+    """依繪製順序 (由下而上) 回傳地圖塊、植物、子彈、殭屍四個圖層。"""
+    return [tile_blit_items(game_state, camera), plant_blit_items(game_state, camera),
+            bullet_blit_items(game_state, alpha, camera), zombie_blit_items(game_state, alpha, camera)]
+
+
+class DirtyRectRenderer:
+    """
+    髒矩形繪製器：地圖只在重建 (或視窗捲動) 時合成一次到快取的底圖，
+    之後每一幀只用底圖蓋掉上一幀移動物件與 HUD 的位置、重畫有變化的部分，
+    並只把這些區域交給 pygame.display.update。
+    """
+    def __init__(self):
+        self.background = None   # 預先合成的底圖 (白色背景 + 視窗內的地圖塊)
+        self._background_pos = None # 合成底圖時視窗左上角的世界座標
+        self._full_redraw = True # 下一幀是否需要重畫整個畫面
+        self._moving_rects = []  # 上一幀移動物件與 HUD 佔用的區域
+        self._plant_rects = {}   # 畫面上目前的植物 -> 它佔用的區域
+        self.profiler = None     # 選用的 FrameProfiler，記錄 pygame.display.update 的耗時
+
+    def _present(self, rects=None):
+        """把畫面交給 pygame.display.update (rects 為 None 時更新整個螢幕)。"""
+        start = time.perf_counter()
+        if rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+        if self.profiler is not None:
+            self.profiler.add("display", time.perf_counter() - start)
+
+    def invalidate_background(self):
+        """地圖網格重建後呼叫，下一幀會重新合成底圖。"""
+        self.background = None
+        self._full_redraw = True
+
+    def request_full_redraw(self):
+        """畫面被其他畫面 (例如開始畫面) 蓋掉後呼叫，下一幀會重畫整個畫面。"""
+        self._full_redraw = True
+
+    def _bake_background(self, game_state, camera):
+        screen = game_state.screen
+        # 底圖只有視窗大小 (與螢幕相同的像素格式，blit 最快)，大地圖也不會佔用大量記憶體
+        background = pygame.Surface(screen.get_size(), 0, screen)
+        background.fill((255, 255, 255)) # 填充白色背景
+        background.blits(tile_blit_items(game_state, camera), doreturn=False)
+        self.background = background
+        self._background_pos = camera.rect.topleft if camera is not None else (0, 0)
+
+    @staticmethod
+    def _visible_plants(game_state, camera):
+        """視窗內活著的植物與它在螢幕上的矩形。"""
+        plants = [(plant, plant.rect) for plant in game_state.plants if plant.live]
+        if camera is None:
+            return plants
+        view = camera.rect
+        return [(plant, rect.move(-view.x, -view.y)) for plant, rect in plants if view.colliderect(rect)]
+
+    def _moving_blit_items(self, game_state, alpha, camera):
+        """子彈與殭屍的 (圖片, 位置)，子彈在下、殭屍在上。"""
+        return bullet_blit_items(game_state, alpha, camera) + zombie_blit_items(game_state, alpha, camera)
+
+    def draw(self, game_state, hud_items, alpha=1.0, camera=None):
+        """
+        繪製一幀並更新顯示。
+        hud_items: HUD 文字的 (surface, 位置) 列表，畫在最上層。
+        alpha: 子彈與殭屍在上一個 tick 與目前位置之間內插的比例 (1 表示畫在目前位置)。
+        camera: 選用的 Camera，只畫視窗內的地圖塊與物件；視窗捲動後整個畫面重畫。
+        """
+        screen = game_state.screen
+        view_pos = camera.rect.topleft if camera is not None else (0, 0)
+        if self.background is None or self._background_pos != view_pos:
+            self._bake_background(game_state, camera)
+            self._full_redraw = True
+        plants = self._visible_plants(game_state, camera)
+
+        if self._full_redraw:
+            screen.blit(self.background, (0, 0))
+            rects = screen.blits([(plant.image, rect) for plant, rect in plants])
+            self._plant_rects = {plant: rect for (plant, _), rect in zip(plants, rects)}
+            self._moving_rects = screen.blits(self._moving_blit_items(game_state, alpha, camera) + hud_items)
+            self._present() # 更新整個螢幕顯示
+            self._full_redraw = False
+            return
+
+        # 需要用底圖重畫的區域：上一幀移動物件與 HUD 的位置、消失的植物、新種的植物
+        dirty = list(self._moving_rects)
+        current = {plant for plant, _ in plants}
+        for plant in [plant for plant in self._plant_rects if plant not in current]:
+            dirty.append(self._plant_rects.pop(plant))
+        for plant, rect in plants:
+            if plant not in self._plant_rects:
+                self._plant_rects[plant] = rect.copy()
+                dirty.append(rect.copy())
+
+        # 逐一把區域還原成底圖，再補畫與它重疊的植物 (只畫重疊的部分，半透明邊緣才不會重複疊色)
+        background = self.background
+        plant_rects = [rect for _, rect in plants]
+        for rect in dirty:
+            screen.blit(background, rect, rect)
+            for index in rect.collidelistall(plant_rects):
+                plant_rect = plant_rects[index]
+                clip = rect.clip(plant_rect)
+                screen.blit(plants[index][0].image, clip, clip.move(-plant_rect.x, -plant_rect.y))
+
+        # 最後畫出子彈、殭屍與 HUD，記錄位置供下一幀清除
+        self._moving_rects = screen.blits(self._moving_blit_items(game_state, alpha, camera) + hud_items)
+        dirty.extend(self._moving_rects)
+
+        if len(dirty) > GameConfig.DIRTY_RECT_LIMIT:
+            self._present() # 區域太多時，整個螢幕一次更新反而比較快
+        else:
+            self._present(dirty)
@@ -0,0 +1,82 @@
+# replay.py
+
+import argparse
+import json
+import os
+import time
+from game_config import GameConfig
+from simulation import run_headless
+
+REPLAY_VERSION = 1
+
+class InputRecorder:
+    """
+    記錄一局遊戲的輸入：隨機種子，以及每次成功種植的 (tick, 格 x, 格 y, 植物種類)。
+    殭屍生成只依賴種子，所以這些資料就足以在無頭模式下重現整局。
+    """
+    def __init__(self, seed):
+        self.seed = seed
+        self.placements = []
+
+    def record(self, tick, grid_x, grid_y, plant_kind):
+        """記錄一次種植 (tick 是種植後下一個要執行的遊戲更新編號)。"""
+        self.placements.append([tick, grid_x, grid_y, plant_kind])
+
+    def to_dict(self, game_state):
+        """連同這一局的最終結果 (tick 數、得分、關卡) 轉成可存成 JSON 的字典。"""
+        return {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "placements": self.placements,
+            "ticks": game_state.tick,
+            "score": game_state.score,
+            "level": game_state.current_level,
+        }
+
+    def save(self, game_state, directory=None):
+        """把紀錄存到 directory (預設 GameConfig.REPLAY_DIR)，回傳檔案路徑。"""
+        directory = directory or GameConfig.REPLAY_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"replay_{time.strftime('%Y%m%d_%H%M%S')}_{self.seed}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(game_state), f, separators=(",", ":"))
+        return path
+
+
+def load_replay(path):
+    """讀取回放檔，回傳字典。"""
+    with open(path, encoding="utf-8") as f:
+        replay = json.load(f)
+    if replay.get("version") != REPLAY_VERSION:
+        raise ValueError(f"不支援的回放版本: {replay.get('version')}")
+    return replay
+
+
+def run_replay(replay):
+    """
+    以無頭模式、最快速度重新執行回放，並比對最終的 tick 數、得分與關卡。
+    回傳 (是否一致, run_headless 的結果)。
+    """
+    placements = [tuple(item) for item in replay["placements"]]
+    result = run_headless(replay["ticks"], placements, seed=replay["seed"], quiet=True)
+    matched = (result["ticks"] == replay["ticks"] and result["score"] == replay["score"]
+               and result["level"] == replay["level"])
+    return matched, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="在無頭模式下重新執行回放檔，並檢查最終得分與關卡。")
+    parser.add_argument("replays", nargs="+", help="回放檔 (.json)")
+    args = parser.parse_args()
+
+    failed = 0
+    for path in args.replays:
+        replay = load_replay(path)
+        matched, result = run_replay(replay)
+        status = "一致" if matched else "不一致"
+        print(f"{path}: {status} (種子 {replay['seed']}，{result['ticks']} 次更新，耗時 {result['elapsed']:.3f} 秒)")
+        if not matched:
+            failed += 1
+            print(f"  紀錄: tick {replay['ticks']}，得分 {replay['score']}，關卡 {replay['level']}")
+            print(f"  重播: tick {result['ticks']}，得分 {result['score']}，關卡 {result['level']}")
+    raise SystemExit(1 if failed else 0)
@@ -2,12 +2,235 @@
 
 import pygame
 import os
+import threading
+from collections import OrderedDict
+from game_config import GameConfig
+from asset_cache import AssetCache
+
+def surface_bytes(surface):
+    """surface 像素資料的大約位元組數。"""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+def sound_bytes(sound):
+    """Sound 的 PCM 資料大約位元組數 (依 mixer 的取樣率、位元數與聲道數估算)。"""
+    mixer_format = pygame.mixer.get_init()
+    if mixer_format is None:
+        return 0
+    frequency, size, channels = mixer_format
+    return int(sound.get_length() * frequency) * (abs(size) // 8) * channels
+
+class ResourceCache:
+    """
+    有記憶體預算的 LRU 快取：每筆資料記錄大約的位元組數，總量超過 max_bytes
+    (或筆數超過 max_entries) 時，從最久沒用到的開始淘汰；釘選 (pin) 的鍵不會被淘汰。
+    剛放入的那一筆也不會被淘汰，所以單一筆超過預算時總量會暫時超出。
+    """
+    def __init__(self, max_bytes, sizer, max_entries=None, pinned=()):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.sizer = sizer # 計算一筆資料位元組數的函式
+        self.pinned = set(pinned) # 可以在資料載入前就先釘選
+        self._entries = OrderedDict() # 鍵 -> (資料, 位元組數)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """取得快取的資料，沒有則回傳 None。"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key) # 標記為最近使用
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, size=None):
+        """放入一筆資料 (size 為 None 時用 sizer 計算)，並在超過預算時淘汰舊資料。"""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        size = self.sizer(value) if size is None else size
+        self._entries[key] = (value, size)
+        self.bytes += size
+        self._evict(key)
+
+    def _evict(self, keep):
+        over_entries = self.max_entries is not None and len(self._entries) > self.max_entries
+        if not over_entries and self.bytes <= self.max_bytes:
+            return
+        for key in list(self._entries): # 由最久沒用到的開始
+            if key == keep or key in self.pinned:
+                continue
+            self.bytes -= self._entries.pop(key)[1]
+            self.evictions += 1
+            over_entries = self.max_entries is not None and len(self._entries) > self.max_entries
+            if not over_entries and self.bytes <= self.max_bytes:
+                break
+
+    def pin(self, key):
+        """釘選一個鍵，讓它永遠不會被淘汰。"""
+        self.pinned.add(key)
+
+    def unpin(self, key):
+        self.pinned.discard(key)
+        self._evict(None) # 解除釘選後可能已經超出預算
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """回傳快取統計 (位元組數、筆數、命中、未命中、淘汰次數)。"""
+        return {"bytes": self.bytes, "entries": len(self._entries), "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
 
 class ResourceManager:
-    _images = {} # 用於快取已載入的圖片
-    _fonts = {}  # 用於快取已載入的字體
-    _sounds = {} # 新增：用於快取已載入的音效
+    # 已載入的圖片、字體、音效與已渲染的文字 surface，各自有記憶體預算 (GameConfig.*_CACHE_BYTES)
+    _images = ResourceCache(GameConfig.IMAGE_CACHE_BYTES, surface_bytes, pinned=GameConfig.PINNED_IMAGES)
+    _fonts = ResourceCache(GameConfig.FONT_CACHE_BYTES, None)
+    _sounds = ResourceCache(GameConfig.SOUND_CACHE_BYTES, sound_bytes, pinned=GameConfig.PINNED_SOUNDS)
+    _texts = ResourceCache(GameConfig.TEXT_CACHE_BYTES, surface_bytes, max_entries=GameConfig.TEXT_CACHE_SIZE)
+    # 背景預載：("image"/"sound", 檔名) -> 解碼完成時設定的 threading.Event
+    _preload_events = {}
+    _preload_results = {} # 背景執行緒解碼完成、還沒交給主執行緒的資料 (None 表示解碼失敗)
+    _preload_lock = threading.Lock()
+    # 已解碼資源的磁碟快取 (GameConfig.USE_ASSET_CACHE)，之後啟動時不需要再解碼 PNG 與 mp3
+    _disk_cache = AssetCache(GameConfig.ASSET_CACHE_DIR) if GameConfig.USE_ASSET_CACHE else None
+
+    @staticmethod
+    def _decode_image(full_path):
+        """解碼圖片 (有磁碟快取時優先從快取建立)，尚未轉換像素格式。"""
+        if ResourceManager._disk_cache is not None:
+            return ResourceManager._disk_cache.load_image(full_path)
+        return pygame.image.load(full_path)
+
+    @staticmethod
+    def _decode_sound(full_path):
+        """解碼音效 (有磁碟快取時優先從快取建立)。"""
+        if ResourceManager._disk_cache is not None:
+            return ResourceManager._disk_cache.load_sound(full_path)
+        return pygame.mixer.Sound(full_path)
+
+    @staticmethod
+    def start_preload(manifest=None):
+        """
+        依清單 (預設 GameConfig.ASSET_MANIFEST) 在背景執行緒解碼所有圖片與音效。
+        已經載入或已在預載中的資源會略過；沒有初始化 mixer 時不預載音效。
+        """
+        manifest = manifest or GameConfig.ASSET_MANIFEST
+        jobs = []
+        for kind, names in (("image", manifest.get("images", ())), ("sound", manifest.get("sounds", ()))):
+            if kind == "sound" and not pygame.mixer.get_init():
+                continue
+            cache = ResourceManager._images if kind == "image" else ResourceManager._sounds
+            for name in names:
+                key = (kind, name)
+                if name not in cache and key not in ResourceManager._preload_events:
+                    ResourceManager._preload_events[key] = threading.Event()
+                    jobs.append(key)
+        if jobs:
+            threading.Thread(target=ResourceManager._preload_worker, args=(jobs,), name="asset-preload",
+                             daemon=True).start()
+
+    @staticmethod
+    def _preload_worker(jobs):
+        """背景執行緒：依序解碼檔案 (只解碼，像素格式轉換留給主執行緒)。"""
+        for kind, name in jobs:
+            try:
+                if kind == "image":
+                    result = ResourceManager._decode_image(os.path.join("imgs", name))
+                else:
+                    result = ResourceManager._decode_sound(os.path.join("sounds", name))
+            except (pygame.error, OSError):
+                result = None # 交給主執行緒照原本的流程載入，並在那裡顯示錯誤
+            with ResourceManager._preload_lock:
+                ResourceManager._preload_results[(kind, name)] = result
+            ResourceManager._preload_events[(kind, name)].set()
 
+    @staticmethod
+    def preload_progress():
+        """回傳 (已解碼數量, 預載總數)。"""
+        events = list(ResourceManager._preload_events.values())
+        return sum(event.is_set() for event in events), len(events)
+
+    @staticmethod
+    def wait_ready(kind, name, timeout=None):
+        """
+        等待單一資源解碼完成 (kind 為 "image" 或 "sound")。
+        不在預載清單中的資源直接回傳 True；逾時回傳 False。
+        """
+        event = ResourceManager._preload_events.get((kind, name))
+        return event is None or event.wait(timeout)
+
+    @staticmethod
+    def _take_preloaded(kind, name):
+        """取出預載的結果 (還在解碼就等它完成)；沒有預載或解碼失敗時回傳 None。"""
+        if not ResourceManager.wait_ready(kind, name):
+            return None
+        with ResourceManager._preload_lock:
+            return ResourceManager._preload_results.pop((kind, name), None)
+
+    @staticmethod
+    def finish_ready_preloads():
+        """
+        在主執行緒把已經解碼完成的資源放進快取 (圖片在這裡轉換像素格式)，不會等待還在解碼的資源。
+        回傳 (已解碼數量, 預載總數)，可在開始畫面每幀呼叫並顯示進度。
+        """
+        with ResourceManager._preload_lock:
+            ready = list(ResourceManager._preload_results)
+        for kind, name in ready:
+            if kind == "image":
+                ResourceManager.load_image(name)
+            else:
+                ResourceManager.load_sound(name)
+        return ResourceManager.preload_progress()
+
+
+    # 選擇 colorkey 時依序嘗試的顏色 (必須是圖片不透明部分沒有用到的顏色)
+    COLORKEY_CANDIDATES = ((255, 0, 255), (0, 255, 0), (1, 2, 3), (254, 1, 253))
+
+    @staticmethod
+    def optimize_surface(image):
+        """
+        依圖片的 alpha 通道選擇 blit 最快的像素格式 (需要已經建立視窗)，回傳 (surface, 格式名稱)：
+        - 沒有 alpha 通道或完全不透明：convert()，不透明 blit 最快
+        - alpha 只有 0 與 255：convert() 加上 colorkey 與 RLE 加速
+        - 有半透明像素：convert_alpha()
+        """
+        if not image.get_flags() & pygame.SRCALPHA:
+            return image.convert(), "opaque"
+        pixel_count = image.get_width() * image.get_height()
+        opaque_mask = pygame.mask.from_surface(image, 254) # alpha 為 255 的像素
+        if opaque_mask.count() == pixel_count:
+            return image.convert(), "opaque"
+        if pygame.mask.from_surface(image, 0).count() == opaque_mask.count(): # 沒有半透明的像素
+            for key in ResourceManager.COLORKEY_CANDIDATES:
+                # 不透明的像素中不能有顏色剛好等於 colorkey 的
+                same_color = pygame.mask.from_threshold(image, key + (255,), (1, 1, 1, 255))
+                if same_color.overlap_area(opaque_mask, (0, 0)) == 0:
+                    keyed = pygame.Surface(image.get_size()).convert()
+                    keyed.fill(key)
+                    keyed.blit(image, (0, 0)) # 完全透明的像素保留 colorkey 的顏色
+                    keyed.set_colorkey(key, pygame.RLEACCEL)
+                    return keyed, "colorkey"
+        return image.convert_alpha(), "alpha"
+
+    @staticmethod
+    def _prepare_image(image):
+        """轉換成顯示用的像素格式；無頭模擬時沒有視窗，無法也不需要轉換。"""
+        if pygame.display.get_surface() is None:
+            return image
+        if GameConfig.OPTIMIZE_IMAGE_FORMAT:
+            return ResourceManager.optimize_surface(image)[0]
+        return image.convert_alpha() # .convert_alpha() 讓圖片背景透明度正確顯示
 
     @staticmethod
     def load_image(image_name):
@@ -15,21 +238,30 @@ class ResourceManager:
         載入圖片並將其快取。
         image_name: 圖片檔案名 (例如 'sunflower.png')。圖片應放在 'imgs/' 資料夾內。
         """
-        if image_name not in ResourceManager._images:
+        image = ResourceManager._images.get(image_name)
+        if image is None:
+            # 已在背景預載的圖片只需要在主執行緒轉換像素格式
+            image = ResourceManager._take_preloaded("image", image_name)
+            if image is not None:
+                image = ResourceManager._prepare_image(image)
+                ResourceManager._images.put(image_name, image)
+                return image
             full_path = os.path.join("imgs", image_name) # 圖片路徑
             try:
-                # .convert_alpha() 讓圖片背景透明度正確顯示
-                image = pygame.image.load(full_path).convert_alpha() 
-                ResourceManager._images[image_name] = image
+                image = ResourceManager._decode_image(full_path)
+                # 依 alpha 通道轉換成 blit 最快的像素格式
+                image = ResourceManager._prepare_image(image)
+                ResourceManager._images.put(image_name, image)
                 return image
             except pygame.error as e:
                 print(f"錯誤: 無法載入圖片 {full_path}: {e}")
                 # 如果圖片載入失敗，返回一個洋紅色的方塊作為佔位符
                 placeholder_image = pygame.Surface((80, 80)) # 假設標準尺寸
                 placeholder_image.fill((255, 0, 255)) 
-                ResourceManager._images[image_name] = placeholder_image
+                placeholder_image = ResourceManager._prepare_image(placeholder_image)
+                ResourceManager._images.put(image_name, placeholder_image)
                 return placeholder_image
-        return ResourceManager._images[image_name]
+        return image
 
     @staticmethod
     def load_font(font_path, size):
@@ -39,18 +271,54 @@ class ResourceManager:
         size: 字體大小。
         """
         key = (font_path, size) # 用路徑和大小作為快取鍵
-        if key not in ResourceManager._fonts:
+        font = ResourceManager._fonts.get(key)
+        if font is None:
             try:
                 font = pygame.font.Font(font_path, size)
-                ResourceManager._fonts[key] = font
+                ResourceManager._fonts.put(key, font, GameConfig.FONT_SIZE_BYTES)
                 return font
             except FileNotFoundError:
                 print(f"錯誤: 無法載入字體 {font_path}，將使用系統預設字體。")
                 # 如果字體檔案找不到，使用系統預設字體
                 font = pygame.font.SysFont("Arial", size)
-                ResourceManager._fonts[key] = font
+                ResourceManager._fonts.put(key, font, GameConfig.FONT_SIZE_BYTES)
                 return font
-        return ResourceManager._fonts[key]
+        return font
+
+    @staticmethod
+    def render_text(font_path, content, size, color, antialias=True):
+        """
+        渲染文字並將結果快取 (相同內容、大小、顏色、字體只渲染一次)。
+        回傳的 surface 會被共用，請勿直接修改。
+        """
+        key = (content, size, tuple(color), font_path, antialias)
+        text_surface = ResourceManager._texts.get(key)
+        if text_surface is None:
+            font = ResourceManager.load_font(font_path, size)
+            text_surface = font.render(content, antialias, color)
+            ResourceManager._texts.put(key, text_surface)
+        return text_surface
+
+    @staticmethod
+    def text_cache_stats():
+        """回傳文字快取的統計 (位元組數、筆數、命中、未命中、淘汰次數)。"""
+        return ResourceManager._texts.stats()
+
+    @staticmethod
+    def cache_stats():
+        """回傳圖片、字體、音效與文字快取各自的統計。"""
+        return {"images": ResourceManager._images.stats(), "fonts": ResourceManager._fonts.stats(),
+                "sounds": ResourceManager._sounds.stats(), "texts": ResourceManager._texts.stats()}
+
+    @staticmethod
+    def pin_image(image_name):
+        """釘選圖片，讓它不會因為超出記憶體預算而被淘汰。"""
+        ResourceManager._images.pin(image_name)
+
+    @staticmethod
+    def pin_sound(sound_name):
+        """釘選音效，讓它不會因為超出記憶體預算而被淘汰。"""
+        ResourceManager._sounds.pin(sound_name)
     
     @staticmethod
     def load_sound(sound_name):
@@ -58,16 +326,21 @@ class ResourceManager:
         載入音效並將其快取。
         sound_name: 音效檔案名 (例如 'zombie_horde.mp3')。音效應放在 'sounds/' 資料夾內。
         """
-        if sound_name not in ResourceManager._sounds:
+        sound = ResourceManager._sounds.get(sound_name)
+        if sound is None:
+            sound = ResourceManager._take_preloaded("sound", sound_name) # 已在背景預載的音效
+            if sound is not None:
+                ResourceManager._sounds.put(sound_name, sound)
+                return sound
             full_path = os.path.join("sounds", sound_name) # 音效路徑
             try:
-                sound = pygame.mixer.Sound(full_path)
-                ResourceManager._sounds[sound_name] = sound
+                sound = ResourceManager._decode_sound(full_path)
+                ResourceManager._sounds.put(sound_name, sound)
                 return sound
             except pygame.error as e:
                 print(f"錯誤: 無法載入音效 {full_path}: {e}")
                 return None # 載入失敗返回 None
-        return ResourceManager._sounds[sound_name]
+        return sound
 
     @staticmethod
     def play_music(music_name, loops=-1):
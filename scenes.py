@@ -0,0 +1,209 @@
+# scenes.py
+
+import sys
+import pygame
+from game_config import GameConfig
+from resources import ResourceManager
+
+class Scene:
+    """
+    開始畫面、規則說明、遊戲結束等等待輸入的畫面。
+    不變的內容在第一次顯示時由 compose 合成一張 surface 並快取，之後每次顯示只需要 blit 一次；
+    等待輸入時由 SceneManager 以 pygame.event.wait 阻塞，沒有事件時不佔用 CPU。
+    """
+    EXIT = object() # handle_event 回傳這個值時結束 SceneManager.run
+
+    def __init__(self, font_path):
+        self.font_path = font_path
+        self._surface = None # compose 的結果
+
+    @property
+    def idle_timeout(self):
+        """多久呼叫一次 on_idle (毫秒，持續有事件時也會呼叫)；0 表示不呼叫，一直等到有事件。"""
+        return 0
+
+    def _text(self, content, size, color):
+        return ResourceManager.render_text(self.font_path, content, size, color)
+
+    def compose(self):
+        """合成畫面中不變的部分 (子類別覆寫；預設是一張全黑、與視窗同大小的 surface)。"""
+        return pygame.Surface((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
+
+    def enter(self, screen):
+        """顯示畫面 (每次切換到這個畫面時呼叫)。"""
+        if self._surface is None:
+            self._surface = self.compose()
+        screen.blit(self._surface, (0, 0))
+        pygame.display.update()
+
+    def handle_event(self, event):
+        """處理一個事件：回傳 None 繼續等待、另一個畫面的名稱表示切換過去，或 Scene.EXIT。"""
+        return None
+
+    def on_idle(self, screen):
+        """距離上一次呼叫 (或進入畫面) 經過 idle_timeout 毫秒時呼叫。"""
+        pass
+
+class StartScene(Scene):
+    """開始畫面：點擊「規則說明」切換到規則畫面，點擊其他地方開始遊戲；背景預載時在右下角顯示進度。"""
+    PROGRESS_AREA = pygame.Rect(GameConfig.SCREEN_WIDTH - 260, GameConfig.SCREEN_HEIGHT - 40, 260, 40)
+
+    def __init__(self, font_path):
+        super().__init__(font_path)
+        self.role_rect = None # 「規則說明」文字的區域
+        self._shown_progress = None # 畫面上目前顯示的載入進度
+
+    @property
+    def idle_timeout(self):
+        # 還在預載時定期醒來更新進度，畫面顯示載入完成後 (或沒有預載) 一直等到有事件
+        total = ResourceManager.preload_progress()[1]
+        return 0 if total == 0 or self._shown_progress == (total, total) else GameConfig.SCENE_IDLE_TIMEOUT_MS
+
+    def compose(self):
+        # start.png 只縮放一次，畫到不透明的底圖上 (蓋掉進度文字時才能完全覆蓋)
+        surface = pygame.Surface((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
+        surface.blit(pygame.transform.scale(ResourceManager.load_image("start.png"),
+                                            (GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT)), (0, 0))
+        # 「點擊任意處開始遊戲」的提示文字，居中偏上一些
+        tip_text = self._text("點擊任意處開始遊戲", 25, (0, 0, 0))
+        surface.blit(tip_text, tip_text.get_rect(center=(GameConfig.SCREEN_WIDTH // 2 + 75, GameConfig.SCREEN_HEIGHT // 2 - 15)))
+        # 「規則說明」文字在提示文字下方
+        role_text = self._text("規則說明", 25, (255, 255, 255))
+        self.role_rect = role_text.get_rect(center=(GameConfig.SCREEN_WIDTH // 2 - 67, GameConfig.SCREEN_HEIGHT // 2 + 127))
+        surface.blit(role_text, self.role_rect)
+        return surface
+
+    def enter(self, screen):
+        super().enter(screen)
+        self._shown_progress = None # 進度文字被蓋掉了，需要重畫
+        self.on_idle(screen)
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            return "rules" if self.role_rect.collidepoint(event.pos) else Scene.EXIT
+        return None
+
+    def on_idle(self, screen):
+        """把解碼好的資源交給主執行緒完成載入，並在右下角顯示進度。"""
+        progress = ResourceManager.finish_ready_preloads()
+        if progress[1] == 0 or progress == self._shown_progress:
+            return
+        self._shown_progress = progress
+        done, total = progress
+        text = "資源載入完成" if done == total else f"資源載入中... {done}/{total}"
+        area = StartScene.PROGRESS_AREA
+        screen.blit(self._surface, area, area) # 先蓋掉上一次的進度文字
+        text_surface = self._text(text, 18, (0, 0, 0))
+        screen.blit(text_surface, text_surface.get_rect(bottomright=(area.right - 10, area.bottom - 10)))
+        pygame.display.update(area)
+
+class RulesScene(Scene):
+    """規則說明：點擊任意處返回開始畫面。"""
+    RULES_LINES = (
+        "遊戲規則:",
+        "1. 左鍵點擊空地種植向日葵($30)，向日葵會產錢。",
+        "2. 右鍵點擊空地種植豌豆射手($50)，豌豆射手會攻擊殭屍。",
+        "3. 殭屍會從右邊出現，向左移動。",
+        "4. 如果殭屍突破防線，遊戲結束。",
+        "5. 消滅殭屍可得分，達到一定分數進入下一關。",
+        "6. 按 'Q' 鍵隨時結束遊戲。",
+        "7. 按 'F' 鍵切換遊戲速度 (1x / 2x / 4x / 不限速)，按 'P' 鍵顯示效能資訊。",
+        "8. 地圖比視窗大時，按方向鍵捲動畫面。",
+        "",
+        "點擊任意處返回主畫面...",
+    )
+
+    def compose(self):
+        surface = pygame.Surface((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
+        surface.fill((0, 0, 50)) # 深藍色背景
+        y_offset = 150
+        for line in RulesScene.RULES_LINES:
+            rule_text = self._text(line, 22, (255, 255, 255)) # 白色文字
+            surface.blit(rule_text, rule_text.get_rect(center=(GameConfig.SCREEN_WIDTH // 2, y_offset)))
+            y_offset += 30 # 每行間距
+        return surface
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            return "start"
+        return None
+
+class GameOverScene(Scene):
+    """遊戲結束畫面 (勝利或失敗)：兩種底圖各合成一次，每次顯示只另外畫上分數。點擊任意處結束。"""
+    def __init__(self, font_path):
+        super().__init__(font_path)
+        self.won = False
+        self.score = 0
+        self._surfaces = {} # 是否勝利 -> 合成好的底圖
+
+    def show(self, won, score):
+        """設定下一次顯示的結果。"""
+        self.won = won
+        self.score = score
+
+    def compose(self):
+        if self.won:
+            surface = ResourceManager.load_image("CLEAR.png").copy()
+            surface.blit(self._text('回主頁', 25, (0, 0, 0)), (360, 410))
+        else:
+            surface = ResourceManager.load_image("GAMEOVER.png").copy()
+            surface.blit(self._text('重新', 50, (255, 255, 255)), (525, 360))
+        return surface
+
+    def enter(self, screen):
+        self._surface = self._surfaces.get(self.won)
+        if self._surface is None:
+            self._surface = self._surfaces[self.won] = self.compose()
+        screen.blit(self._surface, (0, 0))
+        score_pos = (300, 320) if self.won else (500, 270)
+        screen.blit(self._text(f'你的分數: {self.score}', 30, (255, 255, 255)), score_pos)
+        pygame.display.update()
+        pygame.time.wait(1000) # 結果至少顯示一秒 (這段時間的點擊仍會在之後處理)
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            return Scene.EXIT
+        return None
+
+class SceneManager:
+    """
+    畫面狀態機：run 從指定的畫面開始，依 handle_event 的回傳值切換畫面，直到回傳 Scene.EXIT。
+    等待時呼叫 pygame.event.wait (有 idle_timeout 時最多等到下一次該呼叫 on_idle)，不像 pygame.event.get 迴圈會空轉。
+    on_idle 依經過的時間呼叫，不是等到沒有事件才呼叫，持續移動滑鼠等連續的事件不會讓它停擺。
+    """
+    def __init__(self, screen):
+        self.screen = screen
+        self.scenes = {} # 名稱 -> Scene
+
+    def add(self, name, scene):
+        self.scenes[name] = scene
+        return scene
+
+    def run(self, name):
+        """顯示名稱為 name 的畫面並處理事件，直到某個畫面結束 run；關閉視窗時結束程式。"""
+        scene = self.scenes[name]
+        scene.enter(self.screen)
+        last_idle = pygame.time.get_ticks() # 上一次呼叫 on_idle (或進入畫面) 的時間
+        while True:
+            timeout = scene.idle_timeout
+            if timeout:
+                elapsed = pygame.time.get_ticks() - last_idle
+                if elapsed >= timeout:
+                    scene.on_idle(self.screen)
+                    last_idle = pygame.time.get_ticks()
+                    continue
+                timeout -= elapsed # 最多等到下一次該呼叫 on_idle
+            event = pygame.event.wait(timeout)
+            if event.type == pygame.NOEVENT: # 等待逾時，回到迴圈開頭呼叫 on_idle
+                continue
+            if event.type == pygame.QUIT:
+                ResourceManager.stop_music() # 退出時停止音樂
+                pygame.quit()
+                sys.exit()
+            result = scene.handle_event(event)
+            if result is Scene.EXIT:
+                return
+            if result is not None:
+                scene = self.scenes[result]
+                scene.enter(self.screen)
+                last_idle = pygame.time.get_ticks()
@@ -0,0 +1,283 @@
+# server.py
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import time
+
+# 伺服器不開視窗也不出聲
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from game_config import GameConfig
+from game_state import GameState
+from simulation import GameSimulation
+
+# 通訊協定：每行一個 JSON 物件 (UTF-8)。
+# 用戶端 -> 伺服器：
+#   {"op": "new", "seed": 種子 (選填)}            建立這條連線的遊戲 (每條連線一局)
+#   {"op": "place", "x": 格x, "y": 格y, "kind": "sunflower"|"peashooter"}  下一個 tick 更新前種植
+#   {"op": "stats"}                              查詢伺服器統計
+# 伺服器 -> 用戶端：
+#   {"op": "joined", "session": 編號, "seed": 種子, "rows": 行數, "columns": 列數}
+#   {"op": "delta", "t": tick, ...}              狀態差異，只包含與上一次送出時不同的欄位 (見 GameSession.delta)；
+#       殭屍與子彈以穩定的編號表示：{"add": [編號, x, y, ...], "move": [[dx, dy, 編號, ...], ...], "remove": [編號, ...]}，
+#       move 依位移分組 (同一組的實體都移動 dx, dy)，沒有變化的部分省略；
+#       帶有 "reset": true 時用戶端先清空這種實體再套用 add
+#   {"op": "stats", ...} / {"op": "error", "message": 訊息}
+
+_PLANT_KINDS = {plant_class: kind for kind, plant_class in GameSimulation.PLANT_TYPES.items()}
+
+class EntityDelta:
+    """
+    一種實體 (殭屍或子彈) 的差異：記住用戶端知道的位置，只送出新增、移除與移動的實體。
+    同種實體每個 tick 的移動距離大多相同，移動依位移分組，每個移動的實體只需要送出編號。
+    """
+    def __init__(self):
+        self._sent = {}   # 編號 -> 上一次送出的 (x, y)
+        self._reset = True # 下一次送出時用戶端需要先清空
+
+    def resync(self):
+        self._sent = {}
+        self._reset = True
+
+    def delta(self, entities):
+        """entities: 目前活著的 (編號, x, y)。回傳差異的 dict，沒有任何變化時回傳 None。"""
+        sent = self._sent
+        current = {}
+        added = []
+        moved = {} # (dx, dy) -> [dx, dy, 編號, ...]
+        for entity_id, x, y in entities:
+            current[entity_id] = (x, y)
+            old = sent.get(entity_id)
+            if old is None:
+                added.extend((entity_id, x, y))
+            elif old[0] != x or old[1] != y:
+                offset = (x - old[0], y - old[1])
+                group = moved.get(offset)
+                if group is None:
+                    group = moved[offset] = list(offset)
+                group.append(entity_id)
+        removed = [entity_id for entity_id in sent if entity_id not in current]
+        self._sent = current
+        message = {}
+        if self._reset:
+            message["reset"] = True
+            self._reset = False
+        for name, values in (("add", added), ("move", list(moved.values())), ("remove", removed)):
+            if values:
+                message[name] = values
+        return message or None
+
+def _encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+class GameSession:
+    """
+    伺服器上的一局遊戲：擁有自己的 GameState 與 GameSimulation，由 GameServer 的共用排程器每個 tick 推進一次。
+    種植指令先排隊，在下一個 tick 更新前依序執行 (與無頭模擬的種植腳本相同)。
+    """
+    def __init__(self, session_id, seed=None):
+        self.session_id = session_id
+        game_state = GameState(seed)
+        game_state.quiet = True # 多局同時進行，不輸出升級等訊息
+        # 一般物件模式以物件本身辨認實體，所以不讓物件池把死掉的物件重新用在新的實體上
+        game_state.bullet_pool.max_size = game_state.zombie_pool.max_size = 0
+        self.simulation = GameSimulation(game_state)
+        self.simulation.init_map_grid()
+        self.simulation.init_zombies()
+        self.game_state = game_state
+        self.pending = [] # 等待執行的 (格 x, 格 y, 植物種類)
+        self._sent = {}   # 上一次送出的各欄位內容，用來計算差異
+        self._ids = itertools.count() # 一般物件模式的實體編號
+        self._object_ids = {}         # 實體物件 -> 編號 (只保留上一次送出時活著的)
+        self._entities = {"zombies": EntityDelta(), "bullets": EntityDelta()}
+
+    def step(self):
+        """執行排隊的種植並推進一個 tick (對應 GameManager._update_game_state 的遊戲邏輯部分)。"""
+        for grid_x, grid_y, plant_kind in self.pending:
+            self.simulation.place_plant(grid_x, grid_y, plant_kind)
+        self.pending.clear()
+        wave_spawned = self.simulation.update()
+        if wave_spawned and not self.game_state.first_zombie_wave_sound_played:
+            self.game_state.first_zombie_wave_sound_played = True
+
+    def _live_entities(self):
+        """
+        目前活著的殭屍與子彈，各自是 (編號, x, y) 的列表。陣列儲存區使用生成時配發的 serial；
+        一般物件模式的物件不會被重複使用 (見 __init__)，同一個物件就是同一個實體。
+        """
+        game_state = self.game_state
+        object_ids = {}
+        entities = {}
+        for kind, objects in (("zombies", game_state.zombies), ("bullets", game_state.bullets)):
+            items = []
+            for entity in objects:
+                if entity.live:
+                    entity_id = self._object_ids.get(entity)
+                    if entity_id is None:
+                        entity_id = next(self._ids)
+                    object_ids[entity] = entity_id
+                    items.append((entity_id, entity.x, entity.y))
+            entities[kind] = items
+        self._object_ids = object_ids
+        store = game_state.entity_store
+        if store is not None:
+            for kind, columns in (("zombies", store.zombies), ("bullets", store.bullets)):
+                live = columns["live"]
+                entities[kind].extend(zip(columns["serial"][live].tolist(), columns["x"][live].tolist(),
+                                          columns["y"][live].tolist()))
+        return entities
+
+    def _fields(self):
+        """目前狀態中整個比較的欄位：數值，以及植物 [格x, 格y, 種類] 的列表。"""
+        game_state = self.game_state
+        tile_size = GameConfig.TILE_SIZE
+        return {
+            "money": game_state.money,
+            "score": game_state.score,
+            "level": game_state.current_level,
+            "over": game_state.game_over,
+            "plants": [[plant.x // tile_size, plant.y // tile_size, _PLANT_KINDS[type(plant)]]
+                       for plant in game_state.plants if plant.live],
+        }
+
+    def delta(self):
+        """
+        回傳這一次要送出的差異訊息：tick、與上一次送出時不同的欄位，
+        以及殭屍與子彈中新增、移除或移動的實體 (EntityDelta)。
+        """
+        message = {"op": "delta", "t": self.game_state.tick}
+        for name, value in self._fields().items():
+            if self._sent.get(name) != value:
+                message[name] = value
+                self._sent[name] = value
+        for kind, entities in self._live_entities().items():
+            changes = self._entities[kind].delta(entities)
+            if changes is not None:
+                message[kind] = changes
+        return message
+
+    def resync(self):
+        """下一次送出完整狀態 (上一則訊息因為用戶端太慢而沒有送出時)。"""
+        self._sent.clear()
+        for entities in self._entities.values():
+            entities.resync()
+
+class GameServer:
+    """
+    在一個行程中同時執行多局無頭遊戲的 asyncio 伺服器。
+    所有 session 共用一個固定步長的 tick 排程器 (GameConfig.TICK_RATE)，落後時最多補跑
+    MAX_CATCH_UP_TICKS 個 tick，其餘直接捨棄 (與 GameManager 相同)；每 SERVER_DELTA_INTERVAL 個 tick 送出一次狀態差異。
+    """
+    def __init__(self):
+        self.sessions = {} # 編號 -> (GameSession, StreamWriter)
+        self._ids = itertools.count(1)
+        self.ticks = 0         # 排程器已執行的 tick 數
+        self.tick_seconds = 0.0 # 所有 session 推進與送出差異累計的秒數
+        self.dropped_ticks = 0 # 來不及補跑而捨棄的 tick 數
+        self.skipped_deltas = 0 # 用戶端接收太慢而略過的差異訊息數
+
+    async def handle_client(self, reader, writer):
+        """一條連線：讀取指令直到斷線，斷線時移除這條連線的 session。"""
+        session = None
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError: # 一行超過 StreamReader 的長度上限，之後的資料已無法分行，中斷這條連線
+                    writer.write(_encode({"op": "error", "message": "指令太長"}))
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    op = request["op"]
+                    if op == "new" and session is None:
+                        session = GameSession(next(self._ids), request.get("seed"))
+                        self.sessions[session.session_id] = (session, writer)
+                        writer.write(_encode({"op": "joined", "session": session.session_id,
+                                              "seed": session.game_state.seed,
+                                              "rows": GameConfig.BOARD_ROWS, "columns": GameConfig.BOARD_COLUMNS}))
+                    elif op == "place" and session is not None:
+                        if request["kind"] not in GameSimulation.PLANT_TYPES:
+                            raise ValueError(f"未知的植物種類 {request['kind']}")
+                        session.pending.append((int(request["x"]), int(request["y"]), request["kind"]))
+                    elif op == "stats":
+                        writer.write(_encode(self.stats()))
+                    else:
+                        writer.write(_encode({"op": "error", "message": f"無法處理的指令: {op}"}))
+                except (ValueError, KeyError, TypeError) as e:
+                    writer.write(_encode({"op": "error", "message": f"格式錯誤的指令: {e}"}))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if session is not None:
+                self.sessions.pop(session.session_id, None)
+            writer.close()
+
+    def tick_all(self):
+        """所有 session 推進一個 tick，每 SERVER_DELTA_INTERVAL 個 tick 送出差異。"""
+        start = time.perf_counter()
+        send = self.ticks % GameConfig.SERVER_DELTA_INTERVAL == 0
+        for session, writer in list(self.sessions.values()):
+            if session.game_state.game_over:
+                continue # 結束的遊戲不再推進 (結束時的狀態已經送出)
+            session.step()
+            if send or session.game_state.game_over:
+                if writer.transport.get_write_buffer_size() > GameConfig.SERVER_MAX_BUFFER_BYTES:
+                    session.resync() # 用戶端跟不上，略過這一次，之後送完整狀態
+                    self.skipped_deltas += 1
+                else:
+                    writer.write(_encode(session.delta()))
+        self.ticks += 1
+        self.tick_seconds += time.perf_counter() - start
+
+    async def run_scheduler(self):
+        """固定步長的共用 tick 排程器。"""
+        loop = asyncio.get_running_loop()
+        tick_interval = 1.0 / GameConfig.TICK_RATE
+        next_tick = loop.time()
+        while True:
+            ticks = 0
+            while loop.time() >= next_tick and ticks < GameConfig.MAX_CATCH_UP_TICKS:
+                self.tick_all()
+                next_tick += tick_interval
+                ticks += 1
+            if loop.time() >= next_tick: # 補跑後仍然落後，捨棄剩下的進度
+                behind = int((loop.time() - next_tick) / tick_interval) + 1
+                self.dropped_ticks += behind
+                next_tick += behind * tick_interval
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    def stats(self):
+        """伺服器統計：session 數、已執行的 tick 數、每個 tick 平均耗時與捨棄的 tick/差異數。"""
+        return {
+            "op": "stats",
+            "sessions": len(self.sessions),
+            "ticks": self.ticks,
+            "tick_ms": self.tick_seconds / self.ticks * 1000 if self.ticks else 0.0,
+            "dropped_ticks": self.dropped_ticks,
+            "skipped_deltas": self.skipped_deltas,
+        }
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"遊戲伺服器啟動於 {host}:{port}")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.run_scheduler())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="多局無頭遊戲的 asyncio 伺服器 (每條連線一局)。")
+    parser.add_argument("--host", default=GameConfig.SERVER_HOST, help="監聽的位址")
+    parser.add_argument("--port", type=int, default=GameConfig.SERVER_PORT, help="監聽的連接埠")
+    args = parser.parse_args()
+    try:
+        asyncio.run(GameServer().serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("伺服器已停止。")
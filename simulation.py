@@ -0,0 +1,285 @@
+# simulation.py
+
+import argparse
+import json
+import time
+from game_config import GameConfig
+from game_state import GameState
+# 從 game_objects 套件導入遊戲邏輯需要的物件類別
+from game_objects import MapTile, Sunflower, PeaShooter
+
+class GameSimulation:
+    """
+    遊戲的純邏輯部分 (不開視窗、不播音效、不繪圖)。
+    GameManager 透過它更新遊戲狀態，無頭模擬也直接使用它。
+    """
+    # 植物種類名稱對應的類別 (名稱與 GameConfig.PLANT_PRICES 的鍵一致)
+    PLANT_TYPES = {"sunflower": Sunflower, "peashooter": PeaShooter}
+
+    def __init__(self, game_state=None, recorder=None):
+        self.game_state = game_state if game_state is not None else GameState()
+        self.recorder = recorder # 選用的 InputRecorder (replay.py)，記錄每次成功的種植
+        self.profiler = None # 選用的 FrameProfiler (profiler.py)，記錄各類實體更新的耗時
+
+    def init_map_grid(self):
+        """初始化地圖的邏輯網格點和實際地圖塊物件。"""
+        # 創建地圖的邏輯網格點 (例如：(0,1), (1,1)...)
+        # 遊戲區域從 y=1 行開始，共 GameConfig.BOARD_ROWS 行
+        for y_idx in range(1, GameConfig.BOARD_ROWS + 1):
+            row_points = []
+            # 每行 GameConfig.BOARD_COLUMNS 列
+            for x_idx in range(GameConfig.BOARD_COLUMNS):
+                row_points.append((x_idx, y_idx))
+            self.game_state.plant_grid_points.append(row_points)
+
+        # 根據邏輯網格點，創建實際的 MapTile 物件
+        for r_idx, row_points in enumerate(self.game_state.plant_grid_points):
+            temp_map_row = []
+            for c_idx, point in enumerate(row_points):
+                # 交替使用兩種地圖圖片 (map1.png 和 map2.png)
+                img_index = (point[0] + point[1]) % 2
+                # 創建 MapTile 物件，並設定其在螢幕上的位置
+                map_tile = MapTile(point[0] * GameConfig.TILE_SIZE, point[1] * GameConfig.TILE_SIZE, img_index)
+                temp_map_row.append(map_tile)
+            self.game_state.game_map_tiles.append(temp_map_row)
+
+    def init_zombies(self):
+        """初始化一批殭屍。"""
+        # 每次生成隨機數量的殭屍，並使用固定倍數的水平間距 (亂數一律來自這一局的 game_state.rng)
+        rng = self.game_state.rng
+        num_zombies_this_wave = rng.randint(1, 3) # 每次生成 1 到 3 隻
+
+        # 為了確保不會在同一列生成，可以記錄已選的列
+        spawned_rows = set()
+
+        for _ in range(num_zombies_this_wave):
+            # 隨機選擇一行 (y 座標)，確保不會重複選到同一行
+            while True:
+                row_index = rng.randint(1, GameConfig.BOARD_ROWS) # 地圖行索引 1 到 BOARD_ROWS
+                if row_index not in spawned_rows:
+                    spawned_rows.add(row_index)
+                    break
+                # 如果所有行都已被選中，則跳出循環避免無限循環
+                if len(spawned_rows) == GameConfig.BOARD_ROWS:
+                    break
+
+            if len(spawned_rows) == GameConfig.BOARD_ROWS and _ < num_zombies_this_wave: # 防止在所有行都填滿後還試圖生成更多殭屍
+                break
+
+            # random.randint(1, 5) * 100 讓殭屍在地圖右邊界外 100 ~ 500 像素處生成
+            dis_offset = rng.randint(1, 5) * 100
+
+            initial_x = GameConfig.BOARD_COLUMNS * GameConfig.TILE_SIZE + dis_offset
+            self.game_state.spawn_zombie(initial_x, row_index * GameConfig.TILE_SIZE)
+
+    def place_plant(self, grid_x, grid_y, plant_kind):
+        """
+        在地圖格 (grid_x, grid_y) 種植一株植物，規則與滑鼠點擊種植相同。
+        plant_kind: "sunflower" 或 "peashooter"。
+        回傳是否種植成功。
+        """
+        # 檢查是否在有效的種植區域 (地圖網格內)
+        if not (1 <= grid_y <= GameConfig.BOARD_ROWS and 0 <= grid_x < GameConfig.BOARD_COLUMNS):
+            return False
+        # 獲取對應的地圖塊物件 (注意索引，因為地圖行是從 1 開始)
+        map_tile = self.game_state.game_map_tiles[grid_y - 1][grid_x]
+        if not map_tile.can_grow: # 該地圖塊已經有植物
+            return False
+        price = GameConfig.PLANT_PRICES[plant_kind]
+        if self.game_state.money < price: # 錢不夠
+            return False
+
+        plant = GameSimulation.PLANT_TYPES[plant_kind](map_tile.x, map_tile.y)
+        self.game_state.plants.append(plant)
+        self.game_state.spawned_counts["plants"] += 1
+        map_tile.can_grow = False # 設為不可種植
+        plant.register_timers(self.game_state) # 登記週期性動作 (向日葵生成陽光)
+        self.game_state.money -= price
+        if self.recorder is not None:
+            self.recorder.record(self.game_state.tick, grid_x, grid_y, plant_kind)
+        return True
+
+    def _update_entities(self, entities, pool=None):
+        """
+        依序更新列表中活著的實體，並在同一次走訪中就地移除死亡的實體 (O(n)，不複製列表)。
+        死亡的實體若有物件池則歸還。回傳移除的數量。
+        """
+        game_state = self.game_state
+        count = len(entities) # 更新過程中新加入的實體 (例如剛射出的子彈) 留到下一次走訪
+        write = 0
+        for read in range(count):
+            entity = entities[read]
+            if entity.live:
+                entity.update(game_state) # 呼叫實體自己的 update 方法
+                entities[write] = entity # 活著的實體往前搬，維持原本的順序
+                write += 1
+            elif pool is not None:
+                pool.release(entity) # 歸還物件池
+        del entities[write:count]
+        return count - write
+
+    def _update_predicted_bullets(self, bullets, pool):
+        """
+        預測模式的子彈更新 (GameConfig.USE_PREDICTIVE_BULLETS，見 bullet_planner.py)：走訪與移除方式同 _update_entities，
+        但只有到了預測 tick 的子彈才呼叫 update 檢查碰撞，其餘只前進 speed 像素。
+        """
+        game_state = self.game_state
+        planner = game_state.bullet_planner
+        changed = planner.take_changes()
+        tick = game_state.tick
+        count = len(bullets)
+        write = 0
+        for read in range(count):
+            bullet = bullets[read]
+            if bullet.live:
+                if bullet.hit_tick is None or (changed and planner.affected(bullet, changed)):
+                    planner.plan(bullet, game_state)
+                if bullet.hit_tick == tick:
+                    bullet.update(game_state)
+                    # 還活著表示目標在這個 tick 先被其他子彈消滅，下一個 tick 重新預測
+                    bullet.hit_tick = None
+                else:
+                    bullet.prev_x = bullet.x
+                    bullet.x += bullet.speed
+                bullets[write] = bullet
+                write += 1
+            elif pool is not None:
+                pool.release(bullet)
+        del bullets[write:count]
+        return count - write
+
+    def update(self):
+        """
+        推進一次遊戲更新 (一個 tick)。
+        回傳這次更新是否因計時器生成了一批新殭屍 (供 GameManager 播放音效)。
+        """
+        # 重建空間索引，讓豌豆射手、子彈和殭屍只查詢附近的物件
+        self.game_state.spatial_index.rebuild(self.game_state)
+        entity_store = self.game_state.entity_store
+        if entity_store is not None:
+            entity_store.begin_tick()
+
+        # 處理這個 tick 到期的計時器 (向日葵生成陽光)，與植物更新在同一個階段
+        profiler = self.profiler
+        start = time.perf_counter()
+        for entity in self.game_state.timers.advance():
+            entity.on_timer(self.game_state)
+        if profiler is not None:
+            profiler.add("timers", time.perf_counter() - start)
+
+        # 依序更新植物、子彈、殭屍，並順便移除上一個 tick 死亡的實體
+        reaped = {}
+        for kind, entities, pool in (("plants", self.game_state.plants, None),
+                                     ("bullets", self.game_state.bullets, self.game_state.bullet_pool),
+                                     ("zombies", self.game_state.zombies, self.game_state.zombie_pool)):
+            start = time.perf_counter()
+            if kind == "bullets" and self.game_state.bullet_planner is not None:
+                reaped[kind] = self._update_predicted_bullets(entities, pool)
+            else:
+                reaped[kind] = self._update_entities(entities, pool)
+            if profiler is not None:
+                profiler.add(kind, time.perf_counter() - start)
+
+        # 陣列儲存區中的子彈與殭屍以向量化運算一次更新
+        if entity_store is not None:
+            start = time.perf_counter()
+            for kind, count in entity_store.step(self.game_state).items():
+                reaped[kind] += count
+            if profiler is not None:
+                profiler.add("store", time.perf_counter() - start)
+
+        # 距離上一批殭屍達到生成閾值時，就生成一批新的殭屍
+        # (閾值在升級時會縮短，所以每個 tick 以最新的閾值比較，而不是事先排定)
+        wave_spawned = False
+        if self.game_state.tick - self.game_state.last_zombie_wave_tick >= self.game_state.zombie_spawn_threshold:
+            start = time.perf_counter()
+            self.init_zombies()
+            self.game_state.last_zombie_wave_tick = self.game_state.tick
+            wave_spawned = True
+            if profiler is not None:
+                profiler.add("spawn", time.perf_counter() - start)
+
+        # 結算這個 tick (含更新前的種植) 生成與移除的實體數量
+        self.game_state.tick_stats = {"spawned": self.game_state.spawned_counts, "reaped": reaped}
+        self.game_state.spawned_counts = {"plants": 0, "bullets": 0, "zombies": 0}
+        self.game_state.tick += 1
+        return wave_spawned
+
+
+def run_headless(ticks, placements=(), stop_on_game_over=True, seed=None, policy=None, quiet=False):
+    """
+    無頭模擬：不開視窗、不限幀率，盡可能快地推進 ticks 次遊戲更新。
+    placements: (tick, grid_x, grid_y, plant_kind) 的序列，在該 tick 更新前嘗試種植。
+    seed: 這一局的隨機種子 (None 表示隨機)。
+    policy: 選用的種植策略 policy(simulation, tick)，每個 tick 更新前 (排定的種植之後) 呼叫。
+    quiet: True 時不在主控台輸出升級等訊息 (GameState.quiet)。
+    回傳包含模擬結果與每秒 tick 數的字典。
+    """
+    simulation = GameSimulation(GameState(seed))
+    simulation.game_state.quiet = quiet
+    simulation.init_map_grid()
+    simulation.init_zombies()
+    game_state = simulation.game_state
+
+    # 依 tick 分組，同一 tick 的種植依原本順序執行
+    scheduled = {}
+    for tick, grid_x, grid_y, plant_kind in placements:
+        scheduled.setdefault(tick, []).append((grid_x, grid_y, plant_kind))
+
+    planted = 0
+    tick = 0
+    churn = {"spawned": {"plants": 0, "bullets": 0, "zombies": 0}, "reaped": {"plants": 0, "bullets": 0, "zombies": 0}}
+    start_time = time.perf_counter()
+    while tick < ticks:
+        for grid_x, grid_y, plant_kind in scheduled.get(tick, ()):
+            if simulation.place_plant(grid_x, grid_y, plant_kind):
+                planted += 1
+        if policy is not None:
+            policy(simulation, tick)
+        simulation.update()
+        for phase, counts in game_state.tick_stats.items():
+            for kind, count in counts.items():
+                churn[phase][kind] += count
+        tick += 1
+        if stop_on_game_over and game_state.game_over:
+            break
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        "ticks": tick,
+        "elapsed": elapsed,
+        "ticks_per_sec": tick / elapsed if elapsed > 0 else float("inf"),
+        "planted": planted,
+        "game_over": game_state.game_over,
+        "seed": game_state.seed,
+        "level": game_state.current_level,
+        "score": game_state.score,
+        "money": game_state.money,
+        "pools": game_state.pool_stats(),
+        "spawned": churn["spawned"],
+        "reaped": churn["reaped"],
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="無頭模擬：不開視窗、不限幀率地推進遊戲邏輯。")
+    parser.add_argument("--ticks", type=int, default=100000, help="最多模擬的 tick 數")
+    parser.add_argument("--seed", type=int, default=None, help="隨機種子 (用於重現殭屍生成)")
+    parser.add_argument("--placements", default=None,
+                        help="種植腳本 JSON 檔，內容為 [[tick, grid_x, grid_y, \"sunflower\"|\"peashooter\"], ...]")
+    parser.add_argument("--keep-running", action="store_true", help="遊戲結束後仍繼續模擬到指定 tick 數")
+    args = parser.parse_args()
+
+    placements = []
+    if args.placements:
+        with open(args.placements, encoding="utf-8") as f:
+            placements = [tuple(item) for item in json.load(f)]
+
+    result = run_headless(args.ticks, placements, stop_on_game_over=not args.keep_running, seed=args.seed)
+    print(f"種子 {result['seed']}")
+    print(f"模擬 {result['ticks']} 次更新，耗時 {result['elapsed']:.3f} 秒 ({result['ticks_per_sec']:.0f} ticks/s)")
+    print(f"關卡 {result['level']}，得分 {result['score']}，金錢 {result['money']}，"
+          f"種植 {result['planted']} 株，遊戲結束: {result['game_over']}")
+    print(f"生成 {result['spawned']}，移除 {result['reaped']}")
+    for name, stats in result["pools"].items():
+        print(f"{name} 物件池: 最高使用量 {stats['high_water']}，新建 {stats['created']}，重複使用 {stats['reused']}")
@@ -0,0 +1,184 @@
+# snapshot.py
+
+import json
+import os
+from game_config import GameConfig
+from game_state import GameState
+from spatial_index import SpatialIndex
+from timer_wheel import TimerWheel
+from simulation import GameSimulation
+
+SNAPSHOT_VERSION = 3 # 快照格式的版本，格式改變時加一
+
+# 植物種類名稱對應的計時器屬性 (向日葵下一次生成陽光的 tick、豌豆射手的射擊計數)
+PLANT_TIMERS = {"sunflower": "next_sun_tick", "peashooter": "shot_timer"}
+_PLANT_KINDS = {plant_class: kind for kind, plant_class in GameSimulation.PLANT_TYPES.items()}
+
+# clone_game_state 直接複製的純量屬性
+_CLONED_ATTRIBUTES = ("tick", "game_over", "current_level", "score", "remnant_score", "money",
+                      "last_zombie_wave_tick", "zombie_spawn_threshold", "first_zombie_wave_sound_played", "screen", "quiet")
+
+def _plant_record(plant):
+    kind = _PLANT_KINDS[type(plant)]
+    return (kind, plant.x, plant.y, plant.hp, plant.live, getattr(plant, PLANT_TIMERS[kind]))
+
+def _register_plant_timers(game_state):
+    """以植物保存的到期 tick 重建計時輪 (計時輪本身不放進快照)。"""
+    game_state.timers = TimerWheel(game_state.tick)
+    for plant in game_state.plants:
+        if plant.live:
+            plant.register_timers(game_state)
+
+def take_snapshot(game_state):
+    """
+    擷取遊戲狀態中的模擬資料：實體的位置、血量與計時器，地圖格的 can_grow，金錢、分數、關卡與亂數狀態。
+    不含任何 surface，只由數字、布林、字串、tuple 與 dict (陣列儲存區則是 NumPy 陣列) 組成。
+    實體依列表順序保存 (子彈命中的先後取決於順序)，所以還原後繼續執行的結果與原本完全相同。
+    """
+    store = game_state.entity_store
+    return {
+        "version": SNAPSHOT_VERSION,
+        "seed": game_state.seed,
+        "rng": game_state.rng.getstate(),
+        "tick": game_state.tick,
+        "game_over": game_state.game_over,
+        "level": game_state.current_level,
+        "score": game_state.score,
+        "remnant_score": game_state.remnant_score,
+        "money": game_state.money,
+        "last_zombie_wave_tick": game_state.last_zombie_wave_tick,
+        "zombie_spawn_threshold": game_state.zombie_spawn_threshold,
+        "first_zombie_wave_sound_played": game_state.first_zombie_wave_sound_played,
+        "can_grow": tuple(tuple(tile.can_grow for tile in row) for row in game_state.game_map_tiles),
+        "plants": tuple(_plant_record(plant) for plant in game_state.plants),
+        "bullets": tuple((bullet.x, bullet.prev_x, bullet.y, bullet.damage, bullet.speed, bullet.live)
+                         for bullet in game_state.bullets),
+        "zombies": tuple((zombie.x, zombie.prev_x, zombie.y, zombie.hp, zombie.damage, zombie.speed,
+                          zombie.stop, zombie.live) for zombie in game_state.zombies),
+        "entity_store": store.snapshot() if store is not None else None,
+    }
+
+def restore_snapshot(game_state, snapshot):
+    """
+    把 take_snapshot (或 load_snapshot) 的快照還原到 game_state。
+    圖片一律由 ResourceManager 重新取得 (已載入的直接從快取拿)，子彈與殭屍從物件池取出。
+    """
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"不支援的快照版本: {snapshot.get('version')}")
+    store_data = snapshot["entity_store"]
+    if (store_data is None) != (game_state.entity_store is None):
+        raise ValueError("快照與目前的 GameConfig.USE_ARRAY_STORE 設定不符")
+    board = [GameConfig.BOARD_COLUMNS] * GameConfig.BOARD_ROWS # 每一行的地圖格數
+    saved_board = [len(row) for row in snapshot["can_grow"]]
+    if saved_board != board:
+        saved_columns = max(saved_board, default=0)
+        raise ValueError(f"快照的地圖大小 ({len(saved_board)}x{saved_columns}) 與目前的 "
+                         f"GameConfig.BOARD_ROWS x BOARD_COLUMNS ({GameConfig.BOARD_ROWS}x{GameConfig.BOARD_COLUMNS}) 不符")
+
+    game_state.seed = snapshot["seed"]
+    version, internal_state, gauss_next = snapshot["rng"] # 從 JSON 讀回時是列表，需要轉回 tuple
+    game_state.rng.setstate((version, tuple(internal_state), gauss_next))
+    game_state.tick = snapshot["tick"]
+    game_state.game_over = snapshot["game_over"]
+    game_state.current_level = snapshot["level"]
+    game_state.score = snapshot["score"]
+    game_state.remnant_score = snapshot["remnant_score"]
+    game_state.money = snapshot["money"]
+    game_state.last_zombie_wave_tick = snapshot["last_zombie_wave_tick"]
+    game_state.zombie_spawn_threshold = snapshot["zombie_spawn_threshold"]
+    game_state.first_zombie_wave_sound_played = snapshot["first_zombie_wave_sound_played"]
+
+    if [len(row) for row in game_state.game_map_tiles] != board: # 還沒建立地圖，或是以其他大小建立
+        GameSimulation(game_state).init_map_grid()
+    for row, flags in zip(game_state.game_map_tiles, snapshot["can_grow"]):
+        for tile, can_grow in zip(row, flags):
+            tile.can_grow = can_grow
+
+    plants = []
+    for kind, x, y, hp, live, timer in snapshot["plants"]:
+        plant = GameSimulation.PLANT_TYPES[kind](x, y)
+        plant.hp = hp
+        plant.live = live
+        setattr(plant, PLANT_TIMERS[kind], timer)
+        plants.append(plant)
+    game_state.plants = plants
+    _register_plant_timers(game_state)
+
+    for bullet in game_state.bullets:
+        game_state.bullet_pool.release(bullet)
+    game_state.bullets.clear()
+    for x, prev_x, y, damage, speed, live in snapshot["bullets"]:
+        bullet = game_state.bullet_pool.acquire(x, y)
+        bullet.prev_x = prev_x
+        bullet.damage = damage
+        bullet.speed = speed
+        bullet.live = live
+        game_state.bullets.append(bullet)
+
+    for zombie in game_state.zombies:
+        game_state.zombie_pool.release(zombie)
+    game_state.zombies.clear()
+    for x, prev_x, y, hp, damage, speed, stop, live in snapshot["zombies"]:
+        zombie = game_state.zombie_pool.acquire(x, y)
+        zombie.prev_x = prev_x
+        zombie.hp = hp
+        zombie.damage = damage
+        zombie.speed = speed
+        zombie.stop = stop
+        zombie.live = live
+        game_state.zombies.append(zombie)
+
+    if store_data is not None:
+        game_state.entity_store.restore(store_data)
+    # 空間索引在下一個 tick 開始時由 GameSimulation 重建
+    game_state.spatial_index = SpatialIndex()
+    game_state.spawned_counts = {"plants": 0, "bullets": 0, "zombies": 0}
+    game_state.tick_stats = {"spawned": dict(game_state.spawned_counts), "reaped": dict(game_state.spawned_counts)}
+
+def clone_game_state(game_state):
+    """
+    在記憶體中複製一份可以獨立往下模擬的 GameState (例如嘗試不同種法的 what-if 推演)。
+    與 take_snapshot + restore_snapshot 的結果相同，但直接複製物件 (共用圖片)，不重新載入圖片，
+    分身的物件池也不預先建立物件，所以每秒可以複製上千份。
+    """
+    clone = GameState(game_state.seed)
+    clone.rng.setstate(game_state.rng.getstate())
+    for name in _CLONED_ATTRIBUTES:
+        setattr(clone, name, getattr(game_state, name))
+    clone.plant_grid_points = [list(row) for row in game_state.plant_grid_points]
+    clone.game_map_tiles = [[tile.clone() for tile in row] for row in game_state.game_map_tiles]
+    clone.plants = [plant.clone() for plant in game_state.plants]
+    _register_plant_timers(clone)
+    clone.bullets = [bullet.clone() for bullet in game_state.bullets]
+    clone.zombies = [zombie.clone() for zombie in game_state.zombies]
+    # 複製出來的子彈與殭屍死亡後仍會歸還給分身的物件池
+    for pool, entities in ((clone.bullet_pool, clone.bullets), (clone.zombie_pool, clone.zombies)):
+        pool.prefill = 0
+        pool.in_use = pool.high_water = len(entities)
+    if game_state.entity_store is not None:
+        clone.entity_store.restore(game_state.entity_store.snapshot())
+    if game_state.bullet_planner is not None and clone.bullet_planner is not None:
+        clone.bullet_planner.changed = set(game_state.bullet_planner.changed) # 複製的子彈保留原本的預測
+    return clone
+
+def save_snapshot(snapshot, path):
+    """把快照寫成 JSON 檔。先寫到暫存檔再改名，寫到一半當機也不會破壞上一份存檔。"""
+    data = dict(snapshot)
+    if data["entity_store"] is not None:
+        data["entity_store"] = {kind: {name: array.tolist() for name, array in columns.items()}
+                                for kind, columns in data["entity_store"].items()}
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+def load_snapshot(path):
+    """讀取 save_snapshot 寫出的快照檔，回傳可以交給 restore_snapshot 的字典。"""
+    with open(path, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"不支援的快照版本: {snapshot.get('version')}")
+    return snapshot
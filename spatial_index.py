@@ -0,0 +1,138 @@
+# spatial_index.py
+
+from bisect import bisect_left, bisect_right
+from game_config import GameConfig
+
+def overlaps(box, other):
+    """兩個 (x, y, width, height) 方塊是否重疊，與 pygame.Rect.colliderect 相同 (邊緣相接不算)。"""
+    return (box.x < other.x + other.width and other.x < box.x + box.width and
+            box.y < other.y + other.height and other.y < box.y + box.height)
+
+class SpatialIndex:
+    """
+    殭屍與植物的空間索引，由 GameSimulation 在每個 tick 開始時重建。
+    - 殭屍：依所在行 (y) 分組，每行依 x 排序
+    - 植物：依左上角所在的地圖格 (格 x, 格 y) 分組
+    查詢時傳入任何有 x、y、width、height 的物件 (實體本身或 pygame.Rect)。
+    查詢結果與逐一掃描整個列表完全相同：多個候選時，回傳在原列表中排最前面的那一個。
+    """
+    def __init__(self):
+        self.lane_keys = []    # 有殭屍的行 (y)，由小到大排序
+        self.zombie_order = [] # 重建時的殭屍列表 (列表順序 -> 殭屍)
+        self.zombie_lanes = {} # y -> (x 座標列表, 列表順序列表)，兩者都依 x 排序
+        self.plant_tiles = {}  # (格 x, 格 y) -> [(列表順序, 植物), ...]
+        # 用來擴大查詢範圍的最大尺寸 (圖片尺寸可能不同)
+        self.max_zombie_width = 0
+        self.max_zombie_height = 0
+        self.max_plant_width = 0
+        self.max_plant_height = 0
+
+    def rebuild(self, game_state):
+        """依目前的 game_state.zombies 與 game_state.plants 重建索引。"""
+        # 保留這個 tick 開始時的殭屍列表，列表順序就是查詢時的優先順序
+        self.zombie_order = list(game_state.zombies)
+        lanes = {}
+        max_w = max_h = 0
+        for order, zombie in enumerate(self.zombie_order):
+            if zombie.live:
+                lane = lanes.get(zombie.y)
+                if lane is None:
+                    lane = lanes[zombie.y] = []
+                lane.append((zombie.x, order))
+                if zombie.width > max_w:
+                    max_w = zombie.width
+                if zombie.height > max_h:
+                    max_h = zombie.height
+        zombie_lanes = {}
+        for y, entries in lanes.items():
+            entries.sort() # 殭屍大多等速移動，列表幾乎已排序，排序成本接近線性
+            zombie_lanes[y] = ([entry[0] for entry in entries], [entry[1] for entry in entries])
+        self.zombie_lanes = zombie_lanes
+        self.lane_keys = sorted(lanes)
+        self.max_zombie_width = max_w
+        self.max_zombie_height = max_h
+
+        tiles = {}
+        max_w = max_h = 0
+        for order, plant in enumerate(game_state.plants):
+            if plant.live:
+                key = (plant.x // GameConfig.TILE_SIZE, plant.y // GameConfig.TILE_SIZE)
+                tile = tiles.get(key)
+                if tile is None:
+                    tile = tiles[key] = []
+                tile.append((order, plant))
+                if plant.width > max_w:
+                    max_w = plant.width
+                if plant.height > max_h:
+                    max_h = plant.height
+        self.plant_tiles = tiles
+        self.max_plant_width = max_w
+        self.max_plant_height = max_h
+
+    def has_zombie_ahead(self, y, min_x, max_x):
+        """同一行 (殭屍的 y 等於 y) 是否有活著的殭屍，且 min_x < 殭屍的 x < max_x。"""
+        lane = self.zombie_lanes.get(y)
+        if lane is None:
+            return False
+        xs, orders = lane
+        zombies = self.zombie_order
+        for i in range(bisect_right(xs, min_x), bisect_left(xs, max_x)):
+            if zombies[orders[i]].live:
+                return True
+        return False
+
+    def first_zombie_hit(self, box):
+        """回傳與 box 碰撞、且在殭屍列表中最前面的活殭屍；沒有則回傳 None。"""
+        zombies = self.zombie_order
+        best_order = None
+        # 只有 y 落在 (box.y - 最大高度, box 的下緣) 的行才可能在垂直方向重疊
+        first_lane = bisect_right(self.lane_keys, box.y - self.max_zombie_height)
+        last_lane = bisect_left(self.lane_keys, box.y + box.height)
+        for lane_y in self.lane_keys[first_lane:last_lane]:
+            xs, orders = self.zombie_lanes[lane_y]
+            # 水平方向同理，只看 x 落在 (box.x - 最大寬度, box 的右緣) 的殭屍
+            lo = bisect_right(xs, box.x - self.max_zombie_width)
+            hi = bisect_left(xs, box.x + box.width)
+            if lo >= hi:
+                continue
+            candidates = orders[lo:hi]
+            # 殭屍尺寸相同時，候選者一定都重疊，通常順序最小的那隻就是答案
+            order = min(candidates)
+            if best_order is not None and order >= best_order:
+                continue
+            zombie = zombies[order]
+            if zombie.live and overlaps(box, zombie):
+                best_order = order
+                continue
+            # 最前面的候選者已死亡或沒有實際重疊，依列表順序逐一檢查其餘候選者
+            for order in sorted(candidates)[1:]:
+                if best_order is not None and order >= best_order:
+                    break
+                zombie = zombies[order]
+                if zombie.live and overlaps(box, zombie):
+                    best_order = order
+                    break
+        return None if best_order is None else zombies[best_order]
+
+    def first_plant_hit(self, box):
+        """回傳與 box 碰撞、且在植物列表中最前面的活植物；沒有則回傳 None。"""
+        if not self.plant_tiles:
+            return None
+        tile_size = GameConfig.TILE_SIZE
+        best_order = None
+        best = None
+        # 植物的左上角必須落在 (box.x - 最大寬度, box 的右緣) x (box.y - 最大高度, box 的下緣) 內
+        first_col = (box.x - self.max_plant_width + 1) // tile_size
+        last_col = (box.x + box.width - 1) // tile_size
+        first_row = (box.y - self.max_plant_height + 1) // tile_size
+        last_row = (box.y + box.height - 1) // tile_size
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                tile = self.plant_tiles.get((col, row))
+                if tile is None:
+                    continue
+                for order, plant in tile:
+                    if plant.live and (best_order is None or order < best_order) and overlaps(box, plant):
+                        best_order = order
+                        best = plant
+        return best
@@ -0,0 +1,141 @@
+# sweep.py
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# 工作行程不開視窗也不出聲
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from game_config import GameConfig
+from simulation import run_headless
+
+def no_policy(simulation, tick):
+    """不種任何植物。"""
+
+def _fill_left_to_right(simulation, sunflower_columns):
+    """
+    嘗試在最左邊的空位種一株：前 sunflower_columns 欄種向日葵，其餘種豌豆射手。
+    買不起時不跳過，等存夠錢再種同一格。
+    """
+    game_state = simulation.game_state
+    for grid_x in range(GameConfig.BOARD_COLUMNS):
+        plant_kind = "sunflower" if grid_x < sunflower_columns else "peashooter"
+        for grid_y in range(1, GameConfig.BOARD_ROWS + 1):
+            if game_state.game_map_tiles[grid_y - 1][grid_x].can_grow:
+                simulation.place_plant(grid_x, grid_y, plant_kind)
+                return
+
+def greedy_policy(simulation, tick):
+    """每 10 個 tick 嘗試種一株：前兩欄向日葵，其餘豌豆射手。"""
+    if tick % 10 == 0:
+        _fill_left_to_right(simulation, 2)
+
+def sunflower_first_policy(simulation, tick):
+    """每 10 個 tick 嘗試種一株：前三欄向日葵 (經濟優先)，其餘豌豆射手。"""
+    if tick % 10 == 0:
+        _fill_left_to_right(simulation, 3)
+
+# 策略以名稱傳給工作行程 (函式本身不一定能在行程間傳遞)
+POLICIES = {"none": no_policy, "greedy": greedy_policy, "sunflower_first": sunflower_first_policy}
+
+def expand_grid(grid):
+    """{設定名稱: [值, ...]} 展開成每一種組合的覆寫字典列表。"""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def run_game(task):
+    """
+    工作行程：套用 GameConfig 覆寫後跑一局無頭模擬，回傳結果。
+    task: (組合編號, 覆寫字典, 種子, 策略名稱, 最多 tick 數)
+    """
+    combo, overrides, seed, policy_name, max_ticks = task
+    saved = {name: getattr(GameConfig, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(GameConfig, name, value)
+    try:
+        result = run_headless(max_ticks, seed=seed, policy=POLICIES[policy_name], quiet=True) # 升級等訊息不輸出
+        won = result["game_over"] and result["level"] >= GameConfig.MAX_LEVEL # 與 game_over_screen 的勝利判斷相同
+    finally:
+        for name, value in saved.items():
+            setattr(GameConfig, name, value)
+    return {"combo": combo, "seed": seed, "ticks": result["ticks"], "level": result["level"],
+            "score": result["score"], "won": won, "game_over": result["game_over"]}
+
+def run_sweep(grid, games_per_combo, policy_name="greedy", max_ticks=20000, base_seed=0, workers=None):
+    """
+    對 grid 的每一種組合各跑 games_per_combo 局 (每局種子不同)，分散到 workers 個行程。
+    回傳 (組合列表, 每局結果列表, 秒數)。
+    """
+    combos = expand_grid(grid)
+    tasks = [(combo, overrides, base_seed + combo * games_per_combo + game, policy_name, max_ticks)
+             for combo, overrides in enumerate(combos) for game in range(games_per_combo)]
+    workers = workers or os.cpu_count() or 1
+    # 每個工作行程一次拿一批，減少行程間溝通的成本
+    chunksize = max(1, len(tasks) // (workers * 8))
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run_game, tasks, chunksize=chunksize))
+    return combos, results, time.perf_counter() - start
+
+def aggregate(combos, results):
+    """依組合彙整：局數、平均/最高關卡、平均存活 tick 數、平均得分、勝率。"""
+    rows = []
+    for combo, overrides in enumerate(combos):
+        games = [result for result in results if result["combo"] == combo]
+        count = len(games)
+        rows.append({
+            "overrides": overrides,
+            "games": count,
+            "mean_level": sum(game["level"] for game in games) / count,
+            "max_level": max(game["level"] for game in games),
+            "mean_ticks": sum(game["ticks"] for game in games) / count,
+            "mean_score": sum(game["score"] for game in games) / count,
+            "win_rate": sum(game["won"] for game in games) / count,
+        })
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="平行跑大量無頭遊戲，比較不同 GameConfig 參數組合。")
+    parser.add_argument("--grid", required=True,
+                        help="參數網格 JSON (字串或檔案)，例如 "
+                             "'{\"ZOMBIE_SPAWN_INTERVAL_BASE\": [80, 100], \"BULLET_DAMAGE\": [40, 50]}'")
+    parser.add_argument("--games", type=int, default=100, help="每種組合跑幾局")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy", help="種植策略")
+    parser.add_argument("--ticks", type=int, default=20000, help="每局最多 tick 數")
+    parser.add_argument("--seed", type=int, default=0, help="第一局的種子 (之後每局加一)")
+    parser.add_argument("--workers", type=int, default=None, help="工作行程數 (預設為 CPU 核心數)")
+    parser.add_argument("--output", default=None, help="把彙整結果寫成 CSV 檔")
+    args = parser.parse_args()
+
+    if os.path.exists(args.grid):
+        with open(args.grid, encoding="utf-8") as f:
+            grid = json.load(f)
+    else:
+        grid = json.loads(args.grid)
+
+    combos, results, elapsed = run_sweep(grid, args.games, args.policy, args.ticks, args.seed, args.workers)
+    rows = aggregate(combos, results)
+    print(f"{len(results)} 局，耗時 {elapsed:.1f} 秒 ({len(results) / elapsed:.1f} 局/秒)")
+    print(f"{'參數':<50} {'平均關卡':>8} {'最高':>4} {'平均 tick':>10} {'平均得分':>8} {'勝率':>6}")
+    for row in rows:
+        label = ", ".join(f"{name}={value}" for name, value in row["overrides"].items())
+        print(f"{label:<50} {row['mean_level']:>8.2f} {row['max_level']:>4} {row['mean_ticks']:>10.0f} "
+              f"{row['mean_score']:>8.0f} {row['win_rate']:>6.1%}")
+
+    if args.output:
+        names = sorted(grid)
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(names + ["games", "mean_level", "max_level", "mean_ticks", "mean_score", "win_rate"])
+            for row in rows:
+                writer.writerow([json.dumps(row["overrides"][name]) for name in names]
+                                + [row["games"], row["mean_level"], row["max_level"], row["mean_ticks"],
+                                   row["mean_score"], row["win_rate"]])
+        print(f"結果已寫入 {args.output}")
@@ -0,0 +1,65 @@
+# timer_wheel.py
+
+class TimerWheel:
+    """
+    階層式計時輪：實體登記「在第幾個 tick 到期」，每個 tick 只處理到期的項目，
+    不需要每個 tick 把每個實體的計數器加一。
+
+    第 0 層每格 1 個 tick，第 k 層每格 slots**k 個 tick，每層 slots 格。
+    低層轉完一圈時，把上一層對應格子裡的項目重新分配到更精細的層；
+    超過最高層範圍的項目放在溢位列表，最高層轉完一圈時再重新分配。
+    advance() 必須每個 tick 呼叫一次 (不能跳過)，now 是下一個要處理的 tick。
+    """
+    def __init__(self, now=0, slots=64, levels=3):
+        self.now = now
+        self.slots = slots
+        self.levels = levels
+        self._wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._overflow = []
+        self.count = 0 # 尚未到期的項目數
+
+    def __len__(self):
+        return self.count
+
+    def schedule(self, tick, item):
+        """登記 item 在第 tick 個 tick 到期 (已經過去的 tick 視為下一個 tick)。"""
+        self._place(max(tick, self.now), item)
+        self.count += 1
+
+    def _place(self, tick, item):
+        # 依距離現在多遠決定放在哪一層，同一層內依到期 tick 的絕對位置決定格子
+        delta = tick - self.now
+        span = 1
+        for wheel in self._wheels:
+            if delta < span * self.slots:
+                wheel[(tick // span) % self.slots].append((tick, item))
+                return
+            span *= self.slots
+        self._overflow.append((tick, item))
+
+    def _cascade(self):
+        """now 剛好轉到某層的格子邊界時，把該層目前這一格的項目往下分配 (由高層往低層)。"""
+        now = self.now
+        if now % self.slots ** self.levels == 0:
+            overflow, self._overflow = self._overflow, []
+            for tick, item in overflow:
+                self._place(tick, item)
+        for level in range(self.levels - 1, 0, -1):
+            span = self.slots ** level
+            if now % span == 0:
+                wheel = self._wheels[level]
+                index = (now // span) % self.slots
+                entries, wheel[index] = wheel[index], []
+                for tick, item in entries:
+                    self._place(tick, item)
+
+    def advance(self):
+        """處理第 now 個 tick：回傳在這個 tick 到期的項目，然後前進到下一個 tick。"""
+        if self.now % self.slots == 0:
+            self._cascade()
+        wheel = self._wheels[0]
+        index = self.now % self.slots
+        entries, wheel[index] = wheel[index], []
+        self.now += 1
+        self.count -= len(entries)
+        return [item for _, item in entries]